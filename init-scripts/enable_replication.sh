@@ -0,0 +1,5 @@
+#!/bin/bash
+# init-scripts/enable_replication.sh
+# リードレプリカ（db_replica）からのストリーミングレプリケーションの接続を許可する
+set -e
+echo "host replication ${POSTGRES_USER} all md5" >> "$PGDATA/pg_hba.conf"
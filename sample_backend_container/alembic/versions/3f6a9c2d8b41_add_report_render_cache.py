@@ -0,0 +1,31 @@
+"""add report_render_cache
+
+Revision ID: 3f6a9c2d8b41
+Revises: 79401c48e0d8
+Create Date: 2026-10-19 06:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6a9c2d8b41'
+down_revision: Union[str, None] = '79401c48e0d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('report_render_cache',
+    sa.Column('content_hash', sa.String(length=64), nullable=False, comment='コンテンツハッシュ (SHA-256)'),
+    sa.Column('html', sa.Text(), nullable=False, comment='変換結果 (サニタイズ済みのHTML)'),
+    sa.Column('created_at', sa.TIMESTAMP(), nullable=True, comment='作成日時'),
+    sa.PrimaryKeyConstraint('content_hash')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('report_render_cache')
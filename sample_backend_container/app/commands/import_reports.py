@@ -0,0 +1,68 @@
+# import_reports.py
+# NDJSON形式のファイル（または標準入力）からレポートを一括インポートする。
+# 実行コマンド:
+# export PYTHONPATH=/app
+# poetry run python app/commands/import_reports.py --user-id <UUID> reports.ndjson
+# cat reports.ndjson | poetry run python app/commands/import_reports.py --user-id <UUID> -
+
+import asyncio
+import sys
+from collections.abc import AsyncIterator
+from typing import BinaryIO
+from uuid import UUID
+
+from app.core.log_config import configure_logging
+from app.database import AsyncSessionLocal, engine
+from app.services.report_import_service import import_reports
+
+READ_CHUNK_BYTES = 1024 * 1024
+
+
+async def read_chunks(stream: BinaryIO) -> AsyncIterator[bytes]:
+    """ファイルを一定サイズのチャンクで読み出します。
+
+    Args:
+        stream (BinaryIO): 読み出し対象のファイル。
+
+    Yields:
+        bytes: 読み出したチャンク。
+
+    """
+    while chunk := stream.read(READ_CHUNK_BYTES):
+        yield chunk
+
+
+async def run_import(path: str, user_id: UUID) -> int:
+    """インポートを実行し、結果を標準出力へ表示します。
+
+    Args:
+        path (str): NDJSONファイルのパス。`-`の場合は標準入力。
+        user_id (UUID): レポートの作成者となるユーザーID。
+
+    Returns:
+        int: 終了コード（失敗行がある場合は1）。
+
+    """
+    stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+    try:
+        async with AsyncSessionLocal() as session:
+            result = await import_reports(read_chunks(stream), user_id, session)
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+        await engine.dispose()
+
+    print(result.model_dump_json(indent=2))
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bulk import reports from NDJSON.")
+    parser.add_argument("path", help="NDJSON file path ('-' for stdin)")
+    parser.add_argument("--user-id", required=True, type=UUID, help="Owner user ID of imported reports")
+    args = parser.parse_args()
+
+    configure_logging()
+    sys.exit(asyncio.run(run_import(args.path, args.user_id)))
@@ -23,7 +23,137 @@ class Setting(BaseSettings):
 
 
     # データベース設定
-    # alembic.iniに記載
+    # 未指定の場合はalembic.iniに記載の接続URLを使用する
+    DATABASE_URL: str | None = None
+    DB_COMPILED_CACHE_SIZE: int = 1000  # SQLAlchemyがコンパイル済みSQLを保持する件数（エンジンごと、既定値は500）
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500  # asyncpgが接続ごとに保持するプリペアドステートメントの件数（既定値は100、0で無効）
+    DB_POOL_SIZE: int = 5  # ワーカーごとのコネクションプールで保持する接続数（app.launcherではDB_MAX_CONNECTIONSに収まるよう縮小する）
+    DB_MAX_OVERFLOW: int = 10  # ワーカーごとにDB_POOL_SIZEを超えて一時的に作成できる接続数
+    DB_MAX_CONNECTIONS: int = 100  # PostgreSQLのmax_connections。全ワーカーの接続数の合計がこれを超えないようにする
+    DB_RESERVED_CONNECTIONS: int = 10  # アプリケーション以外（superuser_reserved_connections、マイグレーション、運用作業など）に残す接続数
+
+    # リードレプリカ設定
+    # 読み取り専用セッションの接続先。キーは接続URL、値は振り分けの重み。未指定の場合はすべてプライマリから読み取る
+    DATABASE_REPLICAS: dict[str, float] = {}
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # 遅延がこの秒数を超えたレプリカには振り分けない
+    REPLICA_READ_YOUR_WRITES_SECONDS: float = 30.0  # 書き込んだクライアントは、この秒数の間はレプリカへの反映を確認できるまでプライマリから読み取る
+    REPLICA_WRITE_COOKIE: str = "db_last_write"  # クライアントの直近の書き込み時刻を保持するCookie（SECRET_KEYで署名する）
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = 2.0
+    REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS: float = 1.0
+
+    # サーキットブレーカー設定
+    # DBへの接続の失敗が続いた場合は、一定時間接続を試みずに503を返却する
+    DB_CIRCUIT_BREAKER_ENABLED: bool = True
+    DB_CIRCUIT_FAILURE_THRESHOLD: int = 5  # 接続の失敗（接続中の切断を含む）がこの回数連続した場合に遮断する
+    DB_CIRCUIT_OPEN_SECONDS: float = 10.0  # 遮断してから接続を再試行するまでの秒数
+    DB_CIRCUIT_HALF_OPEN_PROBES: int = 1  # 再試行時に同時に試みる接続数
+    DB_CONNECT_TIMEOUT_SECONDS: float = 5.0  # DBへの接続のタイムアウト（秒、asyncpgの既定値は60）
+
+    # レポートのキャッシュ設定
+    REPORT_CACHE_TTL_SECONDS: float = 0.0  # GET /report/{id}の結果をDBへ問い合わせずにキャッシュから返却する秒数（ワーカーごと）。0の場合は常にDBから取得する
+    REPORT_CACHE_STALE_SECONDS: float = 600.0  # DBが利用できない場合に、最後に取得できた値を返却できる秒数
+    REPORT_CACHE_MAX_ENTRIES: int = 10000
+
+    # 本番サーバー設定（python -m app.launcherで起動する場合）
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    WEB_CONCURRENCY: int | None = None  # ワーカー数。未指定の場合は利用可能なCPUコア数
+    SERVER_PRELOAD: bool = True  # アプリケーションを読み込んでからワーカーをforkし、メモリをコピーオンライトで共有する
+    SERVER_LOOP: str = "uvloop"  # イベントループ（uvloop / asyncio）。uvloopが未インストールの場合はasyncioを使用する
+    SERVER_HTTP: str = "httptools"  # HTTPパーサー（httptools / h11）。httptoolsが未インストールの場合はh11を使用する
+    SERVER_BACKLOG: int = 2048  # 接続待ちキューの長さ
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30  # 停止時に処理中のリクエストの完了を待つ秒数
+
+    # エクスポート設定
+    EXPORT_YIELD_PER: int = 1000  # サーバーサイドカーソルから1回にフェッチする行数
+    EXPORT_CHUNK_BYTES: int = 64 * 1024  # レスポンスへ書き出すチャンクサイズ（バイト）
+    EXPORT_IDLE_TIMEOUT_MS: int = 30000  # クライアントの受信待ちでトランザクションを保持できる最大時間（ミリ秒）
+
+    # 一括インポート設定
+    IMPORT_CHUNK_SIZE: int = 5000  # 1トランザクションで取り込む行数
+    IMPORT_MAX_ERRORS: int = 1000  # レスポンスに含める行エラーの上限件数
+
+    # レンダリング設定
+    RENDER_PROCESS_WORKERS: int = 1  # Markdownの変換とHTMLのサニタイズを行うプロセス数（ワーカーごと）。0の場合はスレッドで変換する
+    RENDER_CACHE_MAX_ENTRIES: int = 1000  # 変換結果をメモリ上に保持する件数（ワーカーごと、超えた場合は最も古く参照された結果から破棄する）
+
+    # メトリクス設定
+    # 複数ワーカーで起動する場合にワーカー間で集計するためのディレクトリ。未指定の場合はプロセス内の値のみを出力する
+    # NOTE: 終了したワーカーのカウンターも集計に含めるため、デプロイ時にディレクトリを空にすること
+    METRICS_MULTIPROC_DIR: str | None = None
+    METRICS_FLUSH_INTERVAL_SECONDS: float = 5.0  # 各ワーカーが値をファイルへ書き出す間隔（秒）
+
+    # SQL集計設定
+    QUERY_STATS_ENABLED: bool = True  # リクエストごとのSQL件数・所要時間を集計する
+    QUERY_N_PLUS_ONE_THRESHOLD: int = 5  # 同一のSQL文がこの回数以上実行された場合にN+1の疑いとして警告する
+
+    # スロークエリ設定
+    SLOW_QUERY_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0  # この時間以上かかったSQLをスロークエリとして記録する（ミリ秒）
+    SLOW_QUERY_MAX_FINGERPRINTS: int = 1000  # 集計するフィンガープリントの上限数
+    SLOW_QUERY_LOG_DIRECTORY: str = "logs/server/slow_query"  # EXPLAINの結果の出力先
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.0  # EXPLAIN (ANALYZE, BUFFERS)を取得する割合（0の場合は取得しない）
+    SLOW_QUERY_EXPLAIN_MIN_MS: float = 1000.0  # EXPLAINの対象とする最小の所要時間（ミリ秒）
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS: float = 300.0  # 同一フィンガープリントのEXPLAINを取得する最小間隔（秒）
+
+    # プロファイル設定
+    PROFILING_ENABLED: bool = False  # 管理者用のプロファイルAPIとX-Profileヘッダーを有効にする
+    PROFILING_TOKEN: str | None = None  # X-Profileヘッダーで単一リクエストをプロファイルする場合のトークン
+    PROFILING_DIRECTORY: str = "logs/server/profile"  # プロファイル結果の出力先
+    PROFILING_DEFAULT_INTERVAL_MS: float = 5.0  # サンプリング間隔（ミリ秒）
+    PROFILING_MAX_SECONDS: float = 60.0  # 1回のプロファイルの最大計測時間（秒）
+
+    # イベントループ監視設定
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.5  # 遅延を計測する間隔（秒）
+    LOOP_BLOCK_THRESHOLD_MS: float = 100.0  # この時間以上ループがブロックされた場合にスタックとともに記録する（ミリ秒）
+
+    # トレース設定
+    TRACING_ENABLED: bool = False  # リクエスト・各層の関数・SQLをスパンとして記録する
+    TRACING_DIRECTORY: str = "logs/server/trace"  # スパンの出力先（OTLP/JSON形式のJSON Lines）
+    TRACING_OTLP_ENDPOINT: str | None = None  # OTLP/HTTPのコレクターのURL（例: http://otel-collector:4318/v1/traces）
+
+    # 流量制御設定
+    ADMISSION_ENABLED: bool = False  # 同時実行数の制限と過負荷時の503応答を有効にする
+    ADMISSION_MAX_IN_FLIGHT: int = 64  # ワーカー全体の同時実行数の上限
+    ADMISSION_READ_MAX_IN_FLIGHT: int = 64  # 読み取り（GETなど）の同時実行数の上限
+    ADMISSION_WRITE_MAX_IN_FLIGHT: int = 32  # 書き込み（POST・PUT・DELETEなど）の同時実行数の上限
+    ADMISSION_AUTH_MAX_IN_FLIGHT: int = 4  # パスワードのハッシュ化を伴うルートの同時実行数の上限
+    ADMISSION_AUTH_PATHS: list[str] = ["/auth/login", "/auth/register", "/auth/reset-password"]  # パスワードのハッシュ化を伴うルート（完全一致）
+    ADMISSION_EXEMPT_PATHS: list[str] = ["/metrics", "/admin"]  # 流量制御の対象外とするパスの接頭辞
+    ADMISSION_MAX_QUEUE: int = 256  # 待機できるリクエスト数の上限
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0  # 待機の期限（秒）。超過した場合は503を返却する
+    ADMISSION_POOL_WAIT_THRESHOLD_MS: float = 200.0  # DB接続待ちの平均がこれを超えた場合、読み取り以外を即座に拒否する（ミリ秒）
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1  # 503応答のRetry-Afterヘッダーの値（秒）
+
+    # レート制限設定
+    RATE_LIMIT_ENABLED: bool = False  # ユーザー・IPアドレスごとのレート制限を有効にする
+    RATE_LIMIT_BACKEND: str = "memory"  # memory: ワーカーごとのメモリ, redis: 全ワーカーで共有（redisパッケージが必要）
+    RATE_LIMIT_REDIS_URL: str | None = None  # RATE_LIMIT_BACKEND=redisの場合の接続先（例: redis://redis:6379/0）
+    RATE_LIMIT_DEFAULT: str = "20/second"  # ルールが指定されていないルートの上限（「回数/期間」形式、ルート間で共有）
+    RATE_LIMIT_RULES: dict[str, str] = {  # 「メソッド パス」ごとの上限
+        "POST /auth/login": "10/minute",
+        "POST /auth/register": "5/hour",
+        "POST /auth/reset-password": "5/minute",
+        "POST /report/import": "10/minute",
+    }
+    RATE_LIMIT_ROLE_MULTIPLIERS: dict[int, float] = {3: 2.0, 4: 10.0, 5: 10.0}  # ロールごとの上限の倍率（一般会員・管理者・オーナー）
+    RATE_LIMIT_EXEMPT_PATHS: list[str] = ["/metrics"]  # レート制限の対象外とするパスの接頭辞
+    RATE_LIMIT_SHARDS: int = 16  # メモリ上のバケットのシャード数
+    RATE_LIMIT_MAX_KEYS: int = 100_000  # メモリ上に保持するバケット数の上限
+
+    # リクエストの期限設定
+    # 期限を超えたリクエストは504を返却し、DBのクエリはstatement_timeoutで取り消す
+    REQUEST_DEADLINE_ENABLED: bool = True
+    REQUEST_DEADLINE_SECONDS: float = 30.0  # ルールが指定されていないルートの期限（秒）
+    REQUEST_DEADLINE_RULES: dict[str, float] = {  # 「メソッド パス」の接頭辞ごとの期限（秒）。0の場合は期限なし
+        "GET /export": 0,  # ストリーミングのため、EXPORT_IDLE_TIMEOUT_MSで制御する
+        "POST /report/import": 300.0,
+        "POST /admin/profile": 0,
+        "GET /metrics": 0,
+    }
+    REQUEST_DEADLINE_HEADER: str = "X-Request-Timeout"  # クライアントが期限（秒）を短く指定するためのヘッダー
+    DB_CLIENT_CHECK_INTERVAL_MS: int = 1000  # 実行中のクエリでクライアントの切断を確認する間隔（ms、PostgreSQL 14以降）。0で無効
 
 
 setting = Setting()
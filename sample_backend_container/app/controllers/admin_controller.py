@@ -0,0 +1,89 @@
+import structlog
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse
+
+from app.config.setting import setting
+from app.core.profiler import is_profiling, profile_file_path, profile_for
+from app.core.tracing import traced
+from app.schemas.user import UserResponse
+from app.services.auth_service import get_current_admin_user
+
+# ロガーの設定
+logger = structlog.get_logger()
+
+router = APIRouter()
+
+
+def _ensure_profiling_enabled() -> None:
+    if not setting.PROFILING_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profiling is disabled")
+
+
+@router.post("/profile", response_model=dict)
+@traced()
+async def profile_endpoint(
+    seconds: float = Query(10.0, gt=0, description="計測時間（秒）"),
+    interval_ms: float = Query(setting.PROFILING_DEFAULT_INTERVAL_MS, ge=1, le=1000, description="サンプリング間隔（ミリ秒）"),
+    all_threads: bool = Query(False, description="スレッドプールなどを含む全スレッドを計測する"),
+    current_user: UserResponse = Depends(get_current_admin_user),
+):
+    """【管理者用】
+    このワーカーのイベントループをN秒間サンプリングし、collapsed stackとasyncioタスクの一覧を出力する処理
+
+    Args:
+        seconds (float): 計測時間（秒）。
+        interval_ms (float): サンプリング間隔（ミリ秒）。
+        all_threads (bool): 全スレッドを計測するかどうか。
+        current_user (UserResponse): 現在ログイン中の管理者ユーザー。
+
+    Returns:
+        dict: 出力ファイル名とサンプル数
+
+    Raises:
+        HTTPException: プロファイルが無効な場合、または別のプロファイルが実行中の場合。
+
+    """
+    logger.info("profile_endpoint - start", seconds=seconds, interval_ms=interval_ms, user_id=current_user.user_id)
+    try:
+        _ensure_profiling_enabled()
+        if seconds > setting.PROFILING_MAX_SECONDS:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"seconds must be <= {setting.PROFILING_MAX_SECONDS}")
+        if is_profiling():
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Profiling is already running")
+        result = await profile_for(seconds, interval_ms / 1000, all_threads)
+        logger.info("profile_endpoint - success", **vars(result))
+        return vars(result)
+    finally:
+        logger.info("profile_endpoint - end")
+
+
+@router.get("/profile/{filename}")
+@traced()
+async def download_profile_endpoint(
+    filename: str,
+    current_user: UserResponse = Depends(get_current_admin_user),
+):
+    """【管理者用】
+    プロファイル結果のファイルをダウンロードする処理
+
+    Args:
+        filename (str): プロファイル結果のファイル名。
+        current_user (UserResponse): 現在ログイン中の管理者ユーザー。
+
+    Returns:
+        FileResponse: プロファイル結果のファイル
+
+    Raises:
+        HTTPException: プロファイルが無効な場合、またはファイルが存在しない場合。
+
+    """
+    logger.info("download_profile_endpoint - start", filename=filename, user_id=current_user.user_id)
+    try:
+        _ensure_profiling_enabled()
+        path = profile_file_path(filename)
+        if path is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+        logger.info("download_profile_endpoint - success")
+        return FileResponse(path, media_type="text/plain", filename=filename)
+    finally:
+        logger.info("download_profile_endpoint - end")
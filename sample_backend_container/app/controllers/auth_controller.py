@@ -3,8 +3,10 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.responses import FastJSONResponse
 from app.core.security import authenticate_user, create_access_token, oauth2_scheme
-from app.database import get_db
+from app.core.tracing import traced
+from app.database import get_db, get_read_db
 from app.models.user import User
 from app.schemas.user import PasswordReset, UserCreate, UserResponse
 from app.services.auth_service import create_user, get_current_user, reset_password
@@ -15,7 +17,8 @@ logger = structlog.get_logger()
 router = APIRouter()
 
 @router.get("/me", response_model=UserResponse)
-async def get_me(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
+@traced()
+async def get_me(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_read_db)):
     """現在ログインしているユーザーの情報を取得するエンドポイント。
 
     Args:
@@ -30,11 +33,12 @@ async def get_me(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends
     try:
         user = await get_current_user(db, token)
         logger.info("get_me - success", user_id=user.user_id)
-        return user
+        return FastJSONResponse(user)
     finally:
         logger.info("get_me - end")
 
 @router.post("/register", response_model=dict)
+@traced()
 async def register_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
     """新しいユーザーを登録するエンドポイント。
 
@@ -55,7 +59,8 @@ async def register_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
         logger.info("register_user - end")
 
 @router.post("/login", response_model=dict)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+@traced()
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_read_db)):
     """ログイン処理を行うエンドポイント。
 
     Args:
@@ -76,13 +81,15 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSessi
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        access_token = create_access_token(data={"sub": user.email})  # アクセストークンを生成
+        # レート制限でDBに問い合わせずにロールを判定できるよう、トークンにロールを含める
+        access_token = create_access_token(data={"sub": user.email, "role": user.user_role})  # アクセストークンを生成
         logger.info("login - success", user_id=user.user_id)
         return {"access_token": access_token, "token_type": "bearer"}
     finally:
         logger.info("login - end")
 
 @router.post("/logout")
+@traced()
 async def logout(current_user: User = Depends(get_current_user)):
     """ログアウト処理を行うエンドポイント。
 
@@ -102,6 +109,7 @@ async def logout(current_user: User = Depends(get_current_user)):
         logger.info("logout - end")
 
 @router.post("/reset-password", response_model=dict)
+@traced()
 async def reset_password_endpoint(data: PasswordReset, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
     """パスワードリセット処理を行うエンドポイント。
 
@@ -1,9 +1,11 @@
 import structlog
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.slow_query import recorder as slow_query_recorder
+from app.core.tracing import traced
 from app.database import get_db
-from app.seeders.seed_data import clear_data, seed_data
+from app.seeders.seed_data import ClearMode, clear_data, restore_data, seed_data, snapshot_data
 
 # ロガーの設定
 logger = structlog.get_logger()
@@ -12,28 +14,32 @@ router = APIRouter()
 
 
 @router.post("/clear_data", response_model=dict)
+@traced()
 async def clear_data_endpoint(
+    mode: ClearMode = Query("recreate", description="recreate: テーブルを再作成, truncate: TRUNCATEで高速に削除"),
     db: AsyncSession = Depends(get_db),
 ):
     """【開発用】
     全テーブルのクリア処理
 
     Args:
+        mode (ClearMode): クリア方式。
         db (AsyncSession): データベースセッション。
 
     Returns:
         dict: 成功メッセージ
 
     """
-    logger.info("clear_data_endpoint - start")
+    logger.info("clear_data_endpoint - start", mode=mode)
     try:
-        await clear_data()
+        await clear_data(mode)
         logger.info("clear_data_endpoint - success")
         return   {"msg": "clear_data API successfully"}
     finally:
         logger.info("clear_data_endpoint - end")
 
 @router.post("/seed_data", response_model=dict)
+@traced()
 async def seed_data_endpoint(
     db: AsyncSession = Depends(get_db),
 ):
@@ -53,3 +59,67 @@ async def seed_data_endpoint(
         return  {"msg": "seed_data API successfully"}
     finally:
         logger.info("seed_data_endpoint - end")
+
+@router.post("/snapshot_data", response_model=dict)
+@traced()
+async def snapshot_data_endpoint():
+    """【開発用】
+    現在のデータをスナップショットとして保存する処理
+
+    Returns:
+        dict: 成功メッセージ
+
+    """
+    logger.info("snapshot_data_endpoint - start")
+    try:
+        await snapshot_data()
+        logger.info("snapshot_data_endpoint - success")
+        return {"msg": "snapshot_data API successfully"}
+    finally:
+        logger.info("snapshot_data_endpoint - end")
+
+@router.post("/restore_data", response_model=dict)
+@traced()
+async def restore_data_endpoint():
+    """【開発用】
+    スナップショットからデータを復元する処理
+
+    Returns:
+        dict: 成功メッセージ
+
+    Raises:
+        HTTPException: スナップショットが存在しない場合。
+
+    """
+    logger.info("restore_data_endpoint - start")
+    try:
+        if not await restore_data():
+            logger.warning("restore_data_endpoint - snapshot not found")
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Snapshot not found")
+        logger.info("restore_data_endpoint - success")
+        return {"msg": "restore_data API successfully"}
+    finally:
+        logger.info("restore_data_endpoint - end")
+
+@router.get("/slow_queries", response_model=list[dict])
+@traced()
+async def slow_queries_endpoint(
+    limit: int = Query(20, ge=1, le=1000, description="取得する件数"),
+):
+    """【開発用】
+    合計所要時間の大きい順にスロークエリのフィンガープリントを取得する処理
+
+    Args:
+        limit (int): 取得する件数。
+
+    Returns:
+        list[dict]: フィンガープリントごとの集計結果
+
+    """
+    logger.info("slow_queries_endpoint - start", limit=limit)
+    try:
+        result = slow_query_recorder.top(limit)
+        logger.info("slow_queries_endpoint - success", count=len(result))
+        return result
+    finally:
+        logger.info("slow_queries_endpoint - end")
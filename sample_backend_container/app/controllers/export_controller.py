@@ -0,0 +1,54 @@
+from uuid import UUID
+
+import structlog
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.schemas.export import ExportFormat, ExportTarget
+from app.schemas.user import UserResponse
+from app.services.auth_service import get_current_user
+from app.services.export_service import (
+    export_filename,
+    export_media_type,
+    export_user_data,
+    validate_export_request,
+)
+
+# ロガーの設定
+logger = structlog.get_logger()
+
+router = APIRouter()
+
+
+@router.get("")
+async def export_user_data_endpoint(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format", description="出力形式 (ndjson, csv)"),
+    target: ExportTarget = Query(ExportTarget.ALL, description="エクスポート対象"),
+    gzip: bool = Query(False, description="gzip圧縮して出力する"),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """ログイン中のユーザーのレポートと履歴をストリーミングでエクスポートするエンドポイント。
+
+    Args:
+        export_format (ExportFormat): 出力形式。
+        target (ExportTarget): エクスポート対象。
+        gzip (bool): gzip圧縮の有無。
+        current_user (UserResponse): 現在ログイン中のユーザー。
+
+    Returns:
+        StreamingResponse: エクスポートデータのストリーミングレスポンス。
+
+    """
+    logger.info("export_user_data_endpoint - start", user_id=current_user.user_id, export_format=export_format, target=target, gzip=gzip)
+    try:
+        validate_export_request(export_format, target)
+        filename = export_filename(export_format, target, gzip)
+        endpoint_result = StreamingResponse(
+            export_user_data(UUID(str(current_user.user_id)), export_format, target, gzip),
+            media_type=export_media_type(export_format, gzip),
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+        logger.info("export_user_data_endpoint - success", user_id=current_user.user_id)
+        return endpoint_result
+    finally:
+        logger.info("export_user_data_endpoint - end")
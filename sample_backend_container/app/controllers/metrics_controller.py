@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import CONTENT_TYPE_LATEST, REGISTRY
+
+router = APIRouter()
+
+
+@router.get("", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics_endpoint():
+    """Prometheusのテキスト形式でメトリクスを返却するエンドポイント。
+
+    スクレイプごとに呼び出されるため、他のエンドポイントと異なり開始・終了のログは出力しない。
+
+    Returns:
+        PlainTextResponse: メトリクスのテキスト。
+
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE_LATEST)
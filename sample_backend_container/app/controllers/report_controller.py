@@ -1,16 +1,25 @@
+from uuid import UUID
+
 import structlog
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.core.responses import FastJSONResponse
+from app.core.tracing import traced
+from app.database import get_db, get_read_db
 from app.models.user import User
-from app.schemas.report import RequestReport, ResponseReport
+from app.schemas.report import RequestReport, RequestReportBatch, ResponseRenderedReport, ResponseReport, ResponseReportImport
 from app.schemas.user import UserResponse
 from app.services.auth_service import get_current_user
+from app.services.report_import_service import import_reports
+from app.services.report_render_service import get_rendered_report_service
 from app.services.report_service import (
     create_report,
     delete_report,
     get_report_by_id_service,
+    get_reports_by_ids_service,
+    list_reports_service,
+    search_reports_service,
     update_report,
 )
 
@@ -21,6 +30,7 @@ router = APIRouter()
 
 
 @router.post("", response_model=ResponseReport)
+@traced()
 async def create_report_endpoint(
     report: RequestReport,
     current_user: UserResponse = Depends(get_current_user),
@@ -40,14 +50,45 @@ async def create_report_endpoint(
     logger.info("create_report_endpoint - start", user_id=current_user.user_id, report_title=report.title)
     try:
         endpoint_result = await create_report(report,current_user, db)
+        # サービスで検証済みのモデルのため、response_modelでの再検証を省略して直接シリアライズする
         logger.info("create_report_endpoint - success", report_id=endpoint_result.report_id)
-        return endpoint_result
+        return FastJSONResponse(endpoint_result)
     finally:
         logger.info("create_report_endpoint - end")
 
 
+@router.post("/import", response_model=ResponseReportImport)
+@traced()
+async def import_reports_endpoint(
+    request: Request,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """NDJSON形式のリクエストボディからレポートを一括インポートするエンドポイント。
+
+    ボディは1行1レポートのNDJSONとし、ストリーミングで受信しながらチャンク単位で取り込みます。
+
+    Args:
+        request (Request): リクエストオブジェクト（ボディをストリーミングで読み出す）。
+        current_user (UserResponse): 現在ログイン中のユーザー。
+        db (AsyncSession): データベースセッション。
+
+    Returns:
+        ResponseReportImport: 取り込み件数と行ごとのエラー。
+
+    """
+    logger.info("import_reports_endpoint - start", user_id=current_user.user_id)
+    try:
+        endpoint_result = await import_reports(request.stream(), UUID(str(current_user.user_id)), db)
+        logger.info("import_reports_endpoint - success", imported=endpoint_result.imported, failed=endpoint_result.failed)
+        return FastJSONResponse(endpoint_result)
+    finally:
+        logger.info("import_reports_endpoint - end")
+
+
 
 @router.put("/{report_id}", response_model=ResponseReport)
+@traced()
 async def update_report_endpoint(
     report_id: str,
     updated_report: RequestReport,
@@ -70,12 +111,13 @@ async def update_report_endpoint(
     try:
         endpoint_result = await update_report(report_id, updated_report, db)
         logger.info("update_report_endpoint - success", report_id=endpoint_result.report_id)
-        return endpoint_result
+        return FastJSONResponse(endpoint_result)
     finally:
         logger.info("update_report_endpoint - end")
 
 
 @router.delete("/{report_id}")
+@traced()
 async def delete_report_endpoint(
     report_id: str,
     db: AsyncSession = Depends(get_db),
@@ -101,10 +143,98 @@ async def delete_report_endpoint(
         logger.info("delete_report_endpoint - end")
 
 
+@router.get("", response_model=list[ResponseReport])
+@traced()
+async def list_reports_endpoint(
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """ログイン中のユーザーが作成したレポートの一覧を取得するエンドポイント。
+
+    Args:
+        limit (int): 取得件数 (100件以内)。
+        offset (int): 取得開始位置。
+        current_user (UserResponse): 現在ログイン中のユーザー。
+        db (AsyncSession): データベースセッション。
+
+    Returns:
+        list[ResponseReport]: レポートのリスト（新しい順）。
+
+    """
+    logger.info("list_reports_endpoint - start", user_id=current_user.user_id, limit=limit, offset=offset)
+    try:
+        endpoint_result = await list_reports_service(UUID(str(current_user.user_id)), limit, offset, db)
+        logger.info("list_reports_endpoint - success", count=len(endpoint_result))
+        return FastJSONResponse(endpoint_result)
+    finally:
+        logger.info("list_reports_endpoint - end")
+
+
+@router.get("/search", response_model=list[ResponseReport])
+@traced()
+async def search_reports_endpoint(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """タイトルでレポートを検索するエンドポイント。公開レポートと自身のレポートが対象。
+
+    Args:
+        q (str): 検索キーワード（部分一致）。
+        limit (int): 取得件数 (100件以内)。
+        offset (int): 取得開始位置。
+        current_user (UserResponse): 現在ログイン中のユーザー。
+        db (AsyncSession): データベースセッション。
+
+    Returns:
+        list[ResponseReport]: レポートのリスト（新しい順）。
+
+    """
+    logger.info("search_reports_endpoint - start", user_id=current_user.user_id, q=q)
+    try:
+        endpoint_result = await search_reports_service(q, UUID(str(current_user.user_id)), limit, offset, db)
+        logger.info("search_reports_endpoint - success", count=len(endpoint_result))
+        return FastJSONResponse(endpoint_result)
+    finally:
+        logger.info("search_reports_endpoint - end")
+
+
+@router.post("/batch", response_model=list[ResponseReport])
+@traced()
+async def get_reports_batch_endpoint(
+    request_batch: RequestReportBatch,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """指定されたIDのレポートを一括取得するエンドポイント。公開レポートと自身のレポートが対象。
+
+    Args:
+        request_batch (RequestReportBatch): 取得するレポートIDのリスト。
+        current_user (UserResponse): 現在ログイン中のユーザー。
+        db (AsyncSession): データベースセッション。
+
+    Returns:
+        list[ResponseReport]: 見つかったレポートのリスト（指定順、存在しないID・閲覧できないレポートは含まれない）。
+
+    """
+    logger.info("get_reports_batch_endpoint - start", user_id=current_user.user_id, count=len(request_batch.report_ids))
+    try:
+        endpoint_result = await get_reports_by_ids_service(request_batch.report_ids, UUID(str(current_user.user_id)), db)
+        logger.info("get_reports_batch_endpoint - success", found=len(endpoint_result))
+        return FastJSONResponse(endpoint_result)
+    finally:
+        logger.info("get_reports_batch_endpoint - end")
+
+
 @router.get("/{report_id}", response_model=ResponseReport)
+@traced()
 async def get_report_by_id(
     report_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """指定されたIDのレポートを取得するエンドポイント。
 
@@ -113,13 +243,44 @@ async def get_report_by_id(
         db (AsyncSession): データベースセッション。
 
     Returns:
-        ResponseReport: 取得したレポートのデータ。
+        ResponseReport: 取得したレポートのデータ。DBが利用できずキャッシュの期限切れの値を返却した場合は、
+            Warningヘッダー（110 Response is Stale）とAgeヘッダーを付与する。
 
     """
     logger.info("get_report_by_id - start", report_id=report_id)
     try:
-        endpoint_result = await get_report_by_id_service(report_id, db)
-        logger.info("get_report_by_id - success", report_id=report_id)
-        return endpoint_result
+        endpoint_result, stale_age = await get_report_by_id_service(report_id, db)
+        headers = None if stale_age is None else {"Warning": '110 - "Response is Stale"', "Age": str(int(stale_age))}
+        logger.info("get_report_by_id - success", report_id=report_id, stale=stale_age is not None)
+        return FastJSONResponse(endpoint_result, headers=headers)
     finally:
         logger.info("get_report_by_id - end")
+
+
+@router.get("/{report_id}/rendered", response_model=ResponseRenderedReport)
+@traced()
+async def get_rendered_report_endpoint(
+    report_id: str,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """指定されたIDのレポートの本文を、サニタイズ済みのHTMLへ変換して取得するエンドポイント。
+
+    Markdown形式の本文はHTMLへ変換し、HTML形式の本文は許可したタグ・属性以外を除去します。
+
+    Args:
+        report_id (str): 取得するレポートのID。
+        db (AsyncSession): データベースセッション。
+
+    Returns:
+        ResponseRenderedReport: 変換結果。DBが利用できずレポートのキャッシュの期限切れの値を使用した場合は、
+            Warningヘッダー（110 Response is Stale）とAgeヘッダーを付与する。
+
+    """
+    logger.info("get_rendered_report_endpoint - start", report_id=report_id)
+    try:
+        endpoint_result, stale_age = await get_rendered_report_service(report_id, db)
+        headers = None if stale_age is None else {"Warning": '110 - "Response is Stale"', "Age": str(int(stale_age))}
+        logger.info("get_rendered_report_endpoint - success", report_id=report_id, content_hash=endpoint_result.content_hash)
+        return FastJSONResponse(endpoint_result, headers=headers)
+    finally:
+        logger.info("get_rendered_report_endpoint - end")
@@ -0,0 +1,234 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import Counter
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.config.setting import setting
+from app.core.metrics import ADMISSION_QUEUED, DB_POOL_WAIT_SECONDS
+
+# ルート分類。値が小さいほど優先度が高い
+ROUTE_CLASS_READ = "read"
+ROUTE_CLASS_WRITE = "write"
+ROUTE_CLASS_AUTH = "auth"
+PRIORITIES = {ROUTE_CLASS_READ: 0, ROUTE_CLASS_WRITE: 1, ROUTE_CLASS_AUTH: 2}
+
+# 拒否理由
+REJECT_QUEUE_FULL = "queue_full"
+REJECT_QUEUE_TIMEOUT = "queue_timeout"
+REJECT_POOL_SATURATED = "pool_saturated"
+
+_READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def classify(method: str, path: str) -> str | None:
+    """リクエストをルート分類に振り分けます。流量制御の対象外の場合はNone。
+
+    Args:
+        method (str): HTTPメソッド。
+        path (str): リクエストパス。
+
+    Returns:
+        str | None: ルート分類。
+
+    """
+    if any(path.startswith(prefix) for prefix in setting.ADMISSION_EXEMPT_PATHS):
+        return None
+    # パスワードのハッシュ化を伴うルートは最も重いため、メソッドに関わらず別枠とする
+    if path in setting.ADMISSION_AUTH_PATHS:
+        return ROUTE_CLASS_AUTH
+    return ROUTE_CLASS_READ if method in _READ_METHODS else ROUTE_CLASS_WRITE
+
+
+class PoolWaitTracker:
+    """コネクションプールからの接続取得の待ち時間を指数移動平均で保持するクラス。
+    """
+
+    def __init__(self, alpha: float = 0.2, stale_seconds: float = 5.0) -> None:
+        """
+        Args:
+            alpha (float): 指数移動平均の平滑化係数。
+            stale_seconds (float): この秒数以上観測がない場合は待ち時間を0とみなす。
+
+        """
+        self.alpha = alpha
+        self.stale_seconds = stale_seconds
+        self._average_ms = 0.0
+        self._updated = 0.0
+
+    def observe(self, wait_ms: float) -> None:
+        self._average_ms += self.alpha * (wait_ms - self._average_ms)
+        self._updated = time.monotonic()
+
+    def average_ms(self) -> float:
+        # DBへのアクセスが途絶えた場合に、過去の高い値で拒否し続けないようにする
+        if time.monotonic() - self._updated > self.stale_seconds:
+            return 0.0
+        return self._average_ms
+
+
+pool_wait = PoolWaitTracker()
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """接続の取得待ち時間をpool_waitとメトリクスに記録するコネクションプール。
+
+    プールに空きがない場合の待ち時間に加え、新規接続時は接続の確立時間も含まれる。
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - started
+            pool_wait.observe(elapsed * 1000)
+            DB_POOL_WAIT_SECONDS.observe(elapsed)
+
+
+class AdmissionController:
+    """ルート分類ごとの同時実行数を制限し、超過したリクエストを優先度順に待機させるクラス。
+
+    空きが出た時点で、優先度の高い（読み取り）分類の待機中リクエストから順に許可する。
+    待機が期限を超えた場合や、DBの接続待ちが閾値を超えている場合は拒否して即座に返却させる。
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, int],
+        max_in_flight: int,
+        max_queue: int,
+        queue_timeout: float,
+        pool_wait_threshold_ms: float,
+        tracker: PoolWaitTracker,
+    ) -> None:
+        """
+        Args:
+            limits (dict[str, int]): ルート分類ごとの同時実行数の上限。
+            max_in_flight (int): 全体の同時実行数の上限。
+            max_queue (int): 待機できるリクエスト数の上限。
+            queue_timeout (float): 待機の期限（秒）。
+            pool_wait_threshold_ms (float): 優先度の低い分類を拒否するDB接続待ち時間の閾値（ミリ秒）。
+            tracker (PoolWaitTracker): DB接続待ち時間の取得元。
+
+        """
+        self.limits = limits
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.pool_wait_threshold_ms = pool_wait_threshold_ms
+        self.tracker = tracker
+        self.in_flight: Counter[str] = Counter()
+        self.queued: Counter[str] = Counter()
+        self._total = 0
+        self._waiters: list[tuple[int, int, str, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+
+    def _has_capacity(self, route_class: str) -> bool:
+        return self._total < self.max_in_flight and self.in_flight[route_class] < self.limits[route_class]
+
+    def _must_wait(self, route_class: str, priority: int) -> bool:
+        """待機中のリクエストを追い越さないよう、新しいリクエストを待機させるかを返却します。
+
+        同じ分類の待機中リクエストがある場合と、上限に達していない優先度の高い分類が全体の空きを待っている場合のみ待機させます。
+        上限に達した他の分類の待機は空きを取り合わないため、その後ろで待機させません。
+        """
+        for other, value in PRIORITIES.items():
+            if not self.queued[other]:
+                continue
+            if other == route_class:
+                return True
+            if value < priority and self.in_flight[other] < self.limits[other]:
+                return True
+        return not self._has_capacity(route_class)
+
+    def _admit(self, route_class: str) -> None:
+        self._total += 1
+        self.in_flight[route_class] += 1
+
+    def _dequeue(self, route_class: str) -> None:
+        self.queued[route_class] -= 1
+        ADMISSION_QUEUED.dec(route_class)
+
+    async def acquire(self, route_class: str) -> str | None:
+        """実行の許可を取得します。許可された場合は処理後にrelease()を呼び出してください。
+
+        Args:
+            route_class (str): ルート分類。
+
+        Returns:
+            str | None: 拒否した場合はその理由。許可した場合はNone。
+
+        """
+        priority = PRIORITIES[route_class]
+        # DBの接続待ちが長い場合、最優先の分類以外は待機させずに拒否する
+        if priority > 0 and self.tracker.average_ms() > self.pool_wait_threshold_ms:
+            return REJECT_POOL_SATURATED
+        if not self._must_wait(route_class, priority):
+            self._admit(route_class)
+            return None
+        if sum(self.queued.values()) >= self.max_queue:
+            return REJECT_QUEUE_FULL
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), route_class, future))
+        self.queued[route_class] += 1
+        ADMISSION_QUEUED.inc(route_class)
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await future
+        except TimeoutError:
+            if future.done() and not future.cancelled():
+                # 期限と同時に許可された場合はそのまま実行する
+                return None
+            future.cancel()
+            self._dequeue(route_class)
+            return REJECT_QUEUE_TIMEOUT
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(route_class)
+            else:
+                future.cancel()
+                self._dequeue(route_class)
+            raise
+        return None
+
+    def release(self, route_class: str) -> None:
+        """実行の許可を返却し、待機中のリクエストを優先度順に許可します。
+        """
+        self._total -= 1
+        self.in_flight[route_class] -= 1
+        skipped = []
+        while self._waiters and self._total < self.max_in_flight:
+            entry = heapq.heappop(self._waiters)
+            _, _, waiting_class, future = entry
+            if future.done():
+                # 期限切れやクライアントの切断で取り消された待機
+                continue
+            if self.in_flight[waiting_class] >= self.limits[waiting_class]:
+                skipped.append(entry)
+                continue
+            self._admit(waiting_class)
+            self._dequeue(waiting_class)
+            future.set_result(None)
+        for entry in skipped:
+            heapq.heappush(self._waiters, entry)
+
+
+def create_admission_controller() -> AdmissionController:
+    """設定値からAdmissionControllerを作成します。
+    """
+    return AdmissionController(
+        limits={
+            ROUTE_CLASS_READ: setting.ADMISSION_READ_MAX_IN_FLIGHT,
+            ROUTE_CLASS_WRITE: setting.ADMISSION_WRITE_MAX_IN_FLIGHT,
+            ROUTE_CLASS_AUTH: setting.ADMISSION_AUTH_MAX_IN_FLIGHT,
+        },
+        max_in_flight=setting.ADMISSION_MAX_IN_FLIGHT,
+        max_queue=setting.ADMISSION_MAX_QUEUE,
+        queue_timeout=setting.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+        pool_wait_threshold_ms=setting.ADMISSION_POOL_WAIT_THRESHOLD_MS,
+        tracker=pool_wait,
+    )
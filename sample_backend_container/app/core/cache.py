@@ -0,0 +1,84 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+from app.core.metrics import CACHE_REQUESTS_TOTAL, record_cache_lookup
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """有効期限付きのLRUキャッシュ。
+
+    有効期限（ttl_seconds）内の値のみをget()で返却する。期限切れの値もstale_seconds秒の間は保持し、
+    DBが利用できない場合などにget_stale()で取得できる（stale-while-revalidate）。
+    ttl_secondsが0の場合はget()で値を返却せず、最後に取得できた値の保持のみに使用する。
+    値はワーカーのメモリ上に保持するため、ワーカー間では共有されない。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: float,
+        stale_seconds: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            name (str): キャッシュ名（メトリクスのラベル）。
+            ttl_seconds (float): 値を有効とする秒数。
+            stale_seconds (float): 有効期限の経過後も期限切れの値として保持する秒数。
+            max_entries (int): 保持する件数の上限。超えた場合は最も古く参照された値から破棄する。
+            clock (Callable[[], float]): 現在時刻（秒）を返す関数。
+
+        """
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[V, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        """有効期限内の値を返却します。ない場合はNone。
+        """
+        if self.ttl_seconds <= 0:
+            return None
+        entry = self._entries.get(key)
+        hit = entry is not None and self._clock() - entry[1] < self.ttl_seconds
+        record_cache_lookup(self.name, hit)
+        if not hit:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]  # type: ignore[index]
+
+    def get_stale(self, key: K) -> tuple[V, float] | None:
+        """期限切れを含む値と、保存してからの経過秒数を返却します。保持期間を過ぎている場合はNone。
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        age = self._clock() - entry[1]
+        if age >= self.ttl_seconds + self.stale_seconds:
+            del self._entries[key]
+            return None
+        CACHE_REQUESTS_TOTAL.inc(self.name, "stale")
+        return entry[0], age
+
+    def set(self, key: K, value: V) -> None:
+        self._entries[key] = (value, self._clock())
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
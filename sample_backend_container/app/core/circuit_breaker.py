@@ -0,0 +1,166 @@
+import time
+from collections.abc import Callable
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.metrics import DB_CIRCUIT_REJECTED_TOTAL, DB_CIRCUIT_STATE
+
+# ログの設定
+logger = structlog.get_logger()
+
+# サーキットブレーカーの状態
+CLOSED = "closed"  # 通常どおり接続する
+OPEN = "open"  # 接続を試みずに失敗させる
+HALF_OPEN = "half_open"  # 一部の接続のみ試行し、成功した場合は通常の状態へ戻す
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """サーキットブレーカーが開いているため、DBへ接続せずに失敗した場合の例外。
+    """
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        """
+        Args:
+            name (str): サーキットブレーカーの名前。
+            retry_after (float): 接続の再試行が可能になるまでの秒数。
+
+        """
+        super().__init__(f"circuit '{name}' is open")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """DBへの接続の失敗が続いた場合に、一定時間接続を試みずに即座に失敗させるクラス。
+
+    接続の失敗（接続中の切断を含む）が閾値の回数連続すると開き、open_seconds秒の間はCircuitOpenErrorを送出する。
+    経過後は半開となり、half_open_probes件の接続のみを試行する。成功した場合は閉じ、失敗した場合は再び開く。
+    状態はワーカーのメモリ上に保持するため、ワーカー間では共有されない。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        open_seconds: float,
+        half_open_probes: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            name (str): サーキットブレーカーの名前（メトリクスのラベル）。
+            failure_threshold (int): 開くまでの連続した失敗の回数。
+            open_seconds (float): 開いてから半開になるまでの秒数。
+            half_open_probes (int): 半開の間に同時に試行する接続数。
+            clock (Callable[[], float]): 現在時刻（秒）を返す関数。
+
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        DB_CIRCUIT_STATE.set(_STATE_VALUES[CLOSED], name)
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def _transition(self, state: str) -> None:
+        self._state = state
+        self._probes = 0
+        DB_CIRCUIT_STATE.set(_STATE_VALUES[state], self.name)
+
+    def retry_after(self) -> float:
+        """接続の再試行が可能になるまでの秒数を返却します。
+        """
+        return max(self._opened_at + self.open_seconds - self._clock(), 0.0)
+
+    def before_call(self) -> None:
+        """接続を試行できるか判定します。
+
+        Raises:
+            CircuitOpenError: 開いている場合、または半開で試行中の接続が上限に達している場合。
+
+        """
+        state = self.state
+        if state == CLOSED:
+            return
+        if state == HALF_OPEN and self._probes < self.half_open_probes:
+            self._probes += 1
+            return
+        DB_CIRCUIT_REJECTED_TOTAL.inc(self.name)
+        raise CircuitOpenError(self.name, self.retry_after())
+
+    def record_success(self) -> None:
+        self._failures = 0
+        if self._state != CLOSED:
+            logger.info("circuit closed", circuit=self.name)
+            self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+            logger.warning("circuit opened", circuit=self.name, failures=self._failures, open_seconds=self.open_seconds)
+            self._opened_at = self._clock()
+            self._transition(OPEN)
+
+    def release(self) -> None:
+        """成否が不明なまま終了した試行（取り消しなど）を解除します。
+        """
+        if self._state == HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+
+def is_unavailable(exc: BaseException) -> bool:
+    """DBを利用できないことによる例外（接続の失敗・切断・遮断）か判定します。
+
+    クエリの内容によるエラー（制約違反やstatement_timeoutなど）はFalseを返却します。
+    """
+    if isinstance(exc, CircuitOpenError | OSError):
+        return True
+    return isinstance(exc, DBAPIError) and exc.connection_invalidated
+
+
+def install_circuit_breaker(engine: AsyncEngine, breaker: CircuitBreaker) -> None:
+    """エンジンの接続にサーキットブレーカーを適用します。
+
+    新しい接続の作成前に判定を行い、接続の成否と接続中の切断を記録します。
+    プール済みの接続は切断の検知時にすべて破棄されるため、DBの停止後の接続は作成前の判定で即座に失敗します。
+
+    Args:
+        engine (AsyncEngine): 対象のエンジン。
+        breaker (CircuitBreaker): サーキットブレーカー。
+
+    """
+
+    def connect(dialect, conn_rec, cargs, cparams):
+        breaker.before_call()
+        try:
+            connection = dialect.connect(*cargs, **cparams)
+        except Exception:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # 取り消された場合はDBの状態が不明のため、失敗として数えない
+            breaker.release()
+            raise
+        breaker.record_success()
+        return connection
+
+    def handle_error(context) -> None:
+        # 接続時のエラーはconnectで記録済みのため、接続後の切断のみを対象とする
+        if context.is_disconnect and context.connection is not None:
+            breaker.record_failure()
+
+    event.listen(engine.sync_engine, "do_connect", connect)
+    event.listen(engine.sync_engine, "handle_error", handle_error)
@@ -0,0 +1,87 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config.setting import setting
+from app.core.instrumentation import IGNORE_OPTION
+
+# Postgresのstatement_timeoutによりクエリが取り消された場合のSQLSTATE（query_canceled）
+SQLSTATE_QUERY_CANCELED = "57014"
+
+# トランザクション内のみ有効なstatement_timeoutを設定するSQL（SET LOCALと同等）
+_SET_STATEMENT_TIMEOUT = "SELECT set_config('statement_timeout', $1, true)"
+
+# 現在のリクエストの期限（time.monotonic()の値）。期限がない場合はNone
+_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+
+def route_timeout(method: str, path: str) -> float:
+    """ルートの期限（秒）を返却します。0の場合は期限なし。
+
+    REQUEST_DEADLINE_RULESのうち、「メソッド パス」が最も長く前方一致するルールを適用します。
+
+    Args:
+        method (str): HTTPメソッド。
+        path (str): リクエストパス。
+
+    Returns:
+        float: 期限（秒）。
+
+    """
+    route = f"{method} {path}"
+    matched = max((prefix for prefix in setting.REQUEST_DEADLINE_RULES if route.startswith(prefix)), key=len, default=None)
+    return setting.REQUEST_DEADLINE_RULES[matched] if matched is not None else setting.REQUEST_DEADLINE_SECONDS
+
+
+def remaining() -> float | None:
+    """現在のリクエストの期限までの残り時間（秒）を返却します。期限がない場合はNone。
+    """
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+@contextmanager
+def deadline_scope(seconds: float) -> Iterator[float]:
+    """ブロック内の処理に期限を設定します。外側に短い期限がある場合はそちらを優先します。
+
+    Args:
+        seconds (float): 期限（秒）。
+
+    Yields:
+        float: 期限（time.monotonic()の値）。
+
+    """
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def _apply_statement_timeout(session, transaction, connection) -> None:
+    left = remaining()
+    if left is None or transaction.nested:
+        return
+    # 期限を過ぎている場合も、最初のクエリで即座に取り消されるよう最小値の1msを設定する
+    timeout_ms = max(int(left * 1000), 1)
+    # NOTE: 値をSQL文に埋め込むとasyncpgのプリペアドステートメントのキャッシュを消費するため、
+    #       SET LOCALと同等のset_config(..., true)にパラメーターとして渡す。
+    #       SQLの集計やN+1の検出、スロークエリの記録、トレーシングの対象外とする実行オプションを指定する。
+    connection.exec_driver_sql(_SET_STATEMENT_TIMEOUT, (f"{timeout_ms}ms",), execution_options={IGNORE_OPTION: True})
+
+
+def install_statement_timeout_listener() -> None:
+    """セッションのトランザクションの開始時に、リクエストの残り時間をstatement_timeoutに設定するリスナーを登録します。
+
+    期限を超えたクエリはDB側で取り消され、接続はすぐにプールへ返却されます。
+    """
+    if not event.contains(Session, "after_begin", _apply_statement_timeout):
+        event.listen(Session, "after_begin", _apply_statement_timeout)
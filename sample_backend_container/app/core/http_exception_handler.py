@@ -2,7 +2,8 @@ import traceback
 
 import structlog
 from fastapi import HTTPException, Request
-from fastapi.responses import JSONResponse
+
+from app.core.responses import FastJSONResponse
 
 # ロガーの設定
 logger = structlog.get_logger()
@@ -15,7 +16,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         exc (HTTPException): 発生したHTTP例外。
 
     Returns:
-        JSONResponse: エラーレスポンス。
+        FastJSONResponse: エラーレスポンス。
 
     """
     error_trace = traceback.format_exc()  # スタックトレースを取得
@@ -33,7 +34,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     )
 
     # JSONレスポンスを返却
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=exc.status_code,
         content={
             "detail": exc.detail,
@@ -0,0 +1,16 @@
+# 計測用のイベントリスナー（SQLの集計・スロークエリの記録・トレーシング）の対象外とするための実行オプション
+# statement_timeoutの設定やEXPLAINなど、アプリケーションのSQLではない実行に指定する
+IGNORE_OPTION = "instrumentation_ignore"
+
+
+def is_ignored(context) -> bool:
+    """SQLの実行が計測の対象外かを返却します。
+
+    Args:
+        context: SQLAlchemyのExecutionContext。カーソルを直接使用した場合などはNone。
+
+    Returns:
+        bool: 対象外の場合はTrue。
+
+    """
+    return context is None or bool(context.execution_options.get(IGNORE_OPTION))
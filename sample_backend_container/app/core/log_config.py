@@ -142,4 +142,6 @@ def configure_sqlalchemy_logging(test_env: int = 0) -> None:
     print("SQLAlchemy logging configured.")
 
 # ロガー作成
-logger = configure_logging()
+# NOTE: 読み込み時にディレクトリの作成などを行わないよう、ログの設定はmainのlifespanで行う。
+#       structlogのロガーは最初の出力時に設定を参照するため、設定前に作成しても問題ない。
+logger = structlog.get_logger()
@@ -0,0 +1,160 @@
+import asyncio
+import contextlib
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import structlog
+
+from app.core.metrics import EVENT_LOOP_BLOCKED_TOTAL, EVENT_LOOP_LAG_SECONDS
+
+# ログの設定
+logger = structlog.get_logger()
+
+
+@dataclass
+class BlockEvent:
+    """イベントループが閾値以上ブロックされた区間。
+    """
+
+    duration_ms: float
+    stack: str
+    source: str = ""
+    timestamp: str = ""
+
+
+def capture_stack(thread_id: int) -> str:
+    """指定したスレッドの現在のスタックを文字列で返却します。
+    """
+    frame = sys._current_frames().get(thread_id)
+    return "".join(traceback.format_stack(frame)) if frame is not None else ""
+
+
+class LoopMonitor:
+    """イベントループの遅延を計測し、ブロッキングを検出するモニター。
+
+    ループ内のハートビートタスクがsleepから復帰するまでの遅延を計測してメトリクスへ記録する。
+    別スレッドのウォッチドッグはハートビートが途絶えたことを検知すると、ブロック中のループのスタックを取得する。
+    ループが復帰した時点で、遅延が閾値以上であればスタックとともにブロック区間として記録する。
+    """
+
+    def __init__(self, interval: float, threshold_ms: float, history: int = 100) -> None:
+        """
+        Args:
+            interval (float): ハートビートの間隔（秒）。
+            threshold_ms (float): ブロックとして記録する遅延の閾値（ミリ秒）。
+            history (int): 保持する直近のブロック区間の件数。
+
+        """
+        self.interval = interval
+        self.threshold_ms = threshold_ms
+        self.recent_blocks: deque[BlockEvent] = deque(maxlen=history)
+        self._last_beat = time.monotonic()
+        self._pending_stack: str | None = None
+        self._loop_thread_id = 0
+        self._task: asyncio.Task | None = None
+        self._stop = threading.Event()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+
+    def start(self) -> None:
+        """実行中のイベントループでモニターを開始します。
+        """
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat(), name="loop-monitor")
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        self._watchdog.join()
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - started - self.interval, 0.0)
+            self._last_beat = time.monotonic()
+            EVENT_LOOP_LAG_SECONDS.observe(lag)
+
+            stack, self._pending_stack = self._pending_stack, None
+            if lag * 1000 >= self.threshold_ms:
+                self._record(BlockEvent(
+                    duration_ms=round(lag * 1000, 2),
+                    stack=stack or "",
+                    timestamp=datetime.now(ZoneInfo("Asia/Tokyo")).isoformat(),
+                ))
+
+    def _watch(self) -> None:
+        threshold = self.threshold_ms / 1000
+        while not self._stop.wait(threshold / 4):
+            # ハートビートが閾値を超えて途絶えている場合、ブロック中のスタックを1回だけ取得する
+            if self._pending_stack is None and time.monotonic() - self._last_beat > self.interval + threshold:
+                self._pending_stack = capture_stack(self._loop_thread_id)
+
+    def _record(self, event: BlockEvent) -> None:
+        self.recent_blocks.append(event)
+        EVENT_LOOP_BLOCKED_TOTAL.inc()
+        logger.warning("event loop blocked", duration_ms=event.duration_ms, stack=event.stack)
+
+
+class BlockingCallDetector:
+    """イベントループの1回のコールバック（コルーチンの1ステップなど）の実行時間を計測し、閾値を超えたものを記録するクラス。
+
+    asyncio.Handle._runを差し替えるため、テスト用途を想定している（uvloopでは動作しない）。
+    LoopMonitorと異なりイベントループに依存しないため、テストごとにループが異なる場合でも使用できる。
+    """
+
+    def __init__(self, threshold_ms: float) -> None:
+        self.threshold_ms = threshold_ms
+        self.events: list[BlockEvent] = []
+        self._original_run = asyncio.events.Handle._run
+        self._current: tuple[float, int] | None = None
+        self._captured_stack: str | None = None
+        self._stop = threading.Event()
+        self._watchdog = threading.Thread(target=self._watch, name="blocking-call-watchdog", daemon=True)
+
+    def install(self) -> None:
+        detector = self
+        original_run = self._original_run
+
+        def _run(handle: asyncio.Handle) -> None:
+            detector._current = (time.perf_counter(), threading.get_ident())
+            detector._captured_stack = None
+            try:
+                original_run(handle)
+            finally:
+                started, _ = detector._current
+                detector._current = None
+                duration_ms = (time.perf_counter() - started) * 1000
+                if duration_ms >= detector.threshold_ms:
+                    detector.events.append(BlockEvent(
+                        duration_ms=round(duration_ms, 2),
+                        stack=detector._captured_stack or "",
+                        # タスクのステップの場合はコルーチン名を含むタスクの表現を記録する
+                        source=repr(getattr(handle._callback, "__self__", handle)),
+                    ))
+
+        asyncio.events.Handle._run = _run  # type: ignore[method-assign]
+        self._watchdog.start()
+
+    def uninstall(self) -> None:
+        asyncio.events.Handle._run = self._original_run  # type: ignore[method-assign]
+        self._stop.set()
+        self._watchdog.join()
+
+    def _watch(self) -> None:
+        threshold = self.threshold_ms / 1000
+        while not self._stop.wait(threshold / 4):
+            current = self._current
+            if current and self._captured_stack is None and time.perf_counter() - current[0] > threshold:
+                self._captured_stack = capture_stack(current[1])
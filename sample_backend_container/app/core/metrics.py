@@ -0,0 +1,384 @@
+import asyncio
+import json
+import math
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import TypeVar
+
+from app.config.setting import setting
+
+# Prometheusクライアントのデフォルトと同じレイテンシのバケット（秒）
+DEFAULT_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+# テキスト形式のContent-Type
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = tuple[str, ...]
+
+# NOTE: メトリクスの更新はイベントループのスレッドからのみ行う前提のため、ロックを使用しない。
+#       値の更新は辞書とリストの単純な操作のみで、awaitを挟まないためコルーチン間で競合しない。
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric(ABC):
+    """メトリクスの基底クラス。ラベルの組み合わせごとに値を保持する。
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    @abstractmethod
+    def snapshot(self) -> dict[LabelValues, object]:
+        """ラベルの組み合わせごとの現在の値を返却します。
+        """
+
+    @abstractmethod
+    def reset(self) -> None:
+        """すべての値を破棄します。
+        """
+
+
+class Counter(Metric):
+    """単調増加するカウンター。
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def snapshot(self) -> dict[LabelValues, object]:
+        return dict(self._values)
+
+    def reset(self) -> None:
+        self._values.clear()
+
+
+class Gauge(Metric):
+    """増減する現在値。
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def snapshot(self) -> dict[LabelValues, object]:
+        return dict(self._values)
+
+    def reset(self) -> None:
+        self._values.clear()
+
+
+class Histogram(Metric):
+    """バケットごとの観測数と合計値を保持するヒストグラム。
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # ラベルごとに [バケット別の件数..., +Infの件数, 合計値] を保持する
+        self._values: dict[LabelValues, list[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        state = self._values.get(labels)
+        if state is None:
+            state = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+        # 累積ではなく該当バケットのみ加算し、出力時に累積する
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def count(self, *labels: str) -> float:
+        state = self._values.get(labels)
+        return sum(state[:-1]) if state else 0.0
+
+    def snapshot(self) -> dict[LabelValues, object]:
+        return {labels: list(state) for labels, state in self._values.items()}
+
+    def reset(self) -> None:
+        self._values.clear()
+
+
+MetricT = TypeVar("MetricT", bound=Metric)
+
+
+class Registry:
+    """メトリクスとスクレイプ時に値を更新するコレクターを管理するクラス。
+
+    マルチプロセスモードでは、各ワーカーが自プロセスの値をMETRICS_MULTIPROC_DIRへJSONで書き出し、
+    スクレイプを受けたワーカーが全ワーカー分を集計して出力する。
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: MetricT) -> MetricT:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicated metric: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def register_collector(self, collector: Callable[[], None]) -> None:
+        """スクレイプ直前に呼び出され、ゲージなどを最新の値に更新する関数を登録します。
+        """
+        self._collectors.append(collector)
+
+    def collect(self) -> dict[str, dict[LabelValues, object]]:
+        for collector in self._collectors:
+            collector()
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def reset(self) -> None:
+        for metric in self._metrics.values():
+            metric.reset()
+
+    # ------------------------------------------------------------------
+    # マルチプロセスモード
+    # ------------------------------------------------------------------
+
+    def flush(self, directory: str) -> Path:
+        """自プロセスの値をJSONファイルへ書き出します。一時ファイルからのrenameで書き込みをアトミックにします。
+
+        Args:
+            directory (str): 書き出し先のディレクトリ。
+
+        Returns:
+            Path: 書き出したファイルのパス。
+
+        """
+        os.makedirs(directory, exist_ok=True)
+        data = {name: [[list(labels), value] for labels, value in values.items()] for name, values in self.collect().items()}
+        path = Path(directory) / f"metrics_{os.getpid()}.json"
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics_", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"pid": os.getpid(), "metrics": data}, f)
+        os.replace(tmp_path, path)
+        return path
+
+    def collect_multiprocess(self, directory: str) -> dict[str, dict[LabelValues, object]]:
+        """全ワーカーのファイルを読み込み、カウンターとヒストグラムは合算して返却します。
+
+        ゲージは稼働中のワーカーの値のみを合算します（終了したワーカーの現在値は意味を持たないため）。
+        """
+        self.flush(directory)
+        merged: dict[str, dict[LabelValues, object]] = {name: {} for name in self._metrics}
+        for path in Path(directory).glob("metrics_*.json"):
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                # 書き込み途中やワーカー終了と競合した場合はスキップする
+                continue
+            alive = _pid_alive(payload["pid"])
+            for name, entries in payload["metrics"].items():
+                metric = self._metrics.get(name)
+                if metric is None or (metric.kind == "gauge" and not alive):
+                    continue
+                target = merged[name]
+                for labels, value in entries:
+                    key = tuple(labels)
+                    if metric.kind == "histogram":
+                        current = target.get(key)
+                        target[key] = [a + b for a, b in zip(current, value, strict=True)] if current else list(value)
+                    else:
+                        target[key] = target.get(key, 0.0) + value  # type: ignore[operator]
+        return merged
+
+    def render(self) -> str:
+        """Prometheusのテキスト形式でメトリクスを出力します。
+        """
+        directory = setting.METRICS_MULTIPROC_DIR
+        snapshot = self.collect_multiprocess(directory) if directory else self.collect()
+        lines: list[str] = []
+        for name, metric in self._metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for labels, value in sorted(snapshot.get(name, {}).items()):
+                if isinstance(metric, Histogram):
+                    lines.extend(_render_histogram(metric, labels, value))  # type: ignore[arg-type]
+                else:
+                    lines.append(f"{name}{_format_labels(metric.labelnames, labels)} {_format_value(value)}")  # type: ignore[arg-type]
+        return "\n".join(lines) + "\n"
+
+
+def _render_histogram(metric: Histogram, labels: LabelValues, state: list[float]) -> list[str]:
+    lines = []
+    cumulative = 0.0
+    for bound, count in zip((*metric.buckets, math.inf), state[:-1], strict=True):
+        cumulative += count
+        bucket_labels = _format_labels((*metric.labelnames, "le"), (*labels, _format_value(bound)))
+        lines.append(f"{metric.name}_bucket{bucket_labels} {_format_value(cumulative)}")
+    label_text = _format_labels(metric.labelnames, labels)
+    lines.append(f"{metric.name}_sum{label_text} {_format_value(state[-1])}")
+    lines.append(f"{metric.name}_count{label_text} {_format_value(cumulative)}")
+    return lines
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+async def flush_periodically(directory: str, interval: float) -> None:
+    """マルチプロセスモードで、自プロセスの値を一定間隔でファイルへ書き出し続けます。
+
+    Args:
+        directory (str): 書き出し先のディレクトリ。
+        interval (float): 書き出す間隔（秒）。
+
+    """
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            REGISTRY.flush(directory)
+    finally:
+        # 停止時に最終値を書き出し、終了後もカウンターが集計に残るようにする
+        REGISTRY.flush(directory)
+
+
+REGISTRY = Registry()
+
+# HTTPリクエスト
+HTTP_REQUESTS_TOTAL = REGISTRY.register(
+    Counter("http_requests_total", "Total HTTP requests by route template.", ("method", "route", "status")),
+)
+HTTP_REQUEST_DURATION_SECONDS = REGISTRY.register(
+    Histogram("http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route")),
+)
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.register(
+    Gauge("http_requests_in_flight", "HTTP requests currently being processed.", ("method",)),
+)
+REQUEST_ABORTED_TOTAL = REGISTRY.register(
+    Counter("http_requests_aborted_total", "Requests cancelled by deadline or client disconnect.", ("reason",)),
+)
+
+# DBコネクションプール（スクレイプ時にapp.database.engineから取得）
+DB_POOL_CONNECTIONS = REGISTRY.register(
+    Gauge("db_pool_connections", "Database pool connections by state.", ("state",)),
+)
+DB_POOL_WAIT_SECONDS = REGISTRY.register(
+    Histogram("db_pool_wait_seconds", "Time spent waiting for a pooled database connection.", buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)),
+)
+SQL_COMPILE_CACHE_TOTAL = REGISTRY.register(
+    Counter("sql_compile_cache_total", "SQL statement executions by SQLAlchemy compiled cache result.", ("result",)),
+)
+DB_READ_ROUTED_TOTAL = REGISTRY.register(
+    Counter("db_read_routed_total", "Read-only sessions by routing target (replica name or primary).", ("target",)),
+)
+DB_REPLICA_HEALTHY = REGISTRY.register(
+    Gauge("db_replica_healthy", "Whether the last health check of the replica succeeded.", ("replica",)),
+)
+DB_REPLICA_LAG_SECONDS = REGISTRY.register(
+    Gauge("db_replica_lag_seconds", "Replication lag of the replica at the last health check.", ("replica",)),
+)
+DB_CIRCUIT_STATE = REGISTRY.register(
+    Gauge("db_circuit_state", "Database circuit breaker state (0: closed, 1: half-open, 2: open).", ("circuit",)),
+)
+DB_CIRCUIT_REJECTED_TOTAL = REGISTRY.register(
+    Counter("db_circuit_rejected_total", "Database connections rejected while the circuit breaker was open.", ("circuit",)),
+)
+
+# 流量制御
+ADMISSION_QUEUED = REGISTRY.register(
+    Gauge("admission_queued_requests", "Requests waiting for admission by route class.", ("route_class",)),
+)
+ADMISSION_REJECTED_TOTAL = REGISTRY.register(
+    Counter("admission_rejected_total", "Requests rejected by admission control.", ("route_class", "reason")),
+)
+RATE_LIMITED_TOTAL = REGISTRY.register(
+    Counter("rate_limited_total", "Requests rejected by rate limiting by rule.", ("rule",)),
+)
+
+# イベントループ
+EVENT_LOOP_LAG_SECONDS = REGISTRY.register(
+    Histogram("event_loop_lag_seconds", "Event loop scheduling lag.", buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)),
+)
+EVENT_LOOP_BLOCKED_TOTAL = REGISTRY.register(
+    Counter("event_loop_blocked_total", "Times the event loop was blocked longer than the threshold."),
+)
+
+# キャッシュ
+CACHE_REQUESTS_TOTAL = REGISTRY.register(
+    Counter("cache_requests_total", "Cache lookups by cache name and result.", ("cache", "result")),
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """キャッシュの参照結果を記録します。
+
+    Args:
+        cache (str): キャッシュ名。
+        hit (bool): ヒットした場合はTrue。
+
+    """
+    CACHE_REQUESTS_TOTAL.inc(cache, "hit" if hit else "miss")
+
+
+def collect_db_pool() -> None:
+    """app.databaseのエンジンからコネクションプールの状態を取得してゲージに反映します。
+
+    NullPool（DEV_MODE）は状態を持たないため何も出力しません。
+    """
+    from app import database
+
+    pool = database.engine.pool
+    if not hasattr(pool, "checkedout"):
+        return
+    DB_POOL_CONNECTIONS.set(pool.size(), "size")
+    DB_POOL_CONNECTIONS.set(pool.checkedout(), "checked_out")
+    DB_POOL_CONNECTIONS.set(pool.checkedin(), "checked_in")
+    DB_POOL_CONNECTIONS.set(max(pool.overflow(), 0), "overflow")
+
+
+REGISTRY.register_collector(collect_db_pool)
@@ -0,0 +1,200 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from types import FrameType
+from zoneinfo import ZoneInfo
+
+from app.config.setting import setting
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    # site-packagesやカレントディレクトリ配下はパスを短縮する
+    if "site-packages" in filename:
+        filename = filename.split("site-packages", 1)[1].lstrip(os.sep)
+    elif filename.startswith(os.getcwd()):
+        filename = os.path.relpath(filename)
+    return f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+
+
+def _collapse(frame: FrameType | None) -> str:
+    labels: list[str] = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class SamplingProfiler:
+    """一定間隔で他スレッドのスタックを取得する統計的プロファイラ。
+
+    計測対象のスレッドを止めずにsys._current_frames()でスタックを取得するため、オーバーヘッドが小さい。
+    結果はflamegraph.plやspeedscopeで読み込めるcollapsed stack形式で出力する。
+    """
+
+    def __init__(self, interval: float, thread_id: int | None = None, all_threads: bool = False) -> None:
+        """
+        Args:
+            interval (float): サンプリング間隔（秒）。
+            thread_id (int | None): 計測対象のスレッドID。未指定の場合は呼び出し元のスレッド。
+            all_threads (bool): 全スレッドを計測対象とするかどうか（スレッドプールでの処理も含める場合）。
+
+        """
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.all_threads = all_threads
+        self.samples: Counter[str] = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            if self.all_threads:
+                for thread_id, frame in frames.items():
+                    if thread_id == own_id:
+                        continue
+                    if thread_id not in thread_names:
+                        # 計測開始後に作成されたスレッド（スレッドプールなど）の名前を取得し直す
+                        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+                    name = thread_names.get(thread_id) or str(thread_id)
+                    self.samples[f"{name};{_collapse(frame)}"] += 1
+            else:
+                frame = frames.get(self.thread_id)
+                if frame is not None:
+                    self.samples[_collapse(frame)] += 1
+            self.sample_count += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        """collapsed stack形式（1行に「スタック 回数」）の文字列を返却します。
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def dump_tasks(loop: asyncio.AbstractEventLoop | None = None) -> str:
+    """実行中のasyncioタスクとそれぞれの待機位置のスタックを文字列で返却します。
+
+    Args:
+        loop (asyncio.AbstractEventLoop | None): 対象のイベントループ。未指定の場合は実行中のループ。
+
+    Returns:
+        str: タスクの一覧。
+
+    """
+    tasks = asyncio.all_tasks(loop or asyncio.get_running_loop())
+    lines = [f"# {len(tasks)} tasks at {datetime.now(ZoneInfo('Asia/Tokyo')).isoformat()}"]
+    for task in sorted(tasks, key=lambda item: item.get_name()):
+        coro = task.get_coro()
+        lines.append(f"\n## {task.get_name()} {getattr(coro, '__qualname__', coro)!s} done={task.done()}")
+        for frame in task.get_stack():
+            lines.extend(line.rstrip("\n") for line in traceback.format_stack(frame, limit=1))
+    return "\n".join(lines) + "\n"
+
+
+@dataclass
+class ProfileResult:
+    """プロファイル結果の出力ファイル。
+    """
+
+    collapsed_file: str
+    tasks_file: str
+    samples: int
+    seconds: float
+
+
+# 同一ワーカーで同時に実行できるプロファイルは1つまでとする
+_profile_lock = asyncio.Lock()
+
+
+def is_profiling() -> bool:
+    return _profile_lock.locked()
+
+
+def _write_files(label: str, collapsed: str, tasks: str) -> tuple[Path, Path]:
+    directory = Path(setting.PROFILING_DIRECTORY)
+    directory.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now(ZoneInfo("Asia/Tokyo")).strftime("%Y%m%d_%H%M%S_%f")
+    base = f"{label}_{os.getpid()}_{timestamp}"
+    collapsed_path = directory / f"{base}.collapsed"
+    tasks_path = directory / f"{base}_tasks.txt"
+    collapsed_path.write_text(collapsed, encoding="utf-8")
+    tasks_path.write_text(tasks, encoding="utf-8")
+    return collapsed_path, tasks_path
+
+
+@asynccontextmanager
+async def profile_block(interval: float, all_threads: bool = False, label: str = "profile") -> AsyncIterator[list[ProfileResult]]:
+    """ブロックの実行中にイベントループのスレッドをサンプリングし、終了時に結果をファイルへ出力します。
+
+    Args:
+        interval (float): サンプリング間隔（秒）。
+        all_threads (bool): 全スレッドを計測対象とするかどうか。
+        label (str): 出力ファイル名の接頭辞。
+
+    Yields:
+        list[ProfileResult]: ブロックの終了後に結果が1件格納されるリスト。
+
+    """
+    results: list[ProfileResult] = []
+    async with _profile_lock:
+        profiler = SamplingProfiler(interval, all_threads=all_threads)
+        started = time.monotonic()
+        tasks = ""
+        profiler.start()
+        try:
+            yield results
+            # 計測の終了直前のタスクの状態を出力する
+            tasks = dump_tasks()
+        finally:
+            profiler.stop()
+            elapsed = time.monotonic() - started
+            collapsed_path, tasks_path = await asyncio.to_thread(_write_files, label, profiler.collapsed(), tasks)
+            results.append(ProfileResult(
+                collapsed_file=collapsed_path.name, tasks_file=tasks_path.name, samples=profiler.sample_count, seconds=round(elapsed, 3),
+            ))
+
+
+async def profile_for(seconds: float, interval: float, all_threads: bool = False) -> ProfileResult:
+    """指定した秒数だけイベントループのスレッドをサンプリングし、結果をファイルへ出力します。
+
+    Args:
+        seconds (float): 計測時間（秒）。
+        interval (float): サンプリング間隔（秒）。
+        all_threads (bool): 全スレッドを計測対象とするかどうか。
+
+    Returns:
+        ProfileResult: 出力したファイルとサンプル数。
+
+    """
+    async with profile_block(interval, all_threads) as results:
+        await asyncio.sleep(seconds)
+    return results[0]
+
+
+def profile_file_path(filename: str) -> Path | None:
+    """出力ディレクトリ内のプロファイル結果のパスを返却します。ディレクトリ外を指す名前や存在しない場合はNone。
+    """
+    if Path(filename).name != filename:
+        return None
+    path = Path(setting.PROFILING_DIRECTORY) / filename
+    return path if path.is_file() else None
@@ -0,0 +1,140 @@
+import re
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS, CACHING_DISABLED, NO_CACHE_KEY, NO_DIALECT_SUPPORT
+
+from app.config.setting import setting
+from app.core.instrumentation import is_ignored
+from app.core.metrics import SQL_COMPILE_CACHE_TOTAL
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """1リクエスト内で実行されたSQLの件数と所要時間。
+    """
+
+    path: str = ""
+    count: int = 0
+    total_ms: float = 0.0
+    # プレースホルダを含むSQL文ごとの実行回数（同一文の繰り返しからN+1を検出する）
+    statements: Counter[str] = field(default_factory=Counter)
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        """閾値以上の回数実行されたSQL文を実行回数の多い順に返却します。
+
+        Args:
+            threshold (int): N+1とみなす実行回数。
+
+        Returns:
+            list[tuple[str, int]]: SQL文と実行回数のリスト。
+
+        """
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+
+# トランザクション制御文（rollbackモードのテストではcommitの代わりにSAVEPOINT操作が発行される）
+_TRANSACTION_CONTROL = re.compile(r"^\s*(?:BEGIN|COMMIT|END|ROLLBACK|SAVEPOINT|RELEASE|START\s+TRANSACTION)\b", re.IGNORECASE)
+
+# NOTE: ContextVarには可変オブジェクトを格納する。
+#       asyncioのタスクやSQLAlchemyのgreenletにはコンテキストのコピーが渡されるが、参照先のオブジェクトは共有されるため集計が反映される。
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+# リクエスト完了時に呼び出すオブザーバー（テストのクエリ数上限のチェックなどで使用）
+RequestObserver = Callable[[str, str, QueryStats], None]
+request_observers: list[RequestObserver] = []
+
+
+def current_stats() -> QueryStats | None:
+    """現在のリクエストの集計結果を返却します。リクエスト外の場合はNone。
+    """
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries(path: str = "") -> Iterator[QueryStats]:
+    """ブロック内で実行されたSQLを集計します。
+
+    Args:
+        path (str): リクエストのパス（スロークエリの記録などで使用）。
+
+    Yields:
+        QueryStats: 集計結果。ブロック内で随時更新される。
+
+    """
+    stats = QueryStats(path=path)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def _is_tracked(statement: str, context) -> bool:
+    if is_ignored(context):
+        return False
+    return _TRANSACTION_CONTROL.match(statement) is None
+
+
+# NOTE: 開始時刻は実行ごとのExecutionContextに保持する。
+#       SQLが例外で終了した場合はafter_cursor_executeが呼ばれないため、接続単位で保持すると値が残り続ける。
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current_stats.get() is None or not _is_tracked(statement, context):
+        return
+    context._query_stats_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current_stats.get()
+    started = getattr(context, "_query_stats_started", None)
+    if stats is None or started is None:
+        return
+    stats.count += 1
+    stats.total_ms += (time.perf_counter() - started) * 1000
+    stats.statements[statement] += 1
+
+
+def install_query_listeners() -> None:
+    """全エンジンのカーソル実行前後にイベントリスナーを登録します。
+
+    テスト時にエンジンが作り直されても集計できるよう、個別のエンジンではなくEngineクラスに登録します。
+    """
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ExecutionContext.cache_hitの値とメトリクスのラベル
+_COMPILE_CACHE_RESULTS = {
+    CACHE_HIT: "hit",
+    CACHE_MISS: "miss",
+    CACHING_DISABLED: "disabled",
+    NO_CACHE_KEY: "no_key",
+    NO_DIALECT_SUPPORT: "unsupported",
+}
+
+
+def _record_compile_cache(conn, cursor, statement, parameters, context, executemany) -> None:
+    # exec_driver_sqlなどコンパイルを経由しない実行は対象外
+    if context is None or context.compiled is None:
+        return
+    SQL_COMPILE_CACHE_TOTAL.inc(_COMPILE_CACHE_RESULTS.get(context.cache_hit, "no_key"))
+
+
+def install_compile_cache_listener() -> None:
+    """全エンジンのSQL実行時に、コンパイル済みSQLのキャッシュの利用結果をメトリクスへ記録するリスナーを登録します。
+
+    missが増え続ける場合は、リクエストごとに異なるSQL文が構築されているか、DB_COMPILED_CACHE_SIZEが不足しています。
+    """
+    if not event.contains(Engine, "before_cursor_execute", _record_compile_cache):
+        event.listen(Engine, "before_cursor_execute", _record_compile_cache)
+
+
+if setting.QUERY_STATS_ENABLED:
+    install_query_listeners()
@@ -0,0 +1,246 @@
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Protocol
+
+import structlog
+from jose import JWTError, jwt
+from starlette.datastructures import Headers
+from starlette.types import Scope
+
+from app.config.setting import setting
+
+# ログの設定
+logger = structlog.get_logger()
+
+_PERIODS = {"second": 1.0, "minute": 60.0, "hour": 3600.0, "day": 86400.0}
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitRule:
+    """トークンバケットの容量と補充速度。
+    """
+
+    name: str
+    capacity: float
+    refill_rate: float  # 1秒あたりに補充されるトークン数
+
+    def scaled(self, multiplier: float) -> "RateLimitRule":
+        if multiplier == 1.0:
+            return self
+        return RateLimitRule(self.name, self.capacity * multiplier, self.refill_rate * multiplier)
+
+
+def parse_rate(name: str, value: str) -> RateLimitRule:
+    """「回数/期間」形式（例: 10/minute）の文字列をルールに変換します。回数がそのままバースト可能な上限となります。
+
+    Args:
+        name (str): ルール名。
+        value (str): 「回数/期間」形式の文字列。期間はsecond・minute・hour・day。
+
+    Returns:
+        RateLimitRule: 変換したルール。
+
+    Raises:
+        ValueError: 形式が不正な場合。
+
+    """
+    count, _, period = value.partition("/")
+    if period not in _PERIODS or not count.isdigit() or int(count) <= 0:
+        raise ValueError(f"Invalid rate limit: {value}")
+    return RateLimitRule(name, float(count), int(count) / _PERIODS[period])
+
+
+class RateLimitBackend(Protocol):
+    async def hit(self, key: str, rule: RateLimitRule) -> float:
+        """バケットからトークンを1つ消費します。
+
+        Returns:
+            float: 許可した場合は0。拒否した場合は次にトークンが補充されるまでの秒数。
+
+        """
+        ...
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float) -> None:
+        self.tokens = tokens
+        self.updated = updated
+
+
+class LocalRateLimitBackend:
+    """ワーカーのメモリ上にトークンバケットを保持するバックエンド。
+
+    キーのハッシュでシャードに振り分け、シャードごとに最も長く使われていないバケットから破棄する。
+    ワーカー間では共有されないため、実際の上限はワーカー数倍となる。
+    """
+
+    def __init__(self, shards: int, max_keys: int, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Args:
+            shards (int): シャード数。
+            max_keys (int): 保持するバケット数の上限（全シャードの合計）。
+            clock (Callable[[], float]): 現在時刻（秒）を返す関数。
+
+        """
+        self._shards: list[OrderedDict[str, _Bucket]] = [OrderedDict() for _ in range(shards)]
+        self._max_keys_per_shard = max(max_keys // shards, 1)
+        self._clock = clock
+
+    async def hit(self, key: str, rule: RateLimitRule) -> float:
+        return self.hit_nowait(key, rule)
+
+    def hit_nowait(self, key: str, rule: RateLimitRule) -> float:
+        shard = self._shards[hash(key) % len(self._shards)]
+        now = self._clock()
+        bucket = shard.get(key)
+        if bucket is None:
+            if len(shard) >= self._max_keys_per_shard:
+                shard.popitem(last=False)
+            bucket = shard[key] = _Bucket(rule.capacity, now)
+        else:
+            shard.move_to_end(key)
+            bucket.tokens = min(rule.capacity, bucket.tokens + (now - bucket.updated) * rule.refill_rate)
+            bucket.updated = now
+
+        if bucket.tokens >= 1.0:
+            bucket.tokens -= 1.0
+            return 0.0
+        return (1.0 - bucket.tokens) / rule.refill_rate
+
+
+# トークンバケットをアトミックに更新するLuaスクリプト。戻り値は拒否時の待ち時間（ミリ秒）、許可時は0
+_REDIS_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - updated, 0) * refill_rate)
+local wait_ms = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait_ms = math.ceil((1 - tokens) / refill_rate * 1000)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / refill_rate * 1000))
+return wait_ms
+"""
+
+
+class RedisRateLimitBackend:
+    """Redis上にトークンバケットを保持し、全ワーカー・全ホストで上限を共有するバックエンド。
+
+    redisパッケージが必要。Redisに接続できない場合はローカルのバックエンドで判定する。
+    """
+
+    def __init__(self, url: str, fallback: LocalRateLimitBackend) -> None:
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(_REDIS_SCRIPT)
+        self._fallback = fallback
+
+    async def hit(self, key: str, rule: RateLimitRule) -> float:
+        try:
+            wait_ms = await self._script(keys=[f"rate_limit:{key}"], args=[rule.capacity, rule.refill_rate, time.time()])
+        except Exception as exc:
+            logger.warning("rate limit backend unavailable", error=str(exc))
+            return self._fallback.hit_nowait(key, rule)
+        return int(wait_ms) / 1000
+
+
+def create_backend() -> RateLimitBackend:
+    """設定値に応じてバックエンドを作成します。
+    """
+    local = LocalRateLimitBackend(setting.RATE_LIMIT_SHARDS, setting.RATE_LIMIT_MAX_KEYS)
+    if setting.RATE_LIMIT_BACKEND == "redis" and setting.RATE_LIMIT_REDIS_URL:
+        try:
+            return RedisRateLimitBackend(setting.RATE_LIMIT_REDIS_URL, local)
+        except ImportError:
+            logger.warning("redis package is not installed. falling back to in-memory rate limit backend")
+    return local
+
+
+class RateLimiter:
+    """ルートとユーザーのロールに応じたトークンバケットで流量を制限するクラス。
+    """
+
+    def __init__(self, backend: RateLimitBackend, default: RateLimitRule, rules: dict[str, RateLimitRule], role_multipliers: dict[int, float]) -> None:
+        """
+        Args:
+            backend (RateLimitBackend): バケットの保持先。
+            default (RateLimitRule): ルールが指定されていないルートに適用するルール（ルート間で共有）。
+            rules (dict[str, RateLimitRule]): 「メソッド パス」をキーとするルートごとのルール。
+            role_multipliers (dict[int, float]): ロールごとのルールの倍率。
+
+        """
+        self.backend = backend
+        self.default = default
+        self.rules = rules
+        self.role_multipliers = role_multipliers
+
+    async def check(self, method: str, path: str, identity: str, role: int | None) -> tuple[RateLimitRule, float]:
+        """リクエストを許可するか判定します。
+
+        Args:
+            method (str): HTTPメソッド。
+            path (str): リクエストパス。
+            identity (str): 制限の単位（ユーザーまたはIPアドレス）。
+            role (int | None): ユーザーのロール。未認証の場合はNone。
+
+        Returns:
+            tuple[RateLimitRule, float]: 適用したルールと、拒否した場合の再試行までの秒数（許可した場合は0）。
+
+        """
+        rule = self.rules.get(f"{method} {path}", self.default)
+        if role is not None:
+            rule = rule.scaled(self.role_multipliers.get(role, 1.0))
+        return rule, await self.backend.hit(f"{rule.name}:{identity}", rule)
+
+
+def create_rate_limiter() -> RateLimiter:
+    """設定値からRateLimiterを作成します。
+    """
+    return RateLimiter(
+        backend=create_backend(),
+        default=parse_rate("default", setting.RATE_LIMIT_DEFAULT),
+        rules={route: parse_rate(route, value) for route, value in setting.RATE_LIMIT_RULES.items()},
+        role_multipliers=setting.RATE_LIMIT_ROLE_MULTIPLIERS,
+    )
+
+
+def identify(scope: Scope) -> tuple[str, int | None]:
+    """リクエストの制限単位とロールを取得します。
+
+    有効なアクセストークンがある場合はユーザー単位、ない場合はIPアドレス単位とします。
+    DBへの問い合わせを避けるため、ロールはトークンのroleクレームから取得します。
+
+    Args:
+        scope (Scope): ASGIのスコープ。
+
+    Returns:
+        tuple[str, int | None]: 制限単位のキーとロール。
+
+    """
+    scheme, _, token = Headers(scope=scope).get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            payload = jwt.decode(token, setting.SECRET_KEY, algorithms=[setting.ALGORITHM])
+        except JWTError:
+            payload = {}
+        if payload.get("sub"):
+            role = payload.get("role")
+            return f"user:{payload['sub']}", role if isinstance(role, int) else None
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}", None
+
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(math.ceil(seconds), 1))
@@ -0,0 +1,217 @@
+"""レポートの本文をHTMLへ変換するモジュール。
+
+Markdownの変換とHTMLのサニタイズはCPUを占有するため、Rendererによりプロセスプールで実行する。
+プロセスプールの子プロセスはこのモジュールを読み込むため、DBやモデルなどの重いモジュールはインポートしない。
+"""
+import asyncio
+import hashlib
+import html
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from html.parser import HTMLParser
+
+from markdown_it import MarkdownIt
+
+from app.config.setting import setting
+
+# 変換結果に影響する変更（許可するタグや変換の設定など）を行った場合は更新し、キャッシュ済みの結果を使用しないようにする
+RENDERER_VERSION = "1"
+
+# Report.FORMAT_MD / Report.FORMAT_HTMLと同じ値（子プロセスでモデルを読み込まないよう定数として定義する）
+FORMAT_MD = 1
+FORMAT_HTML = 2
+
+# 出力を許可するタグ
+ALLOWED_TAGS = frozenset({
+    "a", "abbr", "b", "blockquote", "br", "code", "dd", "del", "div", "dl", "dt", "em",
+    "h1", "h2", "h3", "h4", "h5", "h6", "hr", "i", "img", "kbd", "li", "ol", "p", "pre",
+    "s", "span", "strong", "sub", "sup", "table", "tbody", "td", "tfoot", "th", "thead", "tr", "u", "ul",
+})
+
+# 終了タグを持たないタグ
+VOID_TAGS = frozenset({"br", "hr", "img"})
+
+# タグだけでなく内容も出力しないタグ
+DROP_CONTENT_TAGS = frozenset({
+    "embed", "head", "iframe", "math", "noscript", "object", "script", "select", "style", "svg", "template", "textarea", "title",
+})
+
+# タグごとに出力を許可する属性
+ALLOWED_ATTRIBUTES = {
+    "a": frozenset({"href", "title"}),
+    "abbr": frozenset({"title"}),
+    "code": frozenset({"class"}),
+    "img": frozenset({"src", "alt", "title", "width", "height"}),
+    "ol": frozenset({"start"}),
+    "td": frozenset({"colspan", "rowspan"}),
+    "th": frozenset({"colspan", "rowspan"}),
+}
+
+# href・srcに許可するスキーム（スキームのない相対URLは許可する）
+ALLOWED_URL_SCHEMES = frozenset({"http", "https", "mailto"})
+
+_URL_SCHEME = re.compile(r"^([a-z][a-z0-9+.\-]*):", re.IGNORECASE)
+_DATA_IMAGE_URL = re.compile(r"^data:image/(?:gif|png|jpeg|webp);", re.IGNORECASE)
+# ブラウザがURLの解釈時に無視する空白・制御文字
+_IGNORED_URL_CHARS = re.compile(r"[\x00-\x20\x7f]+")
+
+# HTMLの直接入力は無効とし、本文中のタグはエスケープする
+_markdown = MarkdownIt("commonmark", {"html": False}).enable(["table", "strikethrough"])
+
+
+def _is_safe_url(tag: str, url: str) -> bool:
+    normalized = _IGNORED_URL_CHARS.sub("", url)
+    match = _URL_SCHEME.match(normalized)
+    if match is None:
+        return True
+    if tag == "img" and _DATA_IMAGE_URL.match(normalized):
+        return True
+    return match.group(1).lower() in ALLOWED_URL_SCHEMES
+
+
+class _Sanitizer(HTMLParser):
+    """許可リストに含まれるタグと属性のみを出力するHTMLパーサー。
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.output: list[str] = []
+        # 出力中の開始タグ（閉じられていないタグは最後に閉じる）
+        self.open_tags: list[str] = []
+        # 内容を出力しないタグの入れ子
+        self.skipping: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if self.skipping or tag in DROP_CONTENT_TAGS:
+            if tag in DROP_CONTENT_TAGS:
+                self.skipping.append(tag)
+            return
+        if tag not in ALLOWED_TAGS:
+            return
+        allowed = ALLOWED_ATTRIBUTES.get(tag, frozenset())
+        parts = [tag]
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name in ("href", "src") and not _is_safe_url(tag, value):
+                continue
+            parts.append(f'{name}="{html.escape(value, quote=True)}"')
+        if tag == "a":
+            parts.append('rel="nofollow noopener noreferrer"')
+        self.output.append(f"<{' '.join(parts)}>")
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if self.skipping:
+            if tag == self.skipping[-1]:
+                self.skipping.pop()
+            return
+        if tag not in self.open_tags:
+            return
+        # 閉じられていない内側のタグも閉じる
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.output.append(f"</{open_tag}>")
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data: str) -> None:
+        if not self.skipping:
+            self.output.append(html.escape(data, quote=False))
+
+    def result(self) -> str:
+        self.close()
+        self.output.extend(f"</{tag}>" for tag in reversed(self.open_tags))
+        self.open_tags.clear()
+        return "".join(self.output)
+
+
+def sanitize_html(content: str) -> str:
+    """HTMLから許可リストに含まれないタグ・属性・URLを除去します。
+
+    スクリプトなどの内容ごと除去するタグ以外は、タグのみを除去して内容のテキストを残します。
+
+    Args:
+        content (str): サニタイズするHTML。
+
+    Returns:
+        str: サニタイズ後のHTML。
+
+    """
+    sanitizer = _Sanitizer()
+    sanitizer.feed(content)
+    return sanitizer.result()
+
+
+def render_content(content: str, format: int) -> str:
+    """レポートの本文をサニタイズ済みのHTMLへ変換します。
+
+    Args:
+        content (str): レポートの本文。
+        format (int): フォーマット (1: md, 2: html)。
+
+    Returns:
+        str: サニタイズ済みのHTML。
+
+    """
+    if format == FORMAT_MD:
+        content = _markdown.render(content)
+    return sanitize_html(content)
+
+
+def content_hash(content: str, format: int) -> str:
+    """変換結果のキャッシュキーとする、本文・フォーマット・RENDERER_VERSIONのSHA-256を返却します。
+    """
+    return hashlib.sha256(f"{RENDERER_VERSION}:{format}:{content}".encode()).hexdigest()
+
+
+class Renderer:
+    """本文の変換をプロセスプールで実行するクラス。
+
+    プロセスプールは最初の変換時に作成する（起動時間とfork前のプロセスに影響しないようにするため）。
+    子プロセスはforkではなくspawnで起動し、ワーカーのスレッドやDB接続を引き継がないようにする。
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        """
+        Args:
+            max_workers (int): プロセス数。0の場合はプロセスプールを使用せず、スレッドで変換する。
+
+        """
+        self.max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    async def render(self, content: str, format: int) -> str:
+        """本文をサニタイズ済みのHTMLへ変換します。
+        """
+        if self.max_workers == 0:
+            return await asyncio.to_thread(render_content, content, format)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), render_content, content, format)
+        except BrokenProcessPool:
+            # 子プロセスが異常終了した場合は、次回の変換時にプロセスプールを作り直す
+            self.shutdown()
+            raise
+
+    def shutdown(self) -> None:
+        """プロセスプールを停止します。実行待ちの変換は取り消します。
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+renderer = Renderer(setting.RENDER_PROCESS_WORKERS)
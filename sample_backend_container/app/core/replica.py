@@ -0,0 +1,272 @@
+import asyncio
+import contextlib
+import hashlib
+import hmac
+import random
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+import structlog
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+from app.core.metrics import DB_READ_ROUTED_TOTAL, DB_REPLICA_HEALTHY, DB_REPLICA_LAG_SECONDS
+
+# ログの設定
+logger = structlog.get_logger()
+
+# レプリカの遅延（秒）を取得するクエリ
+# NOTE: プライマリへの書き込みが途絶えると最後の再生からの経過時間が増え続けるため、ストリーミング中にWALをすべて再生済みの場合は0とする。
+#       プライマリから切断されている場合は受信済みのWALを再生し終えても遅延は解消していないため、最後の再生からの経過時間とする（再生履歴がなければ無限大）。
+#       pg_stat_wal_receiverのstatusはpg_read_all_statsの権限がない場合NULLとなるため、その場合はWAL受信プロセスの有無のみで判定する。
+#       レプリケーションを構成していないインスタンス（ローカルでの検証用など）は0とする。
+LAG_QUERY = text("""
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE COALESCE(status, 'streaming') = 'streaming')
+        THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())::float8, 'Infinity'::float8)
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())::float8, 0)
+END
+""")
+
+# プライマリへ振り分けた場合のメトリクスのラベル
+PRIMARY = "primary"
+
+# セッションで書き込みを行ったことを示すSession.infoのキー
+_WROTE = "replica_wrote"
+
+
+@dataclass(slots=True)
+class ClientWrites:
+    """リクエストを送信したクライアントの直近の書き込み時刻。
+    """
+
+    written: float | None = None  # Cookieから取得した、またはこのリクエストで書き込んだ時刻（UNIX時間）
+    committed: bool = False  # このリクエストで書き込みをcommitしたかどうか（Cookieを更新する）
+
+
+# NOTE: ContextVarには可変オブジェクトを格納し、エンドポイントでのcommitをミドルウェアから参照できるようにする
+_current_writes: ContextVar[ClientWrites | None] = ContextVar("replica_client_writes", default=None)
+
+
+@contextmanager
+def track_writes(written: float | None) -> Iterator[ClientWrites]:
+    """ブロック内でcommitした書き込みを記録します。
+
+    Args:
+        written (float | None): クライアントの直近の書き込み時刻（UNIX時間）。
+
+    Yields:
+        ClientWrites: 書き込みの記録。commitのたびに更新される。
+
+    """
+    writes = ClientWrites(written)
+    token = _current_writes.set(writes)
+    try:
+        yield writes
+    finally:
+        _current_writes.reset(token)
+
+
+def sign_write_time(written: float, secret: str) -> str:
+    """書き込み時刻をCookieに格納する署名付きの値に変換します。
+    """
+    value = f"{written:.6f}"
+    return f"{value}.{hmac.new(secret.encode(), value.encode(), hashlib.sha256).hexdigest()}"
+
+
+def verify_write_time(signed: str | None, secret: str) -> float | None:
+    """Cookieの値の署名を検証し、書き込み時刻を返却します。値がないか不正な場合はNone。
+    """
+    value, _, signature = (signed or "").rpartition(".")
+    if not value or not hmac.compare_digest(signature, hmac.new(secret.encode(), value.encode(), hashlib.sha256).hexdigest()):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+@dataclass(slots=True)
+class Replica:
+    """読み取り専用セッションの接続先となるレプリカと、直近のヘルスチェックの結果。
+    """
+
+    name: str
+    engine: AsyncEngine
+    weight: float = 1.0
+    healthy: bool = False
+    lag_seconds: float = 0.0
+    checked_at: float = 0.0  # 直近の成功したチェックの開始時刻（UNIX時間）
+
+    def replayed_until(self) -> float:
+        """レプリカへの反映が確認できている時刻を返却します。
+        """
+        return self.checked_at - self.lag_seconds
+
+
+class ReplicaRouter:
+    """読み取り専用セッションの接続先を、重み付きでレプリカへ振り分けるクラス。
+
+    ヘルスチェックに失敗したレプリカと、遅延が上限を超えたレプリカは対象外とする。
+    直近に書き込みを行ったクライアントは、その書き込みの後にチェックしたレプリカが書き込み時刻まで再生済みの場合のみ対象とする
+    （read-your-writes）。対象のレプリカがない場合はプライマリ（None）を返却する。
+    書き込み時刻は署名付きのCookieでクライアントが保持するため、書き込みと異なるワーカーが読み取りを処理した場合も判定できる。
+    ワーカー間で比較するため、時刻にはUNIX時間を使用する。
+    """
+
+    def __init__(
+        self,
+        replicas: list[Replica],
+        max_lag_seconds: float,
+        read_your_writes_seconds: float,
+        check_interval: float,
+        check_timeout: float,
+        clock: Callable[[], float] = time.time,
+        rng: random.Random | None = None,
+    ) -> None:
+        """
+        Args:
+            replicas (list[Replica]): レプリカのリスト。
+            max_lag_seconds (float): 振り分けるレプリカの遅延の上限（秒）。
+            read_your_writes_seconds (float): 書き込みの後、レプリカへの反映を確認する秒数。経過後は遅延の上限のみで判定する。
+            check_interval (float): ヘルスチェックの間隔（秒）。
+            check_timeout (float): ヘルスチェックのタイムアウト（秒）。
+            clock (Callable[[], float]): 現在時刻（秒）を返す関数。
+            rng (random.Random | None): 振り分けに使用する乱数生成器。
+
+        """
+        self.replicas = replicas
+        self.max_lag_seconds = max_lag_seconds
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._task: asyncio.Task | None = None
+
+    # -----------------------------------------------------------------------
+    # 振り分け
+    # -----------------------------------------------------------------------
+
+    def choose(self, written: float | None = None) -> Replica | None:
+        """読み取りの接続先のレプリカを選択します。
+
+        Args:
+            written (float | None): クライアントの直近の書き込み時刻（UNIX時間）。read-your-writesの判定に使用する。
+
+        Returns:
+            Replica | None: 選択したレプリカ。プライマリから読み取る場合はNone。
+
+        """
+        if written is not None and self._clock() - written > self.read_your_writes_seconds:
+            written = None
+        candidates = [
+            replica for replica in self.replicas
+            if replica.healthy
+            and replica.lag_seconds <= self.max_lag_seconds
+            and (written is None or replica.replayed_until() > written)
+        ]
+        if not candidates:
+            DB_READ_ROUTED_TOTAL.inc(PRIMARY)
+            return None
+        replica = candidates[0] if len(candidates) == 1 else self._rng.choices(candidates, weights=[r.weight for r in candidates])[0]
+        DB_READ_ROUTED_TOTAL.inc(replica.name)
+        return replica
+
+    def read_engine(self) -> AsyncEngine | None:
+        """現在のリクエストの読み取りの接続先のエンジンを返却します。プライマリの場合はNone。
+
+        クライアントの書き込み時刻は、ReadYourWritesMiddlewareがCookieから取得した値と、このリクエストでの書き込みから判定します。
+        """
+        writes = _current_writes.get()
+        replica = self.choose(writes.written if writes else None)
+        return replica.engine if replica else None
+
+    # -----------------------------------------------------------------------
+    # ヘルスチェック
+    # -----------------------------------------------------------------------
+
+    async def check(self, replica: Replica) -> None:
+        """レプリカに接続して遅延を取得し、状態を更新します。
+        """
+        started = self._clock()
+        try:
+            async with asyncio.timeout(self.check_timeout):
+                async with replica.engine.connect() as conn:
+                    lag = float((await conn.execute(LAG_QUERY)).scalar_one())
+        except Exception as exc:
+            if replica.healthy:
+                logger.warning("replica unhealthy", replica=replica.name, error=str(exc) or type(exc).__name__)
+            replica.healthy = False
+            DB_REPLICA_HEALTHY.set(0, replica.name)
+            return
+
+        if not replica.healthy:
+            logger.info("replica healthy", replica=replica.name, lag_seconds=lag)
+        replica.healthy, replica.lag_seconds, replica.checked_at = True, lag, started
+        DB_REPLICA_HEALTHY.set(1, replica.name)
+        DB_REPLICA_LAG_SECONDS.set(lag, replica.name)
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(self.check(replica) for replica in self.replicas))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check_all()
+
+    async def start(self) -> None:
+        """初回のヘルスチェックを行い、定期的なヘルスチェックを開始します。
+        """
+        await self.check_all()
+        self._task = asyncio.create_task(self._run(), name="replica-health-check")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+# ---------------------------------------------------------------------------
+# 書き込みの記録
+# ---------------------------------------------------------------------------
+
+def _mark_flushed(session, flush_context) -> None:
+    session.info[_WROTE] = True
+
+
+def _mark_dml(orm_execute_state) -> None:
+    # session.execute(update(...))など、flushを経由しない書き込み
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_WROTE] = True
+
+
+def _record_commit(session) -> None:
+    writes = _current_writes.get()
+    if session.info.pop(_WROTE, False) and writes is not None:
+        writes.written, writes.committed = time.time(), True
+
+
+def _discard_writes(session) -> None:
+    session.info.pop(_WROTE, None)
+
+
+def install_write_listeners() -> None:
+    """セッションで書き込みをcommitした場合に、現在のリクエストの書き込み時刻を更新するリスナーを登録します。
+
+    変更を伴わないcommit（読み取りのみのハンドラなど）は書き込みとして扱いません。
+    """
+    if not event.contains(Session, "after_commit", _record_commit):
+        event.listen(Session, "after_flush", _mark_flushed)
+        event.listen(Session, "do_orm_execute", _mark_dml)
+        event.listen(Session, "after_commit", _record_commit)
+        event.listen(Session, "after_rollback", _discard_writes)
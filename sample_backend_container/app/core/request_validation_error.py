@@ -1,7 +1,8 @@
 import structlog
 from fastapi import Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+
+from app.core.responses import FastJSONResponse
 
 # ロガーの設定
 logger = structlog.get_logger()
@@ -14,7 +15,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         exc (RequestValidationError): 発生したバリデーションエラー。
 
     Returns:
-        JSONResponse: エラーレスポンス。
+        FastJSONResponse: エラーレスポンス。
 
     """
     # エラーログの記録
@@ -29,7 +30,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
     # JSONレスポンスを返却
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=422,
         content={
             "detail": exc.errors(),
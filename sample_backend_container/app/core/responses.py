@@ -0,0 +1,17 @@
+from typing import Any
+
+from pydantic_core import to_json
+from starlette.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """pydantic-coreのシリアライザ（Rust実装）でJSONのbytesへ直接変換するレスポンス。
+
+    PydanticモデルやUUID・datetimeを含むリスト・辞書を、dictへの変換やjson.dumpsを経由せずにシリアライズする。
+    アプリケーションのデフォルトのレスポンスクラスとして設定するほか、
+    エンドポイントからインスタンスを返却した場合はFastAPIによるresponse_modelでの再検証とjsonable_encoderも省略される。
+    """
+
+    def render(self, content: Any) -> bytes:
+        # 例外オブジェクトを含むバリデーションエラーなど、未対応の型は文字列として出力する
+        return to_json(content, fallback=str)
@@ -6,11 +6,11 @@ from fastapi import HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from passlib.context import CryptContext
-from sqlalchemy.future import select
 
 from app.config.setting import setting
 from app.database import AsyncSession
 from app.models.user import User
+from app.repositories.auth_repository import SELECT_ACTIVE_USER_BY_EMAIL
 
 # ログの設定
 logger = structlog.get_logger()
@@ -122,12 +122,7 @@ async def authenticate_user(email: str, password: str, db: AsyncSession) -> User
 
     """
     logger.info("authenticate_user - start", email=email)
-    query = select(User).where(
-        User.email == email,
-        User.user_status == User.STATUS_ACTIVE,
-        User.deleted_at.is_(None),
-    )
-    result = await db.execute(query)
+    result = await db.execute(SELECT_ACTIVE_USER_BY_EMAIL, {"email": email})
     user = result.scalars().first()  # 検索結果を取得
     if not user:
         logger.info("authenticate_user - user not found", email=email)
@@ -0,0 +1,240 @@
+import asyncio
+import json
+import logging
+import random
+import re
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import structlog
+from sqlalchemy import NullPool, event
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config.setting import setting
+from app.core.instrumentation import IGNORE_OPTION, is_ignored
+from app.core.log_config import create_log_directory, get_log_file_path
+from app.core.query_stats import current_stats
+
+# ログの設定
+logger = structlog.get_logger()
+
+# フィンガープリント作成用の正規表現
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|(?<![:\w]):[A-Za-z_]\w*|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES_LIST = re.compile(r"(VALUES\s*\([^()]*\))(?:\s*,\s*\([^()]*\))+", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """SQL文のリテラルやプレースホルダを?に置き換え、同じ形のSQLが同じ文字列になるよう正規化します。
+
+    Args:
+        statement (str): SQL文。
+
+    Returns:
+        str: 正規化したSQL文。
+
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    # IN (?, ?, ?) や複数行のVALUESは要素数が異なっても同じフィンガープリントにまとめる
+    normalized = _IN_LIST.sub("(?...)", normalized)
+    return _VALUES_LIST.sub(r"\1, ...", normalized)
+
+
+@dataclass(slots=True)
+class FingerprintStats:
+    """フィンガープリントごとのスロークエリの集計結果。
+    """
+
+    fingerprint: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_path: str = ""
+    last_seen: str = ""
+    last_explained: float = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+class SlowQueryRecorder:
+    """閾値を超えたSQLをフィンガープリント単位で集計するクラス。
+    """
+
+    def __init__(self, max_fingerprints: int) -> None:
+        self.max_fingerprints = max_fingerprints
+        self._stats: dict[str, FingerprintStats] = {}
+
+    def record(self, statement: str, elapsed_ms: float, path: str) -> FingerprintStats | None:
+        """スロークエリを記録します。
+
+        Args:
+            statement (str): SQL文。
+            elapsed_ms (float): 所要時間（ミリ秒）。
+            path (str): 実行元のリクエストパス。
+
+        Returns:
+            FingerprintStats | None: 記録先の集計結果。上限に達して記録できない場合はNone。
+
+        """
+        key = fingerprint(statement)
+        stats = self._stats.get(key)
+        if stats is None:
+            # フィンガープリント数の上限に達した場合、合計時間が最も小さいものを破棄する
+            if len(self._stats) >= self.max_fingerprints:
+                smallest = min(self._stats.values(), key=lambda item: item.total_ms)
+                if smallest.total_ms > elapsed_ms:
+                    return None
+                del self._stats[smallest.fingerprint]
+            stats = self._stats[key] = FingerprintStats(fingerprint=key)
+        stats.count += 1
+        stats.total_ms += elapsed_ms
+        stats.max_ms = max(stats.max_ms, elapsed_ms)
+        stats.last_path = path
+        stats.last_seen = datetime.now(ZoneInfo("Asia/Tokyo")).isoformat(timespec="seconds")
+        return stats
+
+    def top(self, limit: int) -> list[dict]:
+        """合計時間の大きい順にフィンガープリントの集計結果を返却します。
+        """
+        ranked = sorted(self._stats.values(), key=lambda item: item.total_ms, reverse=True)[:limit]
+        return [{**asdict(item), "mean_ms": item.mean_ms} for item in ranked]
+
+    def clear(self) -> None:
+        self._stats.clear()
+
+
+recorder = SlowQueryRecorder(setting.SLOW_QUERY_MAX_FINGERPRINTS)
+
+
+# ---------------------------------------------------------------------------
+# EXPLAIN (ANALYZE, BUFFERS) のサンプリング
+# ---------------------------------------------------------------------------
+
+# EXPLAINの実行時にワーカーごとに追加で使用するDB接続数（コネクションプールの外で接続する）
+EXPLAIN_CONNECTIONS = 1
+
+_explain_logger: logging.Logger | None = None
+_explain_tasks: set[asyncio.Task] = set()
+
+
+def explain_connections() -> int:
+    """EXPLAINのサンプリングでワーカーごとに追加で使用するDB接続数を返却します。取得しない設定の場合は0。
+    """
+    if not setting.SLOW_QUERY_ENABLED or setting.SLOW_QUERY_EXPLAIN_SAMPLE_RATE <= 0:
+        return 0
+    return EXPLAIN_CONNECTIONS
+
+
+def _get_explain_logger() -> logging.Logger:
+    """EXPLAINの結果をJSON Lines形式で出力する専用ロガーを返却します。
+    """
+    global _explain_logger
+    if _explain_logger is None:
+        create_log_directory(setting.SLOW_QUERY_LOG_DIRECTORY)
+        handler = logging.FileHandler(get_log_file_path(setting.SLOW_QUERY_LOG_DIRECTORY, "explain_{date}.jsonl"), encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        explain_logger = logging.getLogger("slow_query.explain")
+        explain_logger.handlers = [handler]
+        explain_logger.setLevel(logging.INFO)
+        explain_logger.propagate = False
+        _explain_logger = explain_logger
+    return _explain_logger
+
+
+async def _explain(url: URL, statement: str, parameters: tuple, stats: FingerprintStats, elapsed_ms: float) -> None:
+    """別の接続でEXPLAIN (ANALYZE, BUFFERS)を実行し、結果をJSONログへ出力します。
+
+    ANALYZEはSQLを実際に実行するため、呼び出し元でSELECT文のみに限定すること。
+    """
+    explain_engine = create_async_engine(url, poolclass=NullPool)
+    try:
+        async with explain_engine.connect() as conn:
+            # EXPLAIN用の接続で実行したSQLは計測の対象外とする
+            conn = await conn.execution_options(**{IGNORE_OPTION: True})
+            result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters)
+            plan = result.scalar()
+            await conn.rollback()
+        _get_explain_logger().info(json.dumps({
+            "timestamp": datetime.now(ZoneInfo("Asia/Tokyo")).isoformat(),
+            "fingerprint": stats.fingerprint,
+            "path": stats.last_path,
+            "elapsed_ms": round(elapsed_ms, 2),
+            "statement": statement,
+            "plan": json.loads(plan) if isinstance(plan, str) else plan,
+        }, ensure_ascii=False, default=str))
+    except Exception as exc:
+        logger.warning("slow query explain failed", fingerprint=stats.fingerprint, error=str(exc))
+    finally:
+        await explain_engine.dispose()
+
+
+def _should_explain(statement: str, stats: FingerprintStats, elapsed_ms: float) -> bool:
+    if setting.SLOW_QUERY_EXPLAIN_SAMPLE_RATE <= 0 or elapsed_ms < setting.SLOW_QUERY_EXPLAIN_MIN_MS:
+        return False
+    # 接続数がEXPLAIN_CONNECTIONSを超えないよう、実行中のEXPLAINがある場合は取得しない
+    if len(_explain_tasks) >= EXPLAIN_CONNECTIONS:
+        return False
+    if statement.lstrip()[:6].upper() != "SELECT":
+        return False
+    now = time.monotonic()
+    # 同じフィンガープリントに対しては一定間隔内に1回までとする
+    if stats.last_explained and now - stats.last_explained < setting.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS:
+        return False
+    if random.random() >= setting.SLOW_QUERY_EXPLAIN_SAMPLE_RATE:
+        return False
+    stats.last_explained = now
+    return True
+
+
+# ---------------------------------------------------------------------------
+# イベントリスナー
+# ---------------------------------------------------------------------------
+
+# NOTE: 開始時刻は実行ごとのExecutionContextに保持する（例外で終了したSQLの値が接続に残らないようにするため）
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if is_ignored(context):
+        return
+    context._slow_query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = getattr(context, "_slow_query_started", None)
+    if started is None:
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if elapsed_ms < setting.SLOW_QUERY_THRESHOLD_MS:
+        return
+
+    request_stats = current_stats()
+    path = request_stats.path if request_stats else ""
+    stats = recorder.record(statement, elapsed_ms, path)
+    logger.warning("slow query", elapsed_ms=round(elapsed_ms, 2), path=path, statement=statement)
+    if stats is None or executemany or not _should_explain(statement, stats, elapsed_ms):
+        return
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(_explain(conn.engine.url, statement, tuple(parameters or ()), stats, elapsed_ms))
+    _explain_tasks.add(task)
+    task.add_done_callback(_explain_tasks.discard)
+
+
+def install_slow_query_listeners() -> None:
+    """全エンジンにスロークエリ記録用のイベントリスナーを登録します。
+    """
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,374 @@
+import functools
+import inspect
+import json
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, ParamSpec, TypeVar
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.setting import setting
+from app.core.instrumentation import is_ignored
+from app.core.log_config import get_log_file_path
+
+# ログの設定
+logger = structlog.get_logger()
+
+# OTLPのSpanKind
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+# OTLPのStatusCode
+STATUS_UNSET = 0
+STATUS_ERROR = 2
+
+# DBスパンに記録するSQL文の最大長
+_MAX_STATEMENT_LENGTH = 1000
+
+
+@dataclass(slots=True)
+class Span:
+    """1つの処理区間。OTLPのSpanに対応する。
+    """
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: str = ""
+    kind: int = SPAN_KIND_INTERNAL
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    status_code: int = STATUS_UNSET
+    status_message: str = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        self.status_code = STATUS_ERROR
+        self.status_message = message
+
+    def record_error(self, exc: BaseException) -> None:
+        self.status_code = STATUS_ERROR
+        self.status_message = f"{type(exc).__name__}: {exc}"
+
+    def to_otlp(self) -> dict[str, Any]:
+        """OTLP/JSON形式の辞書に変換します。
+        """
+        data: dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": self.status_code, "message": self.status_message} if self.status_code else {},
+        }
+        if self.parent_span_id:
+            data["parentSpanId"] = self.parent_span_id
+        return data
+
+
+def _otlp_attribute(key: str, value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+# ---------------------------------------------------------------------------
+# エクスポーター
+# ---------------------------------------------------------------------------
+
+class SpanExporter:
+    """終了したスパンをバックグラウンドのスレッドでまとめて出力するクラス。
+
+    リクエスト処理のスレッドではキューへの追加のみを行い、ファイルやコレクターへの書き込みはスレッドで行う。
+    出力はOTLP/JSON（ExportTraceServiceRequest）形式で、1行に1バッチのJSON Lines形式とする。
+    TRACING_OTLP_ENDPOINTを指定した場合は、OTLP/HTTPのコレクターへもPOSTする。
+    """
+
+    def __init__(self, directory: str, endpoint: str | None, batch_size: int = 512, flush_interval: float = 1.0) -> None:
+        self.directory = directory
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.SimpleQueue[Span | None] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+
+    def export(self, span: Span) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+            self._thread.start()
+        self._queue.put(span)
+
+    def shutdown(self) -> None:
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        running = True
+        while running:
+            batch: list[Span] = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0.001))
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: list[Span]) -> None:
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    _otlp_attribute("service.name", setting.APP_NAME),
+                    _otlp_attribute("process.pid", os.getpid()),
+                ]},
+                "scopeSpans": [{"scope": {"name": "app.core.tracing"}, "spans": [span.to_otlp() for span in batch]}],
+            }],
+        }
+        body = json.dumps(payload, ensure_ascii=False, default=str)
+        try:
+            Path(self.directory).mkdir(parents=True, exist_ok=True)
+            with open(get_log_file_path(self.directory, "spans_{date}.jsonl"), "a", encoding="utf-8") as f:
+                f.write(body + "\n")
+            if self.endpoint:
+                request = urllib.request.Request(
+                    self.endpoint, data=body.encode("utf-8"), headers={"Content-Type": "application/json"}, method="POST",
+                )
+                urllib.request.urlopen(request, timeout=5).close()
+        except Exception as exc:
+            # トレースの出力失敗でアプリケーションを止めない
+            logger.warning("span export failed", error=str(exc), spans=len(batch))
+
+
+exporter = SpanExporter(setting.TRACING_DIRECTORY, setting.TRACING_OTLP_ENDPOINT)
+
+
+# ---------------------------------------------------------------------------
+# スパンの作成
+# ---------------------------------------------------------------------------
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def activate_span(target: Span) -> Token[Span | None]:
+    """スパンを現在のスパンに設定します。戻り値のトークンでリセットしてください。
+    """
+    return _current_span.set(target)
+
+
+# NOTE: IDの生成はスパンごとに行われるため、システムコールを伴うsecretsではなくrandomを使用する
+def new_trace_id() -> str:
+    return f"{random.getrandbits(128):032x}"
+
+
+def new_span_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+def start_span(name: str, kind: int = SPAN_KIND_INTERNAL, parent: Span | None = None, trace_id: str = "", parent_span_id: str = "") -> Span:
+    """スパンを開始します。親スパンが指定されない場合は現在のスパンを親とします。
+
+    Args:
+        name (str): スパン名。
+        kind (int): スパンの種類。
+        parent (Span | None): 親スパン。
+        trace_id (str): 外部から引き継いだトレースID（traceparentヘッダーなど）。
+        parent_span_id (str): 外部から引き継いだ親スパンID。
+
+    Returns:
+        Span: 開始したスパン。
+
+    """
+    parent = parent or _current_span.get()
+    if parent is not None:
+        trace_id, parent_span_id = parent.trace_id, parent.span_id
+    return Span(name=name, trace_id=trace_id or new_trace_id(), span_id=new_span_id(), parent_span_id=parent_span_id, kind=kind)
+
+
+def end_span(span: Span) -> None:
+    span.end_ns = time.time_ns()
+    exporter.export(span)
+
+
+@contextmanager
+def span(name: str, kind: int = SPAN_KIND_INTERNAL, **attributes: Any) -> Iterator[Span | None]:
+    """ブロックをスパンとして計測するコンテキストマネージャ。トレースが無効な場合はNoneを返却します。
+
+    Args:
+        name (str): スパン名。
+        kind (int): スパンの種類。
+        **attributes (Any): スパンの属性。
+
+    Yields:
+        Span | None: 開始したスパン。
+
+    """
+    if not setting.TRACING_ENABLED:
+        yield None
+        return
+    current = start_span(name, kind)
+    current.attributes.update(attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.record_error(exc)
+        raise
+    finally:
+        _current_span.reset(token)
+        end_span(current)
+
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+def traced(name: str | None = None) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """関数の実行をスパンとして計測するデコレーター。同期関数とコルーチン関数に対応します。
+
+    staticmethodに適用する場合は@staticmethodの下に記述してください。
+    FastAPIのエンドポイントに適用する場合は@router.getなどの下に記述してください（シグネチャは__wrapped__から解決される）。
+
+    Args:
+        name (str | None): スパン名。未指定の場合は「モジュール名.関数名」。
+
+    Returns:
+        Callable: デコレーター。
+
+    """
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        span_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+        if inspect.isasyncgenfunction(func):
+            raise TypeError("traced() does not support async generator functions")
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+                with span(span_name):
+                    return await func(*args, **kwargs)  # type: ignore[misc]
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# W3C Trace Context
+# ---------------------------------------------------------------------------
+
+def parse_traceparent(value: str | None) -> tuple[str, str] | None:
+    """traceparentヘッダーからトレースIDと親スパンIDを取得します。不正な値の場合はNone。
+    """
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    trace_id, parent_span_id = parts[1].lower(), parts[2].lower()
+    if trace_id == "0" * 32 or parent_span_id == "0" * 16:
+        return None
+    try:
+        int(trace_id, 16)
+        int(parent_span_id, 16)
+    except ValueError:
+        return None
+    return trace_id, parent_span_id
+
+
+def format_traceparent(current: Span) -> str:
+    return f"00-{current.trace_id}-{current.span_id}-01"
+
+
+# ---------------------------------------------------------------------------
+# DB
+# ---------------------------------------------------------------------------
+
+class TracedAsyncSession(AsyncSession):
+    """commit・flush・refreshをスパンとして計測するAsyncSession。
+
+    SQLの実行はカーソルのイベントで計測するが、COMMITはカーソルを経由しないため、ここで計測する。
+    """
+
+    async def commit(self) -> None:
+        with span("db.commit", SPAN_KIND_CLIENT):
+            await super().commit()
+
+    async def flush(self, objects=None) -> None:
+        with span("db.flush"):
+            await super().flush(objects)
+
+    async def refresh(self, instance, attribute_names=None, with_for_update=None) -> None:
+        with span("db.refresh"):
+            await super().refresh(instance, attribute_names, with_for_update)
+
+
+# NOTE: スパンは実行ごとのExecutionContextに保持する。
+#       取り消された（CancelledError）SQLではafter_cursor_executeもhandle_errorも呼ばれないため、
+#       接続単位で保持するとスパンがプールの接続に残り、次のSQLで誤ったスパンを終了してしまう。
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current_span.get() is None or is_ignored(context):
+        return
+    db_span = start_span("db.query", SPAN_KIND_CLIENT)
+    db_span.attributes.update({"db.system": "postgresql", "db.statement": statement[:_MAX_STATEMENT_LENGTH]})
+    context._trace_span = db_span
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    db_span = getattr(context, "_trace_span", None)
+    if db_span is not None:
+        context._trace_span = None
+        end_span(db_span)
+
+
+def _handle_error(exception_context) -> None:
+    db_span = getattr(exception_context.execution_context, "_trace_span", None)
+    if db_span is not None:
+        exception_context.execution_context._trace_span = None
+        db_span.record_error(exception_context.original_exception)
+        end_span(db_span)
+
+
+def install_db_listeners() -> None:
+    """全エンジンにDBスパン用のイベントリスナーを登録します。
+    """
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
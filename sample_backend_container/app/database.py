@@ -1,13 +1,16 @@
 import configparser
 from collections.abc import AsyncGenerator
 
-from databases import Database
-from sqlalchemy import NullPool
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy.pool import AsyncAdaptedQueuePool
+from fastapi import Request
+from sqlalchemy import NullPool, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
 
 from app.config.setting import setting
+from app.core.admission import TimedAsyncAdaptedQueuePool
+from app.core.circuit_breaker import CircuitBreaker, install_circuit_breaker
+from app.core.replica import Replica, ReplicaRouter
+from app.core.tracing import TracedAsyncSession
 
 Base = declarative_base()
 
@@ -23,6 +26,8 @@ def get_database_url(test_env: int = 0) -> str:
     """
     if test_env == 1:
         return "postgresql+asyncpg://sample_user:sample_password@db:5432/pytest_sample_db"
+    if setting.DATABASE_URL:
+        return setting.DATABASE_URL
     config = configparser.ConfigParser()
     config.read("alembic.ini")
     return config.get("alembic", "sqlalchemy.url")
@@ -35,48 +40,127 @@ def configure_database(test_env: int = 0):
         test_env (int): 環境指定フラグ (0: 本番、1: Pytest)。
 
     Returns:
-        dict: データベース、エンジン、セッション情報を含む辞書。
+        dict: エンジン、セッション情報を含む辞書。
 
     """
     database_url = get_database_url(test_env)
-    database = Database(database_url)
+    # コンパイル済みSQLとプリペアドステートメントのキャッシュサイズ
+    engine_options = {
+        "echo": False,
+        "query_cache_size": setting.DB_COMPILED_CACHE_SIZE,
+        "connect_args": {
+            "prepared_statement_cache_size": setting.DB_PREPARED_STATEMENT_CACHE_SIZE,
+            "timeout": setting.DB_CONNECT_TIMEOUT_SECONDS,
+        },
+    }
+    # NOTE: リクエストの取り消し時は接続が強制的に切断される場合があり、その場合はasyncpgによるクエリの取り消しが送信されない。
+    #       DB側で切断を検知して実行中のクエリを中断するよう、client_connection_check_intervalを設定する。
+    if setting.DB_CLIENT_CHECK_INTERVAL_MS > 0:
+        engine_options["connect_args"]["server_settings"] = {"client_connection_check_interval": str(setting.DB_CLIENT_CHECK_INTERVAL_MS)}
 
     # NOTE: AsyncAdaptedQueuePoolではPytest時にイベントループ絡みで失敗するため、開発時はNullPoolにする
     if setting.DEV_MODE:
         # 開発時はコネクションプーリングを保持せずに都度接続＆開放するように設定
-        print("Pytest用のDB環境設定")
-        engine = create_async_engine(database_url, echo=False, poolclass=NullPool)
+        engine_options["poolclass"] = NullPool
     else:
         # 本番環境では非同期でもコネクションプーリングを使いまわすように設定
-        engine = create_async_engine(database_url, echo=False, poolclass=AsyncAdaptedQueuePool)
-
-    # TODO: autoflushとexpire_on_commitについて調査
-    # NOTE: AsyncSessionを使用する場合はbindをasync withのタイミングにしなとmypyエラーとなる
-    async_session_local = sessionmaker(
-        class_=AsyncSession,
+        # 接続の取得待ち時間は流量制御の判定に使用する
+        engine_options["poolclass"] = TimedAsyncAdaptedQueuePool
+        engine_options["pool_size"] = setting.DB_POOL_SIZE
+        engine_options["max_overflow"] = setting.DB_MAX_OVERFLOW
+    engine = create_async_engine(database_url, **engine_options)
+
+    # プライマリへの接続の失敗が続いた場合は、接続を試みずに即座に失敗させる
+    # レプリカはReplicaRouterのヘルスチェックで振り分けの対象外となる
+    circuit_breaker = None
+    if setting.DB_CIRCUIT_BREAKER_ENABLED:
+        circuit_breaker = CircuitBreaker(
+            "primary",
+            failure_threshold=setting.DB_CIRCUIT_FAILURE_THRESHOLD,
+            open_seconds=setting.DB_CIRCUIT_OPEN_SECONDS,
+            half_open_probes=setting.DB_CIRCUIT_HALF_OPEN_PROBES,
+        )
+        install_circuit_breaker(engine, circuit_breaker)
+
+    # 読み取り専用セッションをレプリカへ振り分ける（Pytest時はプライマリのみ）
+    replica_router = None
+    if setting.DATABASE_REPLICAS and test_env == 0:
+        replicas = []
+        for replica_url, weight in setting.DATABASE_REPLICAS.items():
+            url = make_url(replica_url)
+            replicas.append(Replica(f"{url.host}:{url.port or 5432}/{url.database}", create_async_engine(url, **engine_options), weight))
+        replica_router = ReplicaRouter(
+            replicas,
+            max_lag_seconds=setting.REPLICA_MAX_LAG_SECONDS,
+            read_your_writes_seconds=setting.REPLICA_READ_YOUR_WRITES_SECONDS,
+            check_interval=setting.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS,
+            check_timeout=setting.REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS,
+        )
+
+    # NOTE: セッションはファクトリに設定したエンジンに接続する
+    # NOTE: expire_on_commit=Trueではcommitのたびに読み込み済みの全オブジェクトが期限切れとなり、
+    #       属性へのアクセスやrefresh()で再取得のSELECTが発生するため、commit後も状態を保持する。
+    #       デフォルト値はすべてPython側で設定しているため、INSERT/UPDATE後の値もオブジェクトに反映済みとなる。
+    async_session_local = async_sessionmaker(
+        engine,
+        class_=TracedAsyncSession,
         autoflush=True,
-        expire_on_commit=True,
+        expire_on_commit=False,
+    )
+    # 読み取り専用のセッション。トランザクションはBEGIN READ ONLYで開始される（追加の往復は発生しない）
+    # 変更を行わないため、クエリ前のautoflushも不要
+    read_session_local = async_sessionmaker(
+        engine,
+        class_=TracedAsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+        execution_options={"postgresql_readonly": True},
     )
 
     return {
-        "database": database,
         "engine": engine,
         "sessionmaker": async_session_local,
+        "read_sessionmaker": read_session_local,
+        "replica_router": replica_router,
+        "circuit_breaker": circuit_breaker,
     }
 
 
 # 本番環境のデフォルト設定
 db_config = configure_database()
-database = db_config["database"]
 engine = db_config["engine"]
-AsyncSessionLocal = db_config["sessionmaker"]
+AsyncSessionLocal: async_sessionmaker[TracedAsyncSession] = db_config["sessionmaker"]
+ReadSessionLocal: async_sessionmaker[TracedAsyncSession] = db_config["read_sessionmaker"]
+replica_router: ReplicaRouter | None = db_config["replica_router"]
+circuit_breaker: CircuitBreaker | None = db_config["circuit_breaker"]
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """書き込み用の非同期データベースセッションを生成するジェネレーター関数。
+
+    commit後もオブジェクトの状態を保持するため、commit後のrefresh()は不要です。
+    書き込みをcommitした場合は、ReadYourWritesMiddlewareがクライアントの書き込み時刻を記録します。
+
+    Yields:
+        AsyncSession: 非同期セッションインスタンス。
 
-async def get_db() -> AsyncGenerator:
-    """非同期データベースセッションを生成するジェネレーター関数。
+    """
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def get_read_db(request: Request = None) -> AsyncGenerator[AsyncSession, None]:  # type: ignore[assignment]
+    """読み取り専用の非同期データベースセッションを生成するジェネレーター関数。
+
+    トランザクションはREAD ONLYで開始されるため、書き込みを行うとDBがエラーを返却します。
+    レプリカを使用する場合は、ReplicaRouterが選択したレプリカに接続します。
+
+    Args:
+        request (Request): リクエスト。FastAPIの依存関係以外から呼び出す場合は省略できる（プライマリに接続する）。
 
     Yields:
         AsyncSession: 非同期セッションインスタンス。
 
     """
-    async with AsyncSessionLocal(bind=engine) as session:
+    replica_engine = replica_router.read_engine() if replica_router and request is not None else None
+    async with (ReadSessionLocal(bind=replica_engine) if replica_engine else ReadSessionLocal()) as session:
         yield session
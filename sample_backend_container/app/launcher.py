@@ -0,0 +1,222 @@
+"""本番環境用のサーバーの起動モジュール。
+
+python -m app.launcher で起動する。マスタープロセスでソケットを作成してアプリケーションを読み込み、
+ワーカーをforkしてリクエストを処理する。マスタープロセスは異常終了したワーカーを再起動し、
+SIGTERM・SIGINTを受信するとワーカーを順に停止させる（処理中のリクエストの完了を待ってからDB接続などを解放する）。
+"""
+import contextlib
+import gc
+import importlib.util
+import logging
+import os
+import signal
+import socket
+import time
+import traceback
+from pathlib import Path
+
+import uvicorn
+
+from app.config.setting import setting
+
+# uvicornのログ設定を使用する
+logger = logging.getLogger("uvicorn.error")
+
+# ワーカーの停止を待つ時間に加える猶予（秒）。超過した場合は強制終了する
+KILL_MARGIN_SECONDS = 5.0
+
+# 異常終了したワーカーを再起動するまでの待機時間（秒）
+RESPAWN_DELAY_SECONDS = 1.0
+
+
+def available_cpus() -> int:
+    """プロセスが利用できるCPUコア数を返却します。
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def pool_limits(
+    workers: int, pool_size: int, max_overflow: int, max_connections: int, reserved: int, extra_per_worker: int = 0,
+) -> tuple[int, int]:
+    """全ワーカーの接続数の合計がmax_connectionsを超えないよう、ワーカーごとのコネクションプールの接続数を計算します。
+
+    設定値のpool_size・max_overflowを上限とし、ワーカーに割り当てられる接続数を超える場合は縮小します。
+
+    Args:
+        workers (int): ワーカー数。
+        pool_size (int): 設定値のプールで保持する接続数。
+        max_overflow (int): 設定値の一時的に作成できる接続数。
+        max_connections (int): PostgreSQLのmax_connections。
+        reserved (int): アプリケーション以外に残す接続数。
+        extra_per_worker (int): ワーカーごとにプールの外で使用する接続数（スロークエリのEXPLAINなど）。
+
+    Returns:
+        tuple[int, int]: ワーカーごとのpool_sizeとmax_overflow。
+
+    Raises:
+        ValueError: ワーカーに1接続も割り当てられない場合。
+
+    """
+    per_worker = (max_connections - reserved) // workers - extra_per_worker
+    if per_worker < 1:
+        raise ValueError(
+            f"not enough database connections for {workers} workers (max_connections={max_connections}, reserved={reserved})",
+        )
+    size = min(pool_size, per_worker)
+    return size, min(max_overflow, per_worker - size)
+
+
+def select_implementation(preferred: str, fallback: str) -> str:
+    """uvicornのイベントループ・HTTPパーサーの実装を選択します。インストールされていない場合は代替の実装を返却します。
+    """
+    if preferred != fallback and importlib.util.find_spec(preferred) is None:
+        logger.warning("%s is not installed, falling back to %s", preferred, fallback)
+        return fallback
+    return preferred
+
+
+def _after_fork() -> None:
+    # NOTE: 読み込み済みのエンジンをforkした場合、マスタープロセスの接続をワーカーで共有しないよう、
+    #       接続を閉じずにプールのみを破棄する（読み込み時点では接続していないが、念のため行う）。
+    from app.database import engine, replica_router
+
+    engine.sync_engine.dispose(close=False)
+    if replica_router:
+        for replica in replica_router.replicas:
+            replica.engine.sync_engine.dispose(close=False)
+
+
+class Supervisor:
+    """ワーカーをforkして監視するクラス。
+    """
+
+    def __init__(self, config: uvicorn.Config, sock: socket.socket, workers: int) -> None:
+        self.config = config
+        self.sock = sock
+        self.workers = workers
+        self.children: set[int] = set()
+        self.stopping = False
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker()
+        self.children.add(pid)
+
+    def _run_worker(self) -> None:
+        exit_code = 0
+        try:
+            # シグナルはuvicornが処理する
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            if self.config.loaded:
+                _after_fork()
+            uvicorn.Server(self.config).run(sockets=[self.sock])
+        except BaseException:
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            # マスタープロセスのatexitを実行しないようos._exitで終了するため、ログのバッファをここで書き出す
+            logging.shutdown()
+            os._exit(exit_code)
+
+    def _stop(self, signum: int, frame: object) -> None:
+        self.stopping = True
+
+    def _reap(self) -> int | None:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return None
+        if pid:
+            self.children.discard(pid)
+            if not self.stopping:
+                logger.warning("worker %d exited with code %d", pid, os.waitstatus_to_exitcode(status))
+        return pid or None
+
+    def run(self) -> None:
+        """ワーカーを起動し、停止のシグナルを受信するまで監視します。
+        """
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        for _ in range(self.workers):
+            self.spawn()
+        logger.info("started %d workers (master pid %d)", self.workers, os.getpid())
+
+        while not self.stopping:
+            if self._reap() is None:
+                time.sleep(0.5)
+            elif not self.stopping:
+                time.sleep(RESPAWN_DELAY_SECONDS)
+                self.spawn()
+
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        """ワーカーにSIGTERMを送信し、処理中のリクエストの完了と終了処理を待ちます。
+        """
+        logger.info("stopping %d workers", len(self.children))
+        for pid in self.children:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.config.timeout_graceful_shutdown + KILL_MARGIN_SECONDS  # type: ignore[operator]
+        while self.children and time.monotonic() < deadline:
+            if self._reap() is None:
+                time.sleep(0.1)
+        for pid in self.children:
+            logger.warning("worker %d did not stop in time, killing", pid)
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+        self.children.clear()
+        self.sock.close()
+
+
+def main() -> None:
+    """設定値に従ってサーバーを起動します。
+    """
+    # NOTE: レポート変換のプロセスプールはspawnで子プロセスを起動し、子プロセスは起動時にこのモジュールを再度読み込む。
+    #       DBなどの重いモジュールを子プロセスで読み込まないよう、ここで読み込む。
+    from app.core.slow_query import explain_connections
+
+    workers = setting.WEB_CONCURRENCY or available_cpus()
+    # NOTE: エンジンはapp.databaseの読み込み時に作成されるため、アプリケーションの読み込みより前に設定する
+    setting.DB_POOL_SIZE, setting.DB_MAX_OVERFLOW = pool_limits(
+        workers, setting.DB_POOL_SIZE, setting.DB_MAX_OVERFLOW, setting.DB_MAX_CONNECTIONS, setting.DB_RESERVED_CONNECTIONS,
+        extra_per_worker=explain_connections(),
+    )
+
+    config = uvicorn.Config(
+        "main:app",
+        host=setting.SERVER_HOST,
+        port=setting.SERVER_PORT,
+        loop=select_implementation(setting.SERVER_LOOP, "asyncio"),
+        http=select_implementation(setting.SERVER_HTTP, "h11"),
+        backlog=setting.SERVER_BACKLOG,
+        timeout_graceful_shutdown=setting.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+    )
+    logger.info(
+        "workers=%d loop=%s http=%s db_pool_size=%d db_max_overflow=%d",
+        workers, config.loop, config.http, setting.DB_POOL_SIZE, setting.DB_MAX_OVERFLOW,
+    )
+
+    # 前回起動時のワーカーのメトリクスを集計に含めないよう削除する
+    if setting.METRICS_MULTIPROC_DIR:
+        for path in Path(setting.METRICS_MULTIPROC_DIR).glob("metrics_*.json"):
+            path.unlink(missing_ok=True)
+    elif workers > 1:
+        logger.warning("METRICS_MULTIPROC_DIR is not set, /metrics reports only the worker that serves the scrape")
+
+    sock = config.bind_socket()
+    if setting.SERVER_PRELOAD:
+        config.load()
+        # 読み込み済みのオブジェクトをGCの対象外とし、ワーカーでのGCの走査によりページがコピーされるのを防ぐ
+        gc.freeze()
+    Supervisor(config, sock, workers).run()
+
+
+if __name__ == "__main__":
+    main()
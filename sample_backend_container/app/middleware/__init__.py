@@ -1,7 +1,23 @@
 from .add_userIP_middleware import AddUserIPMiddleware
+from .admission_middleware import AdmissionMiddleware
+from .deadline_middleware import DeadlineMiddleware
 from .error_handler_middleware import ErrorHandlerMiddleware
+from .metrics_middleware import MetricsMiddleware
+from .profiling_middleware import ProfilingMiddleware
+from .query_stats_middleware import QueryStatsMiddleware
+from .rate_limit_middleware import RateLimitMiddleware
+from .read_your_writes_middleware import ReadYourWritesMiddleware
+from .tracing_middleware import TracingMiddleware
 
 __all__ = [
-    "AddUserIPMiddleware"
+    "AddUserIPMiddleware",
+    "AdmissionMiddleware",
+    "DeadlineMiddleware",
     "ErrorHandlerMiddleware",
+    "MetricsMiddleware",
+    "ProfilingMiddleware",
+    "QueryStatsMiddleware",
+    "RateLimitMiddleware",
+    "ReadYourWritesMiddleware",
+    "TracingMiddleware",
 ]
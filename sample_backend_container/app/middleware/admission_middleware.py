@@ -0,0 +1,49 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config.setting import setting
+from app.core.admission import classify, create_admission_controller
+from app.core.log_config import logger
+from app.core.metrics import ADMISSION_REJECTED_TOTAL
+from app.core.responses import FastJSONResponse
+
+
+class AdmissionMiddleware:
+    """同時実行数を制限し、過負荷時にリクエストを503で即座に拒否するミドルウェア。
+
+    DBが遅延した際にリクエストがワーカー内に滞留し続けることを防ぎ、処理できる分だけを受け付ける。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.controller = create_admission_controller()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """実行の許可を取得してからリクエストを処理します。
+
+        Args:
+            scope (Scope): ASGIのスコープ。
+            receive (Receive): ASGIのreceive関数。
+            send (Send): ASGIのsend関数。
+
+        """
+        route_class = classify(scope["method"], scope["path"]) if scope["type"] == "http" and setting.ADMISSION_ENABLED else None
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        reason = await self.controller.acquire(route_class)
+        if reason is not None:
+            ADMISSION_REJECTED_TOTAL.inc(route_class, reason)
+            logger.warning("request rejected by admission control", path=scope["path"], route_class=route_class, reason=reason)
+            response = FastJSONResponse(
+                status_code=503,
+                content={"detail": "Service temporarily overloaded"},
+                headers={"Retry-After": str(setting.ADMISSION_RETRY_AFTER_SECONDS)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(route_class)
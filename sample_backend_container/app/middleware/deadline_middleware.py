@@ -0,0 +1,102 @@
+import asyncio
+import contextlib
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.setting import setting
+from app.core.deadline import deadline_scope, route_timeout
+from app.core.log_config import logger
+from app.core.metrics import REQUEST_ABORTED_TOTAL
+from app.core.responses import FastJSONResponse
+
+
+class DeadlineMiddleware:
+    """リクエストに期限を設定し、期限切れやクライアントの切断時に処理を取り消すミドルウェア。
+
+    期限はcontextvarsで後続の処理に伝播し、DBのトランザクションではstatement_timeoutとして設定される。
+    クライアントが切断した場合は処理中のタスクを取り消すため、実行中のクエリも取り消されて接続がプールへ返却される。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """期限を設定してリクエストを処理します。
+
+        Args:
+            scope (Scope): ASGIのスコープ。
+            receive (Receive): ASGIのreceive関数。
+            send (Send): ASGIのsend関数。
+
+        """
+        if scope["type"] != "http" or not setting.REQUEST_DEADLINE_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        timeout = route_timeout(scope["method"], scope["path"])
+        # クライアントが指定した期限が短い場合はそちらを使用する
+        requested = Headers(scope=scope).get(setting.REQUEST_DEADLINE_HEADER)
+        with contextlib.suppress(ValueError, TypeError):
+            if requested is not None and float(requested) > 0:
+                timeout = min(timeout, float(requested)) if timeout > 0 else float(requested)
+        if timeout <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        # NOTE: 切断を検知するためreceiveを常に待ち受け、受信したメッセージはキューを経由して後続の処理へ渡す。
+        #       キューの上限を1とすることで、リクエストボディを先読みしすぎないようにする。
+        messages: asyncio.Queue[Message] = asyncio.Queue(maxsize=1)
+        disconnected = asyncio.Event()
+        response_started = response_completed = False
+
+        async def receive_from_queue() -> Message:
+            if disconnected.is_set() and messages.empty():
+                return {"type": "http.disconnect"}
+            return await messages.get()
+
+        async def send_tracking(message: Message) -> None:
+            nonlocal response_started, response_completed
+            response_started = True
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_completed = True
+            await send(message)
+
+        with deadline_scope(timeout):
+            app_task = asyncio.create_task(self.app(scope, receive_from_queue, send_tracking))
+
+            async def watch_disconnect() -> None:
+                while True:
+                    message = await receive()
+                    if message["type"] == "http.disconnect":
+                        disconnected.set()
+                        # レスポンスの送信後（バックグラウンドタスクなど）は取り消さない
+                        if not response_completed:
+                            app_task.cancel()
+                        return
+                    await messages.put(message)
+
+            watcher = asyncio.create_task(watch_disconnect())
+            try:
+                async with asyncio.timeout(timeout):
+                    await asyncio.shield(app_task)
+            except TimeoutError:
+                app_task.cancel()
+                with contextlib.suppress(BaseException):
+                    await app_task
+                REQUEST_ABORTED_TOTAL.inc("deadline")
+                logger.warning("request deadline exceeded", path=scope["path"], method=scope["method"], timeout=timeout)
+                if not response_started:
+                    response = FastJSONResponse(status_code=504, content={"detail": "Request deadline exceeded"})
+                    await response(scope, receive_from_queue, send)
+            except asyncio.CancelledError:
+                if not disconnected.is_set() or not app_task.cancelled():
+                    # サーバーの停止などによる取り消し
+                    app_task.cancel()
+                    raise
+                REQUEST_ABORTED_TOTAL.inc("client_disconnect")
+                logger.info("request cancelled by client disconnect", path=scope["path"], method=scope["method"])
+            finally:
+                watcher.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await watcher
@@ -1,3 +1,4 @@
+import math
 import traceback
 
 from fastapi import HTTPException, Request
@@ -5,9 +6,11 @@ from jose import JWTError
 from pydantic import ValidationError
 from sqlalchemy.exc import SQLAlchemyError
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse
 
+from app.core.circuit_breaker import CircuitOpenError
+from app.core.deadline import SQLSTATE_QUERY_CANCELED
 from app.core.log_config import logger
+from app.core.responses import FastJSONResponse
 
 
 class ErrorHandlerMiddleware(BaseHTTPMiddleware):
@@ -40,7 +43,7 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
                 method=request.method,
                 stack_trace=error_trace,
             )
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=http_exc.status_code,
                 content={"message": http_exc.detail},
                 headers=http_exc.headers,
@@ -56,11 +59,36 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
                 method=request.method,
                 stack_trace=error_trace,
             )
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=422,
                 content={"message": "Validation error", "errors": val_exc.errors()},
             )
+        except CircuitOpenError as circuit_exc:
+            # DBへの接続がサーキットブレーカーで遮断されている場合の処理
+            logger.warning(
+                "Database circuit open",
+                error=str(circuit_exc),
+                path=request.url.path,
+                method=request.method,
+            )
+            return FastJSONResponse(
+                status_code=503,
+                content={"message": "Database temporarily unavailable"},
+                headers={"Retry-After": str(max(math.ceil(circuit_exc.retry_after), 1))},
+            )
         except SQLAlchemyError as db_exc:
+            # リクエストの期限によりstatement_timeoutでクエリが取り消された場合の処理
+            if getattr(getattr(db_exc, "orig", None), "sqlstate", None) == SQLSTATE_QUERY_CANCELED:
+                logger.warning(
+                    "Query cancelled by request deadline",
+                    error=str(db_exc.orig),  # type: ignore[attr-defined]
+                    path=request.url.path,
+                    method=request.method,
+                )
+                return FastJSONResponse(
+                    status_code=504,
+                    content={"message": "Request deadline exceeded"},
+                )
             # SQLAlchemyErrorが発生した場合の処理
             error_trace = traceback.format_exc()  # スタックトレースを取得
             logger.error(
@@ -71,7 +99,7 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
                 method=request.method,
                 stack_trace=error_trace,
             )
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=500,
                 content={"message": "Database error occurred"},
             )
@@ -86,7 +114,7 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
                 method=request.method,
                 stack_trace=error_trace,
             )
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=401,
                 content={"message": "Invalid or expired token"},
             )
@@ -102,7 +130,7 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
                 method=request.method,
                 stack_trace=error_trace,
             )
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=500,
                 content={"message": "Internal Server Error"},
             )
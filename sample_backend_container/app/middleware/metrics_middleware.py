@@ -0,0 +1,53 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import HTTP_REQUEST_DURATION_SECONDS, HTTP_REQUESTS_IN_FLIGHT, HTTP_REQUESTS_TOTAL
+
+# ルーティングに一致しなかったリクエストのラベル（パスをそのままラベルにすると系列数が無制限に増えるため）
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """ルートテンプレートごとのリクエスト数・レイテンシと処理中のリクエスト数を記録するミドルウェア。
+
+    全リクエストで実行されるため、BaseHTTPMiddlewareではなく素のASGIミドルウェアとして実装する。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """リクエストを処理し、完了時にメトリクスを記録します。
+
+        Args:
+            scope (Scope): ASGIのスコープ。
+            receive (Receive): ASGIのreceive関数。
+            send (Send): ASGIのsend関数。
+
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_REQUESTS_IN_FLIGHT.dec(method)
+            # ルーティング後はscope["route"]にFastAPIのAPIRouteが設定される
+            route = scope.get("route")
+            route_template = getattr(route, "path", UNMATCHED_ROUTE)
+            HTTP_REQUESTS_TOTAL.inc(method, route_template, str(status_code))
+            HTTP_REQUEST_DURATION_SECONDS.observe(elapsed, method, route_template)
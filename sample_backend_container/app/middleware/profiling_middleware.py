@@ -0,0 +1,45 @@
+import hmac
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config.setting import setting
+from app.core.log_config import logger
+from app.core.profiler import is_profiling, profile_block
+
+# 単一リクエストのプロファイルを要求するヘッダー。値にはPROFILING_TOKENを指定する
+PROFILE_HEADER = "x-profile"
+
+
+class ProfilingMiddleware:
+    """X-Profileヘッダーが指定されたリクエストの処理中のみ、サンプリングプロファイラを実行するミドルウェア。
+
+    結果はレスポンス送信後に書き出すため、出力ファイル名はログで確認する。
+    NOTE: イベントループのスレッドを計測するため、同時に処理中の他のリクエストのスタックも含まれる。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """プロファイルが要求されている場合はプロファイラを実行しつつリクエストを処理します。
+
+        Args:
+            scope (Scope): ASGIのスコープ。
+            receive (Receive): ASGIのreceive関数。
+            send (Send): ASGIのsend関数。
+
+        """
+        if scope["type"] != "http" or not setting.PROFILING_ENABLED or not setting.PROFILING_TOKEN:
+            await self.app(scope, receive, send)
+            return
+
+        token = Headers(scope=scope).get(PROFILE_HEADER)
+        # 別のプロファイルが実行中の場合は、リクエストを待たせずにプロファイルなしで処理する
+        if token is None or not hmac.compare_digest(token, setting.PROFILING_TOKEN) or is_profiling():
+            await self.app(scope, receive, send)
+            return
+
+        async with profile_block(setting.PROFILING_DEFAULT_INTERVAL_MS / 1000, label="request") as results:
+            await self.app(scope, receive, send)
+        logger.info("request profiled", path=scope["path"], **vars(results[0]))
@@ -0,0 +1,59 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.setting import setting
+from app.core.log_config import logger
+from app.core.query_stats import request_observers, track_queries
+
+
+class QueryStatsMiddleware:
+    """リクエストごとに実行されたSQLの件数と所要時間を集計するミドルウェア。
+
+    開発時はレスポンスヘッダーに、本番時はログに出力する。
+    同一のSQL文が閾値以上繰り返された場合はN+1の疑いとして警告ログを出力する。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """リクエストを処理し、SQLの集計結果を出力します。
+
+        Args:
+            scope (Scope): ASGIのスコープ。
+            receive (Receive): ASGIのreceive関数。
+            send (Send): ASGIのsend関数。
+
+        """
+        if scope["type"] != "http" or not setting.QUERY_STATS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries(scope["path"]) as stats:
+
+            async def send_wrapper(message: Message) -> None:
+                # NOTE: ストリーミングレスポンスではヘッダー送信後のSQLはヘッダーの値に含まれない（ログには含まれる）
+                if message["type"] == "http.response.start" and setting.DEV_MODE:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Query-Count"] = str(stats.count)
+                    headers["X-DB-Time-ms"] = f"{stats.total_ms:.2f}"
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get("route"), "path", scope["path"])
+                repeated = stats.repeated_statements(setting.QUERY_N_PLUS_ONE_THRESHOLD)
+                for statement, count in repeated:
+                    logger.warning("N+1 query suspected", method=scope["method"], route=route, statement=statement, count=count)
+                if not setting.DEV_MODE:
+                    logger.info(
+                        "request db stats",
+                        method=scope["method"],
+                        route=route,
+                        db_query_count=stats.count,
+                        db_time_ms=round(stats.total_ms, 2),
+                        n_plus_one=len(repeated),
+                    )
+                for observer in request_observers:
+                    observer(scope["method"], route, stats)
@@ -0,0 +1,50 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config.setting import setting
+from app.core.log_config import logger
+from app.core.metrics import RATE_LIMITED_TOTAL
+from app.core.rate_limit import create_rate_limiter, identify, retry_after_header
+from app.core.responses import FastJSONResponse
+
+
+class RateLimitMiddleware:
+    """ユーザーまたはIPアドレスごとにリクエストの頻度を制限し、超過した場合は429を返却するミドルウェア。
+
+    ログインや登録へのブルートフォース・大量登録によるbcryptの負荷を、DBにアクセスせずに遮断する。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.limiter = create_rate_limiter() if setting.RATE_LIMIT_ENABLED else None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """リクエストの頻度を判定し、許可した場合のみ後続の処理を実行します。
+
+        Args:
+            scope (Scope): ASGIのスコープ。
+            receive (Receive): ASGIのreceive関数。
+            send (Send): ASGIのsend関数。
+
+        """
+        if (
+            scope["type"] != "http"
+            or self.limiter is None
+            or any(scope["path"].startswith(prefix) for prefix in setting.RATE_LIMIT_EXEMPT_PATHS)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        identity, role = identify(scope)
+        rule, retry_after = await self.limiter.check(scope["method"], scope["path"], identity, role)
+        if retry_after > 0:
+            RATE_LIMITED_TOTAL.inc(rule.name)
+            logger.warning("request rate limited", path=scope["path"], rule=rule.name, identity=identity)
+            response = FastJSONResponse(
+                status_code=429,
+                content={"detail": "Too many requests"},
+                headers={"Retry-After": retry_after_header(retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
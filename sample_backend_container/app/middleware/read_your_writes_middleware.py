@@ -0,0 +1,47 @@
+import math
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.setting import setting
+from app.core.replica import sign_write_time, track_writes, verify_write_time
+
+
+class ReadYourWritesMiddleware:
+    """クライアントの直近の書き込み時刻を署名付きのCookieで受け渡すミドルウェア。
+
+    Cookieの書き込み時刻はリクエストの間保持され、ReplicaRouterが読み取りの接続先の判定に使用する。
+    書き込みをcommitしたリクエストでは、レスポンスのCookieを書き込み時刻に更新する。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """リクエストを処理し、書き込みをcommitした場合はCookieを更新します。
+
+        Args:
+            scope (Scope): ASGIのスコープ。
+            receive (Receive): ASGIのreceive関数。
+            send (Send): ASGIのsend関数。
+
+        """
+        if scope["type"] != "http" or not setting.DATABASE_REPLICAS or setting.REPLICA_READ_YOUR_WRITES_SECONDS <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        cookies = cookie_parser(MutableHeaders(scope=scope).get("cookie", ""))
+        written = verify_write_time(cookies.get(setting.REPLICA_WRITE_COOKIE), setting.SECRET_KEY)
+        with track_writes(written) as writes:
+
+            async def send_wrapper(message: Message) -> None:
+                # NOTE: ストリーミングレスポンスではヘッダー送信後のcommitはCookieに反映されない
+                if message["type"] == "http.response.start" and writes.committed and writes.written is not None:
+                    MutableHeaders(scope=message).append("set-cookie", (
+                        f"{setting.REPLICA_WRITE_COOKIE}={sign_write_time(writes.written, setting.SECRET_KEY)}; "
+                        f"Max-Age={math.ceil(setting.REPLICA_READ_YOUR_WRITES_SECONDS)}; Path=/; HttpOnly; SameSite=lax"
+                    ))
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,59 @@
+import structlog
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.setting import setting
+from app.core.tracing import SPAN_KIND_SERVER, activate_span, end_span, format_traceparent, parse_traceparent, start_span
+
+
+class TracingMiddleware:
+    """リクエスト全体をサーバースパンとして計測し、トレースコンテキストを後続の処理へ引き継ぐミドルウェア。
+
+    traceparentヘッダーが指定された場合は、呼び出し元のトレースの子スパンとする。
+    レスポンスにはtraceparentヘッダーを付与し、ログにはtrace_idをバインドする。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """サーバースパンを開始してリクエストを処理します。
+
+        Args:
+            scope (Scope): ASGIのスコープ。
+            receive (Receive): ASGIのreceive関数。
+            send (Send): ASGIのsend関数。
+
+        """
+        if scope["type"] != "http" or not setting.TRACING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        trace_id, parent_span_id = parse_traceparent(Headers(scope=scope).get("traceparent")) or ("", "")
+        server_span = start_span(f"HTTP {scope['method']}", SPAN_KIND_SERVER, trace_id=trace_id, parent_span_id=parent_span_id)
+        server_span.attributes.update({"http.method": scope["method"], "http.target": scope["path"]})
+        token = activate_span(server_span)
+        structlog.contextvars.bind_contextvars(trace_id=server_span.trace_id)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                server_span.set_attribute("http.status_code", message["status"])
+                if message["status"] >= 500:
+                    server_span.set_error(f"HTTP {message['status']}")
+                MutableHeaders(scope=message)["traceparent"] = format_traceparent(server_span)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as exc:
+            server_span.record_error(exc)
+            raise
+        finally:
+            # ルーティング後はルートテンプレートでスパン名を確定する
+            route = getattr(scope.get("route"), "path", None)
+            if route:
+                server_span.name = f"HTTP {scope['method']} {route}"
+                server_span.set_attribute("http.route", route)
+            token.var.reset(token)
+            structlog.contextvars.unbind_contextvars("trace_id")
+            end_span(server_span)
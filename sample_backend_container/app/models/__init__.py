@@ -8,6 +8,7 @@ from .group_search_history import GroupSearchHistory
 from .report import Report
 from .report_comment_history import ReportCommentHistory
 from .report_evaluation_history import ReportEvaluationHistory
+from .report_render_cache import ReportRenderCache
 from .report_supplement import ReportSupplement
 from .report_tag import ReportTag
 from .report_tag_link import ReportTagLink
@@ -47,5 +48,6 @@ __all__ = [
     "user_view_history",
     "user_search_history",
     "group_search_history",
+    "report_render_cache",
     # "OtherModel"  # 他のモデルを追加する場合もここに名前を追加
 ]
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import TIMESTAMP, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.common.common import datetime_now
+from app.database import Base
+
+
+# ReportRenderCacheモデル: レポート本文の変換結果のキャッシュテーブル
+class ReportRenderCache(Base):
+    """ReportRenderCacheモデル: レポート本文の変換結果のキャッシュテーブル
+
+    本文の内容ごとに1行とし、同じ内容のレポートや更新前の版でも共有する。
+    """
+
+    __tablename__ = "report_render_cache"
+
+    # コンテンツハッシュ - 本文・フォーマット・変換処理のバージョンのSHA-256（app.core.render.content_hash）
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True, comment="コンテンツハッシュ (SHA-256)")
+
+    # 変換結果 - サニタイズ済みのHTML
+    html: Mapped[str] = mapped_column(Text, nullable=False, comment="変換結果 (サニタイズ済みのHTML)")
+
+    # 作成日時
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP, default=datetime_now(), comment="作成日時")
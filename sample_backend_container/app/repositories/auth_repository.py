@@ -1,13 +1,24 @@
+from sqlalchemy import bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.core.tracing import traced
 from app.models.user import User
 
+# NOTE: ホットパスのクエリはモジュールの読み込み時に一度だけ構築し、値はbindparamで実行時に渡す。
+#       同じオブジェクトを使い回すことで、クエリの構築とSQLAlchemyのキャッシュキーの生成が初回のみとなる。
+SELECT_ACTIVE_USER_BY_EMAIL = select(User).where(
+    User.email == bindparam("email"),
+    User.user_status == User.STATUS_ACTIVE,
+    User.deleted_at.is_(None),
+)
+
 
 class UserRepository:
     """ユーザー関連のデータベース操作を担当するリポジトリクラス。"""
 
     @staticmethod
+    @traced()
     async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
         """メールアドレスに基づいてユーザーを取得します。
 
@@ -19,15 +30,11 @@ class UserRepository:
             User | None: 該当するユーザーが存在すれば返却、それ以外はNone。
 
         """
-        query = select(User).where(
-            User.email == email,
-            User.user_status == User.STATUS_ACTIVE,
-            User.deleted_at.is_(None),
-        )
-        result = await db.execute(query)
+        result = await db.execute(SELECT_ACTIVE_USER_BY_EMAIL, {"email": email})
         return result.scalars().first()
 
     @staticmethod
+    @traced()
     async def create_user(db: AsyncSession, user: User) -> User:
         """新しいユーザーをデータベースに登録します。
 
@@ -41,10 +48,10 @@ class UserRepository:
         """
         db.add(user)
         await db.commit()
-        await db.refresh(user)
         return user
 
     @staticmethod
+    @traced()
     async def update_user_password(db: AsyncSession, user: User, hashed_password: str) -> User:
         """ユーザーのパスワードを更新します。
 
@@ -59,7 +66,6 @@ class UserRepository:
         """
         user.hashed_password = hashed_password
         await db.commit()
-        await db.refresh(user)
         return user
 
 
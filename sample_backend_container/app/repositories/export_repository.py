@@ -0,0 +1,107 @@
+from collections.abc import AsyncIterator
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.report import Report
+from app.models.report_evaluation_history import ReportEvaluationHistory
+from app.models.report_view_history import ReportViewHistory
+
+
+class ExportRepository:
+    """ユーザーデータのエクスポートに関するデータベース操作を担当するリポジトリクラス。
+
+    ORMオブジェクトを生成せず、必要なカラムのみをサーバーサイドカーソルで読み出す。
+    """
+
+    @staticmethod
+    def reports_statement(user_id: UUID) -> Select:
+        """ユーザーが作成したレポートを取得するクエリを生成します。
+
+        Args:
+            user_id (UUID): 対象ユーザーのID。
+
+        Returns:
+            Select: 未削除のレポートを作成日時順に取得するクエリ。
+
+        """
+        return (
+            select(
+                Report.report_id,
+                Report.title,
+                Report.content,
+                Report.format,
+                Report.visibility,
+                Report.created_at,
+                Report.updated_at,
+            )
+            .where(Report.user_id == user_id, Report.deleted_at.is_(None))
+            .order_by(Report.created_at, Report.report_id)
+        )
+
+    @staticmethod
+    def view_history_statement(user_id: UUID) -> Select:
+        """ユーザーのレポート閲覧履歴を取得するクエリを生成します。
+
+        Args:
+            user_id (UUID): 対象ユーザーのID。
+
+        Returns:
+            Select: 未削除の閲覧履歴を履歴ID順に取得するクエリ。
+
+        """
+        return (
+            select(
+                ReportViewHistory.history_id,
+                ReportViewHistory.report_id,
+                ReportViewHistory.view_date,
+                ReportViewHistory.created_at,
+            )
+            .where(ReportViewHistory.user_id == user_id, ReportViewHistory.deleted_at.is_(None))
+            .order_by(ReportViewHistory.history_id)
+        )
+
+    @staticmethod
+    def evaluation_history_statement(user_id: UUID) -> Select:
+        """ユーザーのレポート評価履歴を取得するクエリを生成します。
+
+        Args:
+            user_id (UUID): 対象ユーザーのID。
+
+        Returns:
+            Select: 未削除の評価履歴を履歴ID順に取得するクエリ。
+
+        """
+        return (
+            select(
+                ReportEvaluationHistory.evaluation_history_id,
+                ReportEvaluationHistory.report_id,
+                ReportEvaluationHistory.score,
+                ReportEvaluationHistory.created_at,
+            )
+            .where(ReportEvaluationHistory.user_id == user_id, ReportEvaluationHistory.deleted_at.is_(None))
+            .order_by(ReportEvaluationHistory.evaluation_history_id)
+        )
+
+    @staticmethod
+    async def stream_rows(db: AsyncSession, stmt: Select, yield_per: int) -> AsyncIterator[Row[Any]]:
+        """サーバーサイドカーソルを使用してクエリ結果を1行ずつ返却します。
+
+        `yield_per`件ずつカーソルからフェッチするため、結果件数に関わらずメモリ使用量は一定です。
+
+        Args:
+            db (AsyncSession): データベースセッション。
+            stmt (Select): 実行するクエリ。
+            yield_per (int): 1回のフェッチで取得する行数。
+
+        Yields:
+            Row: クエリ結果の行。
+
+        """
+        result = await db.stream(stmt.execution_options(yield_per=yield_per))
+        async for row in result:
+            yield row
@@ -0,0 +1,106 @@
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY, INTEGER
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.tracing import traced
+
+# 一括インポート用のステージングテーブル。トランザクション終了時に自動で削除される。
+STAGING_TABLE = "report_import_staging"
+STAGING_COLUMNS = (
+    "report_id",
+    "user_id",
+    "title",
+    "content",
+    "format",
+    "visibility",
+    "tag_ids",
+    "created_at",
+    "updated_at",
+)
+
+_CREATE_STAGING_SQL = text(f"""
+    CREATE TEMP TABLE {STAGING_TABLE} (
+        report_id uuid NOT NULL,
+        user_id uuid NOT NULL,
+        title varchar(100) NOT NULL,
+        content text,
+        format smallint NOT NULL,
+        visibility smallint NOT NULL,
+        tag_ids integer[] NOT NULL,
+        created_at timestamp NOT NULL,
+        updated_at timestamp NOT NULL
+    ) ON COMMIT DROP
+""")
+
+_MERGE_REPORT_SQL = text(f"""
+    INSERT INTO report (report_id, user_id, title, content, format, visibility, created_at, updated_at)
+    SELECT report_id, user_id, title, content, format, visibility, created_at, updated_at
+    FROM {STAGING_TABLE}
+""")
+
+_MERGE_TAG_LINK_SQL = text(f"""
+    INSERT INTO report_tag_link (report_id, tag_id, created_at, updated_at)
+    SELECT DISTINCT s.report_id, u.tag_id, s.created_at, s.updated_at
+    FROM {STAGING_TABLE} AS s
+    CROSS JOIN LATERAL unnest(s.tag_ids) AS u(tag_id)
+""")
+
+_SELECT_TAG_IDS_SQL = text(
+    "SELECT tag_id FROM report_tag WHERE tag_id = ANY(:tag_ids) AND deleted_at IS NULL",
+).bindparams(bindparam("tag_ids", type_=ARRAY(INTEGER)))
+
+
+class ReportImportRepository:
+    """レポートの一括インポートに関するデータベース操作を担当するリポジトリクラス。
+
+    行データはasyncpgのCOPYでステージングテーブルへ流し込み、1回のINSERT ... SELECTで
+    `report`と`report_tag_link`へマージする。
+    """
+
+    @staticmethod
+    @traced()
+    async def find_existing_tag_ids(db: AsyncSession, tag_ids: set[int]) -> set[int]:
+        """存在する（未削除の）タグIDを取得します。
+
+        Args:
+            db (AsyncSession): データベースセッション。
+            tag_ids (set[int]): 確認対象のタグID。
+
+        Returns:
+            set[int]: 存在するタグIDの集合。
+
+        """
+        if not tag_ids:
+            return set()
+        result = await db.execute(_SELECT_TAG_IDS_SQL, {"tag_ids": sorted(tag_ids)})
+        return set(result.scalars().all())
+
+    @staticmethod
+    @traced()
+    async def load_chunk(db: AsyncSession, records: Sequence[tuple[Any, ...]]) -> int:
+        """1チャンク分のレコードをステージングテーブル経由でマージします。
+
+        呼び出し元のトランザクション内で実行され、コミットは呼び出し元が行います。
+
+        Args:
+            db (AsyncSession): データベースセッション。
+            records (Sequence[tuple]): `STAGING_COLUMNS`の順に並んだレコード。
+
+        Returns:
+            int: `report`に追加した件数。
+
+        """
+        # ステージングテーブルを作成してトランザクションを開始し、同じ接続でCOPYを実行する
+        await db.execute(_CREATE_STAGING_SQL)
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            STAGING_TABLE, records=records, columns=STAGING_COLUMNS,
+        )
+
+        result = await db.execute(_MERGE_REPORT_SQL)
+        await db.execute(_MERGE_TAG_LINK_SQL)
+        return result.rowcount
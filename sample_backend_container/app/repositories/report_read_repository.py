@@ -0,0 +1,146 @@
+from collections.abc import Sequence
+from uuid import UUID
+
+from sqlalchemy import Select, any_, bindparam, or_
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.tracing import traced
+from app.models.report import Report
+from app.schemas.report import ReportRow
+
+# ReportRowのフィールド順に並べた取得カラム
+REPORT_ROW_COLUMNS = (
+    Report.report_id,
+    Report.user_id,
+    Report.title,
+    Report.content,
+    Report.format,
+    Report.visibility,
+    Report.created_at,
+    Report.updated_at,
+    Report.deleted_at,
+)
+
+# NOTE: クエリはモジュールの読み込み時に一度だけ構築し、値はbindparamで実行時に渡す。
+#       リクエストごとのクエリの構築とキャッシュキーの生成を省き、SQL文も常に同一となるためasyncpgのプリペアドステートメントも再利用される。
+_SELECT_ROWS = select(*REPORT_ROW_COLUMNS).where(Report.deleted_at.is_(None))
+_NEWEST_FIRST = (Report.created_at.desc(), Report.report_id)
+
+SELECT_ROW_BY_ID = _SELECT_ROWS.where(Report.report_id == bindparam("report_id"))
+
+SELECT_ROWS_BY_USER = (
+    _SELECT_ROWS
+    .where(Report.user_id == bindparam("user_id"))
+    .order_by(*_NEWEST_FIRST)
+    .limit(bindparam("limit"))
+    .offset(bindparam("offset"))
+)
+
+# 公開レポート、または指定したユーザーが作成したレポート
+_VISIBLE_TO_USER = or_(Report.visibility == Report.VISIBILITY_PUBLIC, Report.user_id == bindparam("user_id"))
+
+# IN句は件数ごとに異なるSQL文となるため、配列を1つのパラメーターとして渡す「= ANY」を使用する
+SELECT_ROWS_BY_IDS = _SELECT_ROWS.where(
+    Report.report_id == any_(bindparam("report_ids", type_=ARRAY(PG_UUID(as_uuid=True)))),
+    _VISIBLE_TO_USER,
+)
+
+SEARCH_ROWS = (
+    _SELECT_ROWS
+    .where(
+        Report.title.ilike(bindparam("pattern"), escape="\\"),
+        _VISIBLE_TO_USER,
+    )
+    .order_by(*_NEWEST_FIRST)
+    .limit(bindparam("limit"))
+    .offset(bindparam("offset"))
+)
+
+
+class ReportReadRepository:
+    """レポートの読み取り専用のデータベース操作を担当するリポジトリクラス。
+
+    ORMオブジェクトを生成せず、必要なカラムのみを取得してReportRowに格納する。
+    セッションのアイデンティティマップに登録されず、変更追跡や期限切れの処理も発生しない。
+    """
+
+    @staticmethod
+    async def _fetch(db: AsyncSession, stmt: Select, params: dict) -> list[ReportRow]:
+        result = await db.execute(stmt, params)
+        return [ReportRow(*row) for row in result]
+
+    @staticmethod
+    @traced()
+    async def get_report_row(db: AsyncSession, report_id: UUID) -> ReportRow | None:
+        """指定されたIDの未削除のレポートを取得します。
+
+        Args:
+            db (AsyncSession): データベースセッション。
+            report_id (UUID): レポートのID。
+
+        Returns:
+            ReportRow | None: レポート、または該当なしの場合はNone。
+
+        """
+        rows = await ReportReadRepository._fetch(db, SELECT_ROW_BY_ID, {"report_id": report_id})
+        return rows[0] if rows else None
+
+    @staticmethod
+    @traced()
+    async def list_report_rows(db: AsyncSession, user_id: UUID, limit: int, offset: int) -> list[ReportRow]:
+        """ユーザーが作成した未削除のレポートを新しい順に取得します。
+
+        Args:
+            db (AsyncSession): データベースセッション。
+            user_id (UUID): 作成者のユーザーID。
+            limit (int): 取得件数。
+            offset (int): 取得開始位置。
+
+        Returns:
+            list[ReportRow]: レポートのリスト。
+
+        """
+        return await ReportReadRepository._fetch(db, SELECT_ROWS_BY_USER, {"user_id": user_id, "limit": limit, "offset": offset})
+
+    @staticmethod
+    @traced()
+    async def get_report_rows_by_ids(db: AsyncSession, report_ids: Sequence[UUID], user_id: UUID) -> list[ReportRow]:
+        """指定されたIDのうち、公開または指定したユーザーが作成した未削除のレポートを1回のクエリで取得します。
+
+        Args:
+            db (AsyncSession): データベースセッション。
+            report_ids (Sequence[UUID]): レポートIDのリスト。
+            user_id (UUID): 取得するユーザーのID。
+
+        Returns:
+            list[ReportRow]: 見つかったレポートのリスト（report_ids の順）。
+
+        """
+        rows = await ReportReadRepository._fetch(db, SELECT_ROWS_BY_IDS, {"report_ids": list(report_ids), "user_id": user_id})
+        order = {report_id: index for index, report_id in enumerate(report_ids)}
+        rows.sort(key=lambda row: order[row.report_id])
+        return rows
+
+    @staticmethod
+    @traced()
+    async def search_report_rows(db: AsyncSession, keyword: str, user_id: UUID, limit: int, offset: int) -> list[ReportRow]:
+        """タイトルにキーワードを含む、公開または自身が作成した未削除のレポートを新しい順に取得します。
+
+        Args:
+            db (AsyncSession): データベースセッション。
+            keyword (str): 検索キーワード（部分一致、大文字小文字を区別しない）。
+            user_id (UUID): 検索するユーザーのID。
+            limit (int): 取得件数。
+            offset (int): 取得開始位置。
+
+        Returns:
+            list[ReportRow]: レポートのリスト。
+
+        """
+        # LIKEのワイルドカードとして解釈されないようにエスケープする
+        escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params = {"pattern": f"%{escaped}%", "user_id": user_id, "limit": limit, "offset": offset}
+        return await ReportReadRepository._fetch(db, SEARCH_ROWS, params)
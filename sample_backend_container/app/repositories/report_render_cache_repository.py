@@ -0,0 +1,48 @@
+from sqlalchemy import bindparam
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.common.common import datetime_now
+from app.core.tracing import traced
+from app.models.report_render_cache import ReportRenderCache
+
+# コンテンツハッシュで変換結果を取得するクエリ
+SELECT_HTML_BY_HASH = select(ReportRenderCache.html).where(ReportRenderCache.content_hash == bindparam("content_hash"))
+
+# 変換結果を保存するクエリ。他のワーカーが同じ内容を先に保存した場合は何もしない（結果は同一のため）
+INSERT_HTML = insert(ReportRenderCache).on_conflict_do_nothing(index_elements=[ReportRenderCache.content_hash])
+
+
+class ReportRenderCacheRepository:
+    """レポート本文の変換結果のキャッシュに関するデータベース操作を担当するリポジトリクラス。"""
+
+    @staticmethod
+    @traced()
+    async def get_html(db: AsyncSession, content_hash: str) -> str | None:
+        """コンテンツハッシュに対応する変換結果を取得します。
+
+        Args:
+            db (AsyncSession): データベースセッション。
+            content_hash (str): コンテンツハッシュ。
+
+        Returns:
+            str | None: 変換結果のHTML、または未保存の場合はNone。
+
+        """
+        result = await db.execute(SELECT_HTML_BY_HASH, {"content_hash": content_hash})
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    @traced()
+    async def save_html(db: AsyncSession, content_hash: str, html: str) -> None:
+        """変換結果を保存します。保存済みの場合は何もしません。
+
+        Args:
+            db (AsyncSession): データベースセッション。
+            content_hash (str): コンテンツハッシュ。
+            html (str): 変換結果のHTML。
+
+        """
+        await db.execute(INSERT_HTML, {"content_hash": content_hash, "html": html, "created_at": datetime_now()})
+        await db.commit()
@@ -1,16 +1,22 @@
 from uuid import UUID
 
+from sqlalchemy import bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.common.common import datetime_now
+from app.core.tracing import traced
 from app.models.report import Report
 
+# 未削除のレポートをIDで取得するクエリ（モジュールの読み込み時に一度だけ構築する）
+SELECT_REPORT_BY_ID = select(Report).where(Report.report_id == bindparam("report_id"), Report.deleted_at.is_(None))
+
 
 class ReportRepository:
     """レポートに関連するデータベース操作を担当するリポジトリクラス。"""
 
     @staticmethod
+    @traced()
     async def create_report(db: AsyncSession, report: Report) -> Report:
         """レポートをデータベースに追加します。
 
@@ -24,10 +30,10 @@ class ReportRepository:
         """
         db.add(report)
         await db.commit()
-        await db.refresh(report)
         return report
 
     @staticmethod
+    @traced()
     async def get_report_by_id(db: AsyncSession, report_id: UUID) -> Report | None:
         """指定されたIDのレポートを取得します。
 
@@ -41,14 +47,11 @@ class ReportRepository:
             Report | None: レポートオブジェクト、または該当なしの場合はNone。
 
         """
-        stmt = (
-            select(Report)
-            .where(Report.report_id == report_id, Report.deleted_at.is_(None))
-        )
-        result = await db.execute(stmt)
+        result = await db.execute(SELECT_REPORT_BY_ID, {"report_id": report_id})
         return result.scalars().first()
 
     @staticmethod
+    @traced()
     async def update_report(db: AsyncSession, report: Report) -> Report:
         """指定されたレポートを更新します。
 
@@ -62,11 +65,7 @@ class ReportRepository:
             Report | None: 更新後のレポートオブジェクト、または該当なしの場合はNone。
 
         """
-        stmt = (
-            select(Report)
-            .where(Report.report_id == report.report_id, Report.deleted_at.is_(None))
-        )
-        result = await db.execute(stmt)
+        result = await db.execute(SELECT_REPORT_BY_ID, {"report_id": report.report_id})
         existing_report = result.scalars().one()
 
         # 更新内容を適用
@@ -76,10 +75,10 @@ class ReportRepository:
         existing_report.visibility = report.visibility
 
         await db.commit()
-        await db.refresh(existing_report)
         return existing_report
 
     @staticmethod
+    @traced()
     async def delete_report(db: AsyncSession, report: Report) -> None:
         """指定されたレポートを論理削除します。
 
@@ -92,9 +91,9 @@ class ReportRepository:
         """
         report.deleted_at = datetime_now()
         await db.commit()
-        await db.refresh(report)
 
     @staticmethod
+    @traced()
     async def fetch_report_for_update(db: AsyncSession, report_id: UUID) -> Report | None:
         """更新用にレポートを取得します。
 
@@ -108,6 +107,5 @@ class ReportRepository:
             Report | None: レポートオブジェクト、または該当なしの場合はNone。
 
         """
-        stmt = select(Report).where(Report.report_id == report_id, Report.deleted_at.is_(None))
-        result = await db.execute(stmt)
+        result = await db.execute(SELECT_REPORT_BY_ID, {"report_id": report_id})
         return result.scalar_one_or_none()
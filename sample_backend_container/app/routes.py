@@ -1,14 +1,19 @@
 from fastapi import APIRouter
 
 from app.config.setting import setting
+from app.controllers.admin_controller import router as admin_router
 from app.controllers.auth_controller import router as auth_router
-from app.controllers.dev_controller import router as dev_router
+from app.controllers.export_controller import router as export_router
+from app.controllers.metrics_controller import router as metrics_router
 from app.controllers.report_controller import router as report_router
 
 router = APIRouter()
 
 if setting.DEV_MODE:
     # 開発用のルーター定義
+    # NOTE: シーダー経由で全モデルとテストデータの生成処理を読み込むため、開発時のみインポートする
+    from app.controllers.dev_controller import router as dev_router
+
     router.include_router(dev_router, prefix="/dev",  tags=["dev"])
 
 # レポート用のルーター定義
@@ -16,3 +21,12 @@ router.include_router(report_router, prefix="/report",  tags=["report"])
 
 # 認証用のルーター
 router.include_router(auth_router, prefix="/auth", tags=["auth"])
+
+# エクスポート用のルーター
+router.include_router(export_router, prefix="/export", tags=["export"])
+
+# メトリクス用のルーター
+router.include_router(metrics_router, prefix="/metrics", tags=["metrics"])
+
+# 管理者用のルーター
+router.include_router(admin_router, prefix="/admin", tags=["admin"])
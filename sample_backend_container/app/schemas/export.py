@@ -0,0 +1,19 @@
+from enum import Enum
+
+
+class ExportFormat(str, Enum):
+    """エクスポートの出力形式。
+    """
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ExportTarget(str, Enum):
+    """エクスポート対象のデータ種別。
+    """
+
+    ALL = "all"
+    REPORTS = "reports"
+    VIEW_HISTORY = "view_history"
+    EVALUATION_HISTORY = "evaluation_history"
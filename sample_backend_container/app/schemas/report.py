@@ -1,7 +1,12 @@
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Annotated, Literal
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+# PostgreSQLのinteger型の最大値（タグIDの上限）
+INT4_MAX = 2**31 - 1
 
 
 class ReportBase(BaseModel):
@@ -32,3 +37,70 @@ class ResponseReport(ReportBase):
     deleted_at: datetime | None = Field(None, description="削除日時")
 
     model_config = ConfigDict(from_attributes = True)
+
+class ImportReport(RequestReport):
+    """一括インポート時の1行分のリクエストデータを表すモデル。
+    """
+
+    title: str = Field(..., max_length=100, description="レポートのタイトル (100文字以内)")
+    format: Literal[1, 2] = Field(1, description="フォーマット (1: md, 2: html)")
+    visibility: Literal[1, 2, 3] = Field(3, description="公開設定 (1: public, 2: group, 3: private)")
+    tag_ids: list[Annotated[int, Field(ge=1, le=INT4_MAX)]] = Field(default_factory=list, description="紐付けるタグIDのリスト")
+
+    @field_validator("title", "content")
+    @classmethod
+    def reject_nul(cls, value: str | None) -> str | None:
+        """PostgreSQLのtext型に格納できないNUL文字を含む値を拒否します。
+        """
+        if value is not None and "\x00" in value:
+            raise ValueError("NUL character (\\x00) is not allowed")
+        return value
+
+class ImportRowError(BaseModel):
+    """一括インポートで取り込めなかった行のエラー情報を表すモデル。
+    """
+
+    line: int = Field(..., description="NDJSONの行番号 (1始まり)")
+    message: str = Field(..., description="エラー内容")
+
+class ResponseReportImport(BaseModel):
+    """一括インポート結果のレスポンスデータを表すモデル。
+    """
+
+    imported: int = Field(..., description="取り込みに成功した件数")
+    failed: int = Field(..., description="取り込みに失敗した件数")
+    errors: list[ImportRowError] = Field(default_factory=list, description="行ごとのエラー (上限件数まで)")
+
+class ResponseRenderedReport(BaseModel):
+    """本文をサニタイズ済みのHTMLへ変換したレポートのレスポンスデータを表すモデル。
+    """
+
+    report_id: UUID = Field(..., description="レポートの一意な識別子")
+    title: str = Field(..., description="レポートのタイトル")
+    format: int = Field(..., description="変換元のフォーマット (1: md, 2: html)")
+    content_hash: str = Field(..., description="変換元の本文のハッシュ (本文が変わらない間は同じ値)")
+    html: str = Field(..., description="サニタイズ済みのHTML")
+
+class RequestReportBatch(BaseModel):
+    """複数のレポートをIDで一括取得する際のリクエストデータを表すモデル。
+    """
+
+    report_ids: list[UUID] = Field(..., min_length=1, max_length=100, description="取得するレポートIDのリスト (100件以内)")
+
+@dataclass(slots=True)
+class ReportRow:
+    """読み取り専用のクエリで取得したレポート1行分のデータ。
+
+    ORMオブジェクトやPydanticモデルを生成せずにカラムの値のみを保持し、FastJSONResponseでそのままシリアライズする。
+    フィールドはResponseReportと同じ（APIドキュメントにはResponseReportを使用する）。
+    """
+
+    report_id: UUID
+    user_id: UUID
+    title: str
+    content: str | None
+    format: int
+    visibility: int
+    created_at: datetime
+    updated_at: datetime
+    deleted_at: datetime | None
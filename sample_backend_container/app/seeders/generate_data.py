@@ -0,0 +1,424 @@
+# generate_data.py
+# 負荷試験用の大量データを生成し、COPYで一括投入する。
+# 固定データのseed_data.pyと異なり、スケール係数に応じた件数と現実的な分布のデータを生成する。
+# 実行コマンド:
+# export PYTHONPATH=/app
+# poetry run python app/seeders/generate_data.py --scale 1 --workers 4
+#
+# --scale 1 でユーザー1,000件、レポート10,000件、履歴100,000件を生成する。
+# --scale 1000 でユーザー100万件、レポート1,000万件、履歴1億件となる。
+
+import argparse
+import asyncio
+import os
+import random
+import time
+import uuid
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+import asyncpg  # type: ignore
+from passlib.context import CryptContext  # type: ignore
+from sqlalchemy.engine import make_url
+
+from app.config.test_data import TestData
+from app.database import get_database_url
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# スケール係数1あたりの件数
+USERS_PER_SCALE = 1_000
+REPORTS_PER_SCALE = 10_000
+HISTORIES_PER_SCALE = 100_000
+
+# 履歴の内訳（割合）
+REPORT_VIEW_RATIO = 0.8
+REPORT_EVALUATION_RATIO = 0.1
+USER_VIEW_RATIO = 0.1
+
+# 1ワーカーが1回に担当する行数
+PARTITION_SIZE = 200_000
+
+# 分布のパラメータ（Zipfの指数）。値が大きいほど上位に偏る。
+AUTHOR_ZIPF_S = 1.1
+VIEW_ZIPF_S = 1.2
+TAG_ZIPF_S = 1.3
+
+# データの期間（日数）
+DATA_PERIOD_DAYS = 365
+
+# UUIDの種別（上位ビットに埋め込み、インデックスから一意に決まるUUIDを生成する）
+KIND_USER = 1
+KIND_REPORT = 2
+
+JA_WORDS = (
+    "設計", "実装", "テスト", "運用", "性能", "改善", "データベース", "インデックス", "キャッシュ", "非同期",
+    "並列処理", "認証", "セキュリティ", "ログ", "監視", "障害", "対応", "レビュー", "リファクタリング", "移行",
+    "クラウド", "コンテナ", "ネットワーク", "アルゴリズム", "型チェック", "静的解析", "自動化", "デプロイ", "負荷試験", "計測",
+)
+JA_PARTICLES = ("の", "と", "を", "で", "における", "による", "について", "から見た")
+JA_ENDINGS = ("しました。", "を検討します。", "が重要です。", "について整理します。", "の手順をまとめます。", "で注意すべき点があります。")
+
+CONTENT_FORMATS = (1, 2)
+CONTENT_FORMAT_WEIGHTS = (9, 1)
+VISIBILITIES = (1, 2, 3)
+VISIBILITY_WEIGHTS = (6, 1, 3)
+SCORES = (1, 2, 3, 4, 5)
+SCORE_WEIGHTS = (1, 2, 5, 8, 6)
+
+
+@dataclass(frozen=True)
+class GenerateConfig:
+    """生成するデータの件数とパラメータ。
+    """
+
+    users: int
+    reports: int
+    tags: int
+    report_views: int
+    report_evaluations: int
+    user_views: int
+    password_hashes: tuple[str, ...]
+    seed: int
+    base_time: datetime
+
+    @classmethod
+    def from_scale(cls, scale: float, tags: int, password_hashes: tuple[str, ...], seed: int) -> "GenerateConfig":
+        """スケール係数から件数を求めます。
+
+        履歴とタグの紐付けはユーザー・レポート・タグを参照するため、これらは小さいスケールでも1件以上とします。
+        """
+        histories = int(HISTORIES_PER_SCALE * scale)
+        return cls(
+            users=max(1, int(USERS_PER_SCALE * scale)),
+            reports=max(1, int(REPORTS_PER_SCALE * scale)),
+            tags=max(1, tags),
+            report_views=int(histories * REPORT_VIEW_RATIO),
+            report_evaluations=int(histories * REPORT_EVALUATION_RATIO),
+            user_views=int(histories * USER_VIEW_RATIO),
+            password_hashes=password_hashes,
+            seed=seed,
+            base_time=datetime.now().replace(microsecond=0),
+        )
+
+
+@dataclass(frozen=True)
+class Partition:
+    """ワーカーが担当する生成範囲。
+    """
+
+    table: str
+    start: int
+    end: int
+
+
+def entity_uuid(kind: int, index: int) -> uuid.UUID:
+    """種別とインデックスから一意なUUIDを生成します。
+
+    ワーカー間で参照先のIDを共有せずに外部キーを組み立てるために使用します。
+    """
+    return uuid.UUID(int=(kind << 96) | index, version=4)
+
+
+def zipf_index(rng: random.Random, n: int, s: float) -> int:
+    """べき乗分布（Zipf近似）に従う0始まりのインデックスを返却します。
+
+    連続べき乗分布の逆関数法で求めるため、nに依存するメモリを必要としません。
+
+    Raises:
+        ValueError: nが1未満の場合。
+
+    """
+    if n < 1:
+        raise ValueError(f"n must be at least 1, got {n}")
+    u = rng.random()
+    exponent = 1.0 - s
+    rank = ((n ** exponent - 1.0) * u + 1.0) ** (1.0 / exponent)
+    return min(int(rank) - 1, n - 1)
+
+
+def ja_sentence(rng: random.Random) -> str:
+    """日本語の文を1つ生成します。
+    """
+    words = rng.choices(JA_WORDS, k=rng.randint(2, 4))
+    body = "".join(word + rng.choice(JA_PARTICLES) for word in words[:-1]) + words[-1]
+    return body + rng.choice(JA_ENDINGS)
+
+
+def ja_content(rng: random.Random, content_format: int) -> str:
+    """レポート本文を生成します。段落数は短い記事に偏らせます。
+    """
+    paragraphs = []
+    for _ in range(1 + int(rng.expovariate(0.5))):
+        text = "".join(ja_sentence(rng) for _ in range(rng.randint(1, 5)))
+        if content_format == 1:
+            paragraphs.append(f"## {rng.choice(JA_WORDS)}\n\n{text}")
+        else:
+            paragraphs.append(f"<h2>{rng.choice(JA_WORDS)}</h2><p>{text}</p>")
+    return "\n\n".join(paragraphs)
+
+
+def random_time(rng: random.Random, config: GenerateConfig, after: datetime | None = None) -> datetime:
+    """データ期間内の日時を生成します。afterを指定した場合はそれ以降とします。
+    """
+    start = after or config.base_time - timedelta(days=DATA_PERIOD_DAYS)
+    span = max(1, int((config.base_time - start).total_seconds()))
+    return start + timedelta(seconds=rng.randrange(span))
+
+
+def report_created_at(config: GenerateConfig, index: int) -> datetime:
+    """レポートの作成日時をインデックスから決定的に求めます（履歴の日時の下限に使用）。
+    """
+    offset = int(DATA_PERIOD_DAYS * 86400 * index / max(1, config.reports))
+    return config.base_time - timedelta(days=DATA_PERIOD_DAYS) + timedelta(seconds=offset)
+
+
+def generate_users(rng: random.Random, config: GenerateConfig, start: int, end: int) -> Iterator[tuple[Any, ...]]:
+    for i in range(start, end):
+        created_at = random_time(rng, config)
+        yield (
+            entity_uuid(KIND_USER, i),
+            f"loaduser{i}",
+            f"loaduser{i}@example.com",
+            # パスワードはプールから決定的に割り当てる (user i -> pool[i % len(pool)])
+            config.password_hashes[i % len(config.password_hashes)],
+            rng.choices((1, 2, 3, 4), weights=(5, 70, 24, 1))[0],
+            1 if rng.random() < 0.98 else 2,
+            created_at,
+            created_at,
+        )
+
+
+def generate_tags(rng: random.Random, config: GenerateConfig, start: int, end: int) -> Iterator[tuple[Any, ...]]:
+    now = config.base_time
+    for i in range(start, end):
+        yield (i + 1, f"{JA_WORDS[i % len(JA_WORDS)]}{i // len(JA_WORDS) or ''}", now, now)
+
+
+def generate_reports(rng: random.Random, config: GenerateConfig, start: int, end: int) -> Iterator[tuple[Any, ...]]:
+    for i in range(start, end):
+        content_format = rng.choices(CONTENT_FORMATS, weights=CONTENT_FORMAT_WEIGHTS)[0]
+        created_at = report_created_at(config, i)
+        yield (
+            entity_uuid(KIND_REPORT, i),
+            entity_uuid(KIND_USER, zipf_index(rng, config.users, AUTHOR_ZIPF_S)),
+            ja_sentence(rng)[:100],
+            ja_content(rng, content_format),
+            content_format,
+            rng.choices(VISIBILITIES, weights=VISIBILITY_WEIGHTS)[0],
+            created_at,
+            created_at,
+        )
+
+
+def generate_tag_links(rng: random.Random, config: GenerateConfig, start: int, end: int) -> Iterator[tuple[Any, ...]]:
+    for i in range(start, end):
+        created_at = report_created_at(config, i)
+        tag_ids = {zipf_index(rng, config.tags, TAG_ZIPF_S) + 1 for _ in range(rng.choices((0, 1, 2, 3, 5), weights=(2, 4, 3, 2, 1))[0])}
+        for tag_id in tag_ids:
+            yield (entity_uuid(KIND_REPORT, i), tag_id, created_at, created_at)
+
+
+def generate_report_views(rng: random.Random, config: GenerateConfig, start: int, end: int) -> Iterator[tuple[Any, ...]]:
+    for _ in range(start, end):
+        report_index = zipf_index(rng, config.reports, VIEW_ZIPF_S)
+        view_date = random_time(rng, config, after=report_created_at(config, report_index))
+        yield (entity_uuid(KIND_USER, rng.randrange(config.users)), entity_uuid(KIND_REPORT, report_index), view_date, view_date, view_date)
+
+
+def generate_report_evaluations(rng: random.Random, config: GenerateConfig, start: int, end: int) -> Iterator[tuple[Any, ...]]:
+    for _ in range(start, end):
+        report_index = zipf_index(rng, config.reports, VIEW_ZIPF_S)
+        created_at = random_time(rng, config, after=report_created_at(config, report_index))
+        yield (
+            entity_uuid(KIND_REPORT, report_index),
+            entity_uuid(KIND_USER, rng.randrange(config.users)),
+            rng.choices(SCORES, weights=SCORE_WEIGHTS)[0],
+            created_at,
+            created_at,
+        )
+
+
+def generate_user_views(rng: random.Random, config: GenerateConfig, start: int, end: int) -> Iterator[tuple[Any, ...]]:
+    for _ in range(start, end):
+        view_date = random_time(rng, config)
+        yield (
+            entity_uuid(KIND_USER, rng.randrange(config.users)),
+            entity_uuid(KIND_USER, zipf_index(rng, config.users, AUTHOR_ZIPF_S)),
+            view_date,
+            view_date,
+            view_date,
+        )
+
+
+# テーブルごとのカラムと生成関数。投入は外部キーの依存順にフェーズを分けて行う。
+TABLES: dict[str, tuple[tuple[str, ...], Any]] = {
+    "user": (("user_id", "username", "email", "hashed_password", "user_role", "user_status", "created_at", "updated_at"), generate_users),
+    "report_tag": (("tag_id", "tag_name", "created_at", "updated_at"), generate_tags),
+    "report": (("report_id", "user_id", "title", "content", "format", "visibility", "created_at", "updated_at"), generate_reports),
+    "report_tag_link": (("report_id", "tag_id", "created_at", "updated_at"), generate_tag_links),
+    "report_view_history": (("user_id", "report_id", "view_date", "created_at", "updated_at"), generate_report_views),
+    "report_evaluation_history": (("report_id", "user_id", "score", "created_at", "updated_at"), generate_report_evaluations),
+    "user_view_history": (("user_id", "target_id", "view_date", "created_at", "updated_at"), generate_user_views),
+}
+PHASES: tuple[tuple[str, ...], ...] = (
+    ("user", "report_tag"),
+    ("report",),
+    ("report_tag_link", "report_view_history", "report_evaluation_history", "user_view_history"),
+)
+
+
+def table_row_count(config: GenerateConfig, table: str) -> int:
+    """テーブルごとの生成単位の件数を返却します（report_tag_linkはレポート単位）。
+    """
+    return {
+        "user": config.users,
+        "report_tag": config.tags,
+        "report": config.reports,
+        "report_tag_link": config.reports,
+        "report_view_history": config.report_views,
+        "report_evaluation_history": config.report_evaluations,
+        "user_view_history": config.user_views,
+    }[table]
+
+
+def asyncpg_dsn() -> str:
+    """SQLAlchemy形式の接続URLをasyncpg用のDSNに変換します。
+    """
+    return make_url(get_database_url()).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+async def _copy_partition(dsn: str, config: GenerateConfig, partition: Partition) -> int:
+    columns, generator = TABLES[partition.table]
+    rng = random.Random(f"{config.seed}:{partition.table}:{partition.start}")
+    connection = await asyncpg.connect(dsn)
+    try:
+        # 生成データは再投入できるため、コミット待ちを省略して投入を高速化する
+        await connection.execute("SET synchronous_commit = off")
+        result = await connection.copy_records_to_table(
+            partition.table, records=generator(rng, config, partition.start, partition.end), columns=columns,
+        )
+        # 結果は "COPY <件数>" 形式
+        return int(result.split()[-1])
+    finally:
+        await connection.close()
+
+
+def run_partition(dsn: str, config: GenerateConfig, partition: Partition) -> tuple[str, int]:
+    """ワーカープロセスで1パーティション分のデータを生成・投入します。
+    """
+    return partition.table, asyncio.run(_copy_partition(dsn, config, partition))
+
+
+def hash_password_pool(size: int) -> tuple[str, ...]:
+    """パスワードのプールを1回だけハッシュ化します。
+
+    ユーザーごとにbcryptを実行すると件数に比例して時間がかかるため、少数のハッシュを使い回します。
+    先頭はテストデータと同じパスワードとし、以降は`password{n}`とします。
+    """
+    passwords = [TestData.TEST_USER_PASSWORD] + [f"password{n}" for n in range(1, size)]
+    return tuple(pwd_context.hash(password) for password in passwords)
+
+
+async def find_conflicts(dsn: str, config: GenerateConfig) -> list[str]:
+    """生成するデータと主キー・ユニークキーが重複する既存データがあるテーブル名を返却します。
+
+    IDはインデックスから決定的に生成するため、既存のデータ（前回の生成結果やシードデータ）があると投入の途中で失敗します。
+    """
+    connection = await asyncpg.connect(dsn)
+    try:
+        checks = {
+            "user": ('SELECT EXISTS (SELECT 1 FROM "user" WHERE user_id = $1 OR username = $2)', entity_uuid(KIND_USER, 0), "loaduser0"),
+            "report_tag": ("SELECT EXISTS (SELECT 1 FROM report_tag WHERE tag_id <= $1)", config.tags),
+            "report": ("SELECT EXISTS (SELECT 1 FROM report WHERE report_id = $1)", entity_uuid(KIND_REPORT, 0)),
+        }
+        return [table for table, (query, *args) in checks.items() if await connection.fetchval(query, *args)]
+    finally:
+        await connection.close()
+
+
+async def finalize_tables(dsn: str) -> None:
+    """明示的にIDを投入したテーブルのシーケンスを最大値に合わせ、統計情報を更新します。
+    """
+    connection = await asyncpg.connect(dsn)
+    try:
+        await connection.execute(
+            "SELECT setval(pg_get_serial_sequence('report_tag', 'tag_id'), COALESCE((SELECT MAX(tag_id) FROM report_tag), 1))",
+        )
+        for table in TABLES:
+            await connection.execute(f'ANALYZE "{table}"')
+    finally:
+        await connection.close()
+
+
+def generate(config: GenerateConfig, workers: int) -> None:
+    """フェーズごとにパーティションを並列ワーカーへ割り当ててデータを投入します。
+
+    Args:
+        config (GenerateConfig): 生成するデータの件数とパラメータ。
+        workers (int): 並列ワーカー数。
+
+    """
+    dsn = asyncpg_dsn()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for phase in PHASES:
+            started = time.perf_counter()
+            partitions = [
+                Partition(table, start, min(start + PARTITION_SIZE, table_row_count(config, table)))
+                for table in phase
+                for start in range(0, table_row_count(config, table), PARTITION_SIZE)
+            ]
+            totals: dict[str, int] = dict.fromkeys(phase, 0)
+            for table, count in executor.map(run_partition, [dsn] * len(partitions), [config] * len(partitions), partitions):
+                totals[table] += count
+            elapsed = time.perf_counter() - started
+            for table, count in totals.items():
+                print(f"{table}: {count:,} rows")
+            print(f"phase {phase} completed in {elapsed:.1f}s ({sum(totals.values()) / max(elapsed, 1e-9):,.0f} rows/s)")
+    asyncio.run(finalize_tables(dsn))
+
+
+def _positive(value_type: type[int] | type[float]):
+    """0より大きい値のみを受け付けるargparseの型変換関数を返却します。
+    """
+    def convert(value: str) -> int | float:
+        converted = value_type(value)
+        if converted <= 0:
+            raise argparse.ArgumentTypeError(f"must be greater than 0: {value}")
+        return converted
+
+    return convert
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic load-test data.")
+    parser.add_argument("--scale", type=_positive(float), default=1.0, help="Scale factor (1 = 1k users, 10k reports, 100k histories)")
+    parser.add_argument("--workers", type=_positive(int), default=os.cpu_count() or 1, help="Number of parallel worker processes")
+    parser.add_argument("--tags", type=_positive(int), default=1000, help="Number of tags")
+    parser.add_argument("--password-pool", type=_positive(int), default=8, help="Number of distinct passwords to hash")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--clear", action="store_true", help="Clear all database data before generating")
+    args = parser.parse_args()
+
+    if args.clear:
+        from app.seeders.seed_data import clear_data
+
+        print("Clearing database...")
+        asyncio.run(clear_data())
+    else:
+        conflicts = asyncio.run(find_conflicts(asyncpg_dsn(), GenerateConfig.from_scale(args.scale, args.tags, (), args.seed)))
+        if conflicts:
+            parser.error(f"existing data conflicts with generated IDs in {', '.join(conflicts)} (run with --clear)")
+
+    print(f"Hashing {args.password_pool} passwords...")
+    generate_config = GenerateConfig.from_scale(args.scale, args.tags, hash_password_pool(args.password_pool), args.seed)
+    print(
+        f"Generating users={generate_config.users:,} reports={generate_config.reports:,} "
+        f"histories={generate_config.report_views + generate_config.report_evaluations + generate_config.user_views:,} "
+        f"with {args.workers} workers",
+    )
+    generate(generate_config, args.workers)
+    print("Data generated successfully!")
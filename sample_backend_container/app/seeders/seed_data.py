@@ -5,24 +5,66 @@
 # poetry run python app/seeders/seed_data.py
 
 import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Literal
 
 from passlib.context import CryptContext  # type: ignore
+from sqlalchemy import Table, text
+from sqlalchemy.ext.asyncio import AsyncConnection
 from sqlalchemy.future import select
 
 import app.models
 from app.common.common import datetime_now
 from app.config.test_data import TestData
-from app.database import AsyncSessionLocal, Base, engine
+from app.database import AsyncSessionLocal, Base
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-async def clear_data():
-    """データベースをクリアします。すべてのテーブルを削除し、再作成します。
+# シード済みの状態を保存するスキーマ
+SNAPSHOT_SCHEMA = "reset_snapshot"
+
+ClearMode = Literal["recreate", "truncate"]
+
+
+def _quote(table: Table) -> str:
+    return f'"{table.name}"'
+
+
+def _truncate_statement() -> str:
+    """全テーブルを1回で空にするTRUNCATE文を生成します。
+
+    外部キーの依存関係の逆順（子テーブルから）に並べ、IDのシーケンスもリセットします。
     """
-    async with engine.begin() as conn:
+    tables = ", ".join(_quote(table) for table in reversed(Base.metadata.sorted_tables))
+    return f"TRUNCATE {tables} RESTART IDENTITY CASCADE"
+
+
+@asynccontextmanager
+async def _begin() -> AsyncIterator[AsyncConnection]:
+    """書き込み用セッションのトランザクションを開始し、そのコネクションを返却します。ブロックを抜けるとcommitします。
+    """
+    async with AsyncSessionLocal() as session, session.begin():
+        yield await session.connection()
+
+
+async def clear_data(mode: ClearMode = "recreate"):
+    """データベースをクリアします。
+
+    Args:
+        mode (ClearMode): recreateはすべてのテーブルを削除し、再作成します。
+            truncateはテーブル定義を残したまま1回のTRUNCATEで全データを削除します。
+            DDLやカタログの書き換えが発生しないため、大量データでも短時間で完了します。
+
+    """
+    if mode == "truncate":
+        await truncate_data()
+        return
+
+    async with _begin() as conn:
 
         try:
-            print("データベースURL:", engine.url)  # 接続先DB確認
+            print("データベースURL:", conn.engine.url)  # 接続先DB確認
             print("すべてのテーブルを削除中...")
             await conn.run_sync(Base.metadata.drop_all)  # テーブルを削除
             print("すべてのテーブルを作成中...")
@@ -32,10 +74,70 @@ async def clear_data():
             print(f"データベースクリア中にエラーが発生しました: {e}")
 
 
+async def truncate_data():
+    """すべてのテーブルのデータをTRUNCATEで削除します。未作成のテーブルは作成します。
+    """
+    async with _begin() as conn:
+        print("データベースURL:", conn.engine.url)  # 接続先DB確認
+        await conn.run_sync(Base.metadata.create_all)  # 未作成のテーブルのみ作成
+        print("すべてのテーブルをTRUNCATE中...")
+        await conn.execute(text(_truncate_statement()))
+        print("データベースのクリアが完了しました。")
+
+
+async def snapshot_data():
+    """現在のデータを退避用スキーマへ保存します。シード後の状態を保存し、restore_dataで復元します。
+    """
+    async with _begin() as conn:
+        print(f"スナップショットを作成中... ({SNAPSHOT_SCHEMA})")
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SNAPSHOT_SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SNAPSHOT_SCHEMA}"))
+        for table in Base.metadata.sorted_tables:
+            await conn.execute(text(f"CREATE TABLE {SNAPSHOT_SCHEMA}.{_quote(table)} AS TABLE {_quote(table)}"))
+        print("スナップショットの作成が完了しました。")
+
+
+async def restore_data() -> bool:
+    """snapshot_dataで保存した状態へデータを復元します。
+
+    1トランザクションでTRUNCATEと親テーブルからの再投入を行い、シーケンスを復元後の最大値に合わせます。
+
+    Returns:
+        bool: 復元した場合はTrue、スナップショットが存在しない場合はFalse。
+
+    """
+    async with _begin() as conn:
+        result = await conn.execute(
+            text("SELECT 1 FROM information_schema.schemata WHERE schema_name = :schema"), {"schema": SNAPSHOT_SCHEMA},
+        )
+        if result.scalar() is None:
+            print("スナップショットが存在しません。")
+            return False
+
+        print("スナップショットから復元中...")
+        await conn.execute(text(_truncate_statement()))
+        for table in Base.metadata.sorted_tables:
+            columns = ", ".join(f'"{column.name}"' for column in table.columns)
+            await conn.execute(
+                text(f"INSERT INTO {_quote(table)} ({columns}) SELECT {columns} FROM {SNAPSHOT_SCHEMA}.{_quote(table)}"),
+            )
+            for column in table.primary_key.columns:
+                if column.autoincrement is True:
+                    await conn.execute(
+                        text(
+                            f"SELECT setval(pg_get_serial_sequence(:table, :column), COALESCE(MAX(\"{column.name}\"), 0) + 1, false) "
+                            f"FROM {_quote(table)}",
+                        ),
+                        {"table": _quote(table), "column": column.name},
+                    )
+        print("スナップショットからの復元が完了しました。")
+        return True
+
+
 async def seed_data():
     """テーブルへデータを挿入します。
     """
-    async with AsyncSessionLocal(bind=engine) as session:
+    async with AsyncSessionLocal() as session:
         try:
             # 固定値のUUIDやIDを定義
             user1_id = TestData.TEST_USER_ID_1
@@ -43,6 +145,8 @@ async def seed_data():
             group_id = TestData.TEST_GROUP_ID
             report_id = TestData.TEST_REPORT_ID
             tag_id = 1
+            # bcryptは低速なため、共通のパスワードは1回だけハッシュ化する
+            hashed_password = pwd_context.hash(TestData.TEST_USER_PASSWORD)
 
             # 1. Userテーブル
             result = await session.execute(
@@ -54,7 +158,7 @@ async def seed_data():
                         user_id=TestData.TEST_USER_ID_1,
                         username=TestData.TEST_USERNAME_1,
                         email=TestData.TEST_USER_EMAIL_1,
-                        hashed_password=pwd_context.hash(TestData.TEST_USER_PASSWORD),
+                        hashed_password=hashed_password,
                         contact_number=TestData.TEST_USER_CONTACT_1,
                         user_role=1,
                         user_status=1,
@@ -74,7 +178,7 @@ async def seed_data():
                         user_id=TestData.TEST_USER_ID_2,
                         username=TestData.TEST_USERNAME_2,
                         email=TestData.TEST_USER_EMAIL_2,
-                        hashed_password=pwd_context.hash(TestData.TEST_USER_PASSWORD),
+                        hashed_password=hashed_password,
                         contact_number=TestData.TEST_USER_CONTACT_2,
                         user_role=2,
                         user_status=1,
@@ -425,12 +529,21 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Seed or clear database.")
     parser.add_argument("--clear", action="store_true", help="Clear all database data")
     parser.add_argument("--seed", action="store_true", help="Seed the database with initial data")
+    parser.add_argument("--truncate", action="store_true", help="Clear data with TRUNCATE instead of dropping tables")
+    parser.add_argument("--snapshot", action="store_true", help="Save the current data as a snapshot")
+    parser.add_argument("--restore", action="store_true", help="Restore data from the snapshot")
     args = parser.parse_args()
 
     async def main():
-        if args.clear:
+        if args.snapshot:
+            print("Saving snapshot...")
+            await snapshot_data()
+        elif args.restore:
+            print("Restoring snapshot...")
+            await restore_data()
+        elif args.clear:
             print("Clearing database...")
-            await clear_data()
+            await clear_data("truncate" if args.truncate else "recreate")
         elif args.seed:
             print("Seeding database...")
             await seed_data()
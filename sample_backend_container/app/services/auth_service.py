@@ -4,7 +4,8 @@ from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import decode_access_token, hash_password, oauth2_scheme
-from app.database import get_db
+from app.core.tracing import traced
+from app.database import get_read_db
 from app.models.user import User
 from app.repositories.auth_repository import UserRepository
 from app.schemas.user import UserResponse
@@ -12,8 +13,9 @@ from app.schemas.user import UserResponse
 logger = structlog.get_logger()
 
 
+@traced()
 async def get_current_user(
-    db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_read_db), token: str = Depends(oauth2_scheme),
 ) -> UserResponse:
     """トークンから現在のユーザーを取得します。
 
@@ -48,6 +50,9 @@ async def get_current_user(
 
         # ユーザーをデータベースから取得
         user = await UserRepository.get_user_by_email(db, email)
+        # 書き込み用のセッションを併用するエンドポイントで接続を2本保持し続けないよう、
+        # 読み取りトランザクションを終了して接続をプールへ返却する
+        await db.commit()
         if user is None:
             logger.warning("get_current_user - user not found", email=email)
             raise HTTPException(
@@ -66,6 +71,27 @@ async def get_current_user(
         logger.info("get_current_user - end")
 
 
+@traced()
+async def get_current_admin_user(current_user: UserResponse = Depends(get_current_user)) -> UserResponse:
+    """現在のユーザーが管理者以上の権限を持つことを確認します。
+
+    Args:
+        current_user (UserResponse): 現在のユーザー。
+
+    Returns:
+        UserResponse: 現在のユーザー情報。
+
+    Raises:
+        HTTPException: 403: 管理者権限がない場合。
+
+    """
+    if current_user.user_role < User.ROLE_ADMIN:
+        logger.warning("get_current_admin_user - forbidden", user_id=current_user.user_id, user_role=current_user.user_role)
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required")
+    return current_user
+
+
+@traced()
 async def create_user(
     email: str, username: str, password: str, db: AsyncSession,
 ) -> User:
@@ -119,6 +145,7 @@ async def create_user(
         logger.info("create_user - end")
 
 
+@traced()
 async def reset_password(email: str, new_password: str, db: AsyncSession):
     """パスワードをリセットします。
 
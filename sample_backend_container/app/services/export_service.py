@@ -0,0 +1,192 @@
+import csv
+import io
+import json
+import zlib
+from collections.abc import AsyncIterator, Callable
+from datetime import date, datetime
+from typing import Any
+from uuid import UUID
+
+import structlog
+from fastapi import HTTPException, status
+from sqlalchemy import Select, text
+
+from app.config.setting import setting
+from app.database import AsyncSessionLocal
+from app.repositories.export_repository import ExportRepository
+from app.schemas.export import ExportFormat, ExportTarget
+
+logger = structlog.get_logger()
+
+# エクスポート対象ごとのクエリ生成関数
+_STATEMENT_BUILDERS: dict[ExportTarget, Callable[[UUID], Select]] = {
+    ExportTarget.REPORTS: ExportRepository.reports_statement,
+    ExportTarget.VIEW_HISTORY: ExportRepository.view_history_statement,
+    ExportTarget.EVALUATION_HISTORY: ExportRepository.evaluation_history_statement,
+}
+
+# 出力形式ごとのメディアタイプと拡張子
+_MEDIA_TYPES: dict[ExportFormat, tuple[str, str]] = {
+    ExportFormat.NDJSON: ("application/x-ndjson", "ndjson"),
+    ExportFormat.CSV: ("text/csv; charset=utf-8", "csv"),
+}
+
+
+def _to_text(value: Any) -> Any:
+    """JSON/CSVに出力できない値を文字列に変換します。
+
+    Args:
+        value (Any): 変換対象の値。
+
+    Returns:
+        Any: 変換後の値。
+
+    """
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def resolve_targets(target: ExportTarget) -> list[ExportTarget]:
+    """エクスポート対象を個別の対象リストに展開します。
+
+    Args:
+        target (ExportTarget): 指定されたエクスポート対象。
+
+    Returns:
+        list[ExportTarget]: 出力順に並べたエクスポート対象のリスト。
+
+    """
+    if target is ExportTarget.ALL:
+        return list(_STATEMENT_BUILDERS)
+    return [target]
+
+
+def export_media_type(export_format: ExportFormat, compress: bool) -> str:
+    """レスポンスのメディアタイプを返却します。
+
+    Args:
+        export_format (ExportFormat): 出力形式。
+        compress (bool): gzip圧縮の有無。
+
+    Returns:
+        str: メディアタイプ。
+
+    """
+    return "application/gzip" if compress else _MEDIA_TYPES[export_format][0]
+
+
+def export_filename(export_format: ExportFormat, target: ExportTarget, compress: bool) -> str:
+    """ダウンロード時のファイル名を返却します。
+
+    Args:
+        export_format (ExportFormat): 出力形式。
+        target (ExportTarget): エクスポート対象。
+        compress (bool): gzip圧縮の有無。
+
+    Returns:
+        str: ファイル名。
+
+    """
+    filename = f"export_{target.value}.{_MEDIA_TYPES[export_format][1]}"
+    return f"{filename}.gz" if compress else filename
+
+
+def validate_export_request(export_format: ExportFormat, target: ExportTarget) -> None:
+    """エクスポート条件の組み合わせを検証します。
+
+    CSVは対象ごとにカラムが異なるため、単一の対象のみ出力できます。
+
+    Args:
+        export_format (ExportFormat): 出力形式。
+        target (ExportTarget): エクスポート対象。
+
+    Raises:
+        HTTPException: CSV形式で全対象を指定した場合。
+
+    """
+    if export_format is ExportFormat.CSV and target is ExportTarget.ALL:
+        logger.warning("validate_export_request - csv requires single target")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CSV export requires a single target",
+        )
+
+
+async def export_user_data(
+    user_id: UUID, export_format: ExportFormat, target: ExportTarget, compress: bool,
+) -> AsyncIterator[bytes]:
+    """ユーザーのレポートと履歴をNDJSONまたはCSVでストリーミング出力します。
+
+    リクエストスコープの`get_db`ではなく専用のセッションを使用し、カーソルを読み切った時点で
+    コネクションをプールへ返却します。また`idle_in_transaction_session_timeout`を設定するため、
+    受信が止まったクライアントがコネクションを保持し続けることはありません。
+
+    Args:
+        user_id (UUID): 対象ユーザーのID。
+        export_format (ExportFormat): 出力形式。
+        target (ExportTarget): エクスポート対象。
+        compress (bool): gzip圧縮の有無。
+
+    Yields:
+        bytes: レスポンスボディのチャンク。
+
+    """
+    logger.info("export_user_data - start", user_id=user_id, export_format=export_format, target=target, compress=compress)
+    # wbits=31でgzip形式のヘッダー・フッターを付与する
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    buffer = bytearray()
+    row_count = 0
+
+    def drain() -> bytes:
+        chunk = bytes(buffer)
+        buffer.clear()
+        return compressor.compress(chunk) if compressor else chunk
+
+    try:
+        async with AsyncSessionLocal() as session:
+            # スナップショットを固定した読み取り専用トランザクションで全対象を出力する
+            await session.execute(text("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY"))
+            await session.execute(text(f"SET LOCAL idle_in_transaction_session_timeout = {int(setting.EXPORT_IDLE_TIMEOUT_MS)}"))
+
+            csv_buffer = io.StringIO()
+            csv_writer = csv.writer(csv_buffer, lineterminator="\n")
+            for export_target in resolve_targets(target):
+                stmt = _STATEMENT_BUILDERS[export_target](user_id)
+                if export_format is ExportFormat.CSV:
+                    csv_writer.writerow(stmt.selected_columns.keys())
+
+                async for row in ExportRepository.stream_rows(session, stmt, setting.EXPORT_YIELD_PER):
+                    if export_format is ExportFormat.CSV:
+                        csv_writer.writerow([_to_text(value) for value in row])
+                        buffer += csv_buffer.getvalue().encode("utf-8")
+                        csv_buffer.seek(0)
+                        csv_buffer.truncate(0)
+                    else:
+                        record = {"record_type": export_target.value}
+                        record.update({key: _to_text(value) for key, value in row._mapping.items()})
+                        buffer += json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                        buffer += b"\n"
+                    row_count += 1
+
+                    if len(buffer) >= setting.EXPORT_CHUNK_BYTES:
+                        chunk = drain()
+                        if chunk:
+                            yield chunk
+
+                if export_format is ExportFormat.CSV and csv_buffer.tell():
+                    buffer += csv_buffer.getvalue().encode("utf-8")
+                    csv_buffer.seek(0)
+                    csv_buffer.truncate(0)
+
+        # セッション終了後に残りのバッファを出力する
+        chunk = drain()
+        if compressor:
+            chunk += compressor.flush()
+        if chunk:
+            yield chunk
+        logger.info("export_user_data - success", user_id=user_id, row_count=row_count)
+    finally:
+        logger.info("export_user_data - end")
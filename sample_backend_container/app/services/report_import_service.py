@@ -0,0 +1,143 @@
+import uuid
+from collections.abc import AsyncIterator
+from typing import Any
+from uuid import UUID
+
+import asyncpg
+import structlog
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.common import datetime_now
+from app.config.setting import setting
+from app.core.tracing import traced
+from app.repositories.report_import_repository import ReportImportRepository
+from app.schemas.report import ImportReport, ImportRowError, ResponseReportImport
+
+logger = structlog.get_logger()
+
+
+class _ImportResult:
+    """インポート結果の集計を保持するクラス。
+    """
+
+    def __init__(self) -> None:
+        self.imported = 0
+        self.failed = 0
+        self.errors: list[ImportRowError] = []
+
+    def add_error(self, line: int, message: str) -> None:
+        """行エラーを記録します。返却するエラーは上限件数までとします。
+        """
+        self.failed += 1
+        if len(self.errors) < setting.IMPORT_MAX_ERRORS:
+            self.errors.append(ImportRowError(line=line, message=message))
+
+    def to_response(self) -> ResponseReportImport:
+        return ResponseReportImport(imported=self.imported, failed=self.failed, errors=self.errors)
+
+
+async def iter_ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, bytes]]:
+    """バイト列のストリームをNDJSONの行に分割します。
+
+    Args:
+        chunks (AsyncIterator[bytes]): リクエストボディのチャンク。
+
+    Yields:
+        tuple[int, bytes]: 行番号（1始まり）と行データ。空行は返却しません。
+
+    """
+    pending = b""
+    line_no = 0
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield line_no, line
+    if pending.strip():
+        yield line_no + 1, pending
+
+
+@traced()
+async def _flush_chunk(db: AsyncSession, chunk: list[tuple[int, ImportReport]], user_id: UUID, result: _ImportResult) -> None:
+    """1チャンク分の行を1トランザクションで取り込みます。
+
+    Args:
+        db (AsyncSession): データベースセッション。
+        chunk (list[tuple[int, ImportReport]]): 行番号と検証済みの行データ。
+        user_id (UUID): レポートの作成者となるユーザーID。
+        result (_ImportResult): インポート結果の集計。
+
+    """
+    requested_tag_ids = {tag_id for _, report in chunk for tag_id in report.tag_ids}
+    try:
+        existing_tag_ids = await ReportImportRepository.find_existing_tag_ids(db, requested_tag_ids)
+
+        now = datetime_now()
+        records: list[tuple[Any, ...]] = []
+        for line_no, report in chunk:
+            unknown_tag_ids = set(report.tag_ids) - existing_tag_ids
+            if unknown_tag_ids:
+                result.add_error(line_no, f"Unknown tag_ids: {sorted(unknown_tag_ids)}")
+                continue
+            records.append((
+                uuid.uuid4(), user_id, report.title, report.content, report.format, report.visibility,
+                report.tag_ids, now, now,
+            ))
+
+        if records:
+            imported = await ReportImportRepository.load_chunk(db, records)
+            await db.commit()
+            result.imported += imported
+        else:
+            await db.rollback()
+    except (SQLAlchemyError, asyncpg.PostgresError) as e:
+        # チャンク単位でロールバックし、対象行すべてをエラーとして記録する
+        # NOTE: COPYはasyncpgを直接呼び出すため、asyncpgの例外（値の範囲外など）はSQLAlchemyの例外に変換されない
+        await db.rollback()
+        logger.error("import_reports - chunk failed", error=str(e), first_line=chunk[0][0], size=len(chunk))
+        for line_no, _ in chunk:
+            result.add_error(line_no, "Database error occurred while importing this chunk")
+
+
+@traced()
+async def import_reports(chunks: AsyncIterator[bytes], user_id: UUID, db: AsyncSession) -> ResponseReportImport:
+    """NDJSON形式のストリームからレポートを一括インポートするサービス関数。
+
+    行は`ImportReport`で検証し、`IMPORT_CHUNK_SIZE`件ごとにCOPYで取り込みます。
+    不正な行はスキップし、行番号付きのエラーとして返却します。
+
+    Args:
+        chunks (AsyncIterator[bytes]): NDJSON形式のボディのチャンク。
+        user_id (UUID): レポートの作成者となるユーザーID。
+        db (AsyncSession): データベースセッション。
+
+    Returns:
+        ResponseReportImport: 取り込み件数と行ごとのエラー。
+
+    """
+    logger.info("import_reports - start", user_id=user_id)
+    result = _ImportResult()
+    chunk: list[tuple[int, ImportReport]] = []
+    try:
+        async for line_no, line in iter_ndjson_lines(chunks):
+            try:
+                chunk.append((line_no, ImportReport.model_validate_json(line)))
+            except ValidationError as e:
+                result.add_error(line_no, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+                continue
+
+            if len(chunk) >= setting.IMPORT_CHUNK_SIZE:
+                await _flush_chunk(db, chunk, user_id, result)
+                chunk = []
+
+        if chunk:
+            await _flush_chunk(db, chunk, user_id, result)
+
+        logger.info("import_reports - success", user_id=user_id, imported=result.imported, failed=result.failed)
+        return result.to_response()
+    finally:
+        logger.info("import_reports - end")
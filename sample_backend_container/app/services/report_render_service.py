@@ -0,0 +1,118 @@
+import asyncio
+import contextvars
+import functools
+import math
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.setting import setting
+from app.core.cache import TTLCache
+from app.core.circuit_breaker import is_unavailable
+from app.core.metrics import record_cache_lookup
+from app.core.render import content_hash, renderer
+from app.core.tracing import traced
+from app.database import AsyncSessionLocal, ReadSessionLocal
+from app.repositories.report_render_cache_repository import ReportRenderCacheRepository
+from app.schemas.report import ResponseRenderedReport
+from app.services.report_service import get_report_by_id_service
+
+logger = structlog.get_logger()
+
+# 変換結果のキャッシュ。キーは本文のハッシュのため、本文が変わらない限り有効とする
+render_cache: TTLCache[str, str] = TTLCache(
+    "report_render",
+    ttl_seconds=math.inf,
+    stale_seconds=0.0,
+    max_entries=setting.RENDER_CACHE_MAX_ENTRIES,
+)
+
+# 変換中の本文のハッシュと変換のタスク。同じ本文への同時のリクエストでは変換を1回のみ行う
+_in_flight: dict[str, asyncio.Task[str]] = {}
+
+
+async def _load_or_render(key: str, content: str, format: int) -> str:
+    """キャッシュテーブルから変換結果を取得し、未保存の場合は変換して保存します。
+
+    DBが利用できない場合も変換結果は返却します（キャッシュテーブルへの保存は行わない）。
+    キャッシュテーブルはリードレプリカではなくプライマリから読み取ります。
+    未保存の場合は同じキーをプライマリへ書き込むため、レプリカの遅延で他のワーカーが保存済みの結果を見落とすと、変換と書き込みが重複します。
+    また、変換はリクエストから独立したタスクで行うため、レプリカの振り分けに使うクライアントの情報もありません。
+    """
+    try:
+        async with ReadSessionLocal() as read_db:
+            html = await ReportRenderCacheRepository.get_html(read_db, key)
+    except Exception as exc:
+        if not is_unavailable(exc):
+            raise
+        logger.warning("_load_or_render - cache table unavailable", content_hash=key, error=type(exc).__name__)
+        return await renderer.render(content, format)
+    record_cache_lookup("report_render_table", html is not None)
+    if html is not None:
+        return html
+
+    html = await renderer.render(content, format)
+    try:
+        async with AsyncSessionLocal() as write_db:
+            await ReportRenderCacheRepository.save_html(write_db, key, html)
+    except Exception as exc:
+        if not is_unavailable(exc):
+            raise
+        logger.warning("_load_or_render - failed to save", content_hash=key, error=type(exc).__name__)
+    return html
+
+
+def _on_rendered(key: str, task: asyncio.Task[str]) -> None:
+    _in_flight.pop(key, None)
+    # NOTE: 待機していたリクエストがすべて取り消された場合も、例外が取得されなかった旨の警告を出さないようここで取得する
+    if not task.cancelled() and task.exception() is None:
+        render_cache.set(key, task.result())
+
+
+def _render_task(key: str, content: str, format: int) -> asyncio.Task[str]:
+    task = _in_flight.get(key)
+    if task is None:
+        # リクエストのセッションやキャンセルに依存しないよう、独立したタスクで変換する
+        # NOTE: 最初に要求したリクエストの期限・SQLの集計・スパンを引き継がないよう、空のコンテキストで実行する
+        #       （引き継ぐと期限切れ後のstatement_timeoutが1msとなり、キャッシュテーブルの読み書きが取り消される）
+        task = asyncio.create_task(_load_or_render(key, content, format), context=contextvars.Context())
+        task.add_done_callback(functools.partial(_on_rendered, key))
+        _in_flight[key] = task
+    return task
+
+
+@traced()
+async def get_rendered_report_service(report_id: str, db: AsyncSession) -> tuple[ResponseRenderedReport, float | None]:
+    """指定されたIDのレポートの本文をサニタイズ済みのHTMLへ変換して返却するサービス関数。
+
+    変換結果は本文のハッシュをキーとして、ワーカーのメモリ（LRU）とキャッシュテーブルに保存するため、
+    同じ内容の本文は1回のみ変換されます。変換はプロセスプールで行い、イベントループを占有しません。
+
+    Args:
+        report_id (str): 取得対象のレポートのID。
+        db (AsyncSession): データベースセッション。
+
+    Returns:
+        tuple[ResponseRenderedReport, float | None]: 変換結果と、レポートのキャッシュの期限切れの値を使用した場合は経過秒数。
+
+    Raises:
+        HTTPException: レポートが見つからない場合。
+
+    """
+    logger.info("get_rendered_report_service - start", report_id=report_id)
+    try:
+        report, stale_age = await get_report_by_id_service(report_id, db)
+        content = report.content or ""
+        key = content_hash(content, report.format)
+
+        html = render_cache.get(key)
+        if html is None:
+            # 変換を待つ間に接続を保持しないよう、セッションを閉じて接続をプールへ返却する（以降このセッションは使用しない）
+            await db.close()
+            # リクエストが取り消されても変換は継続し、結果をキャッシュに保存する
+            html = await asyncio.shield(_render_task(key, content, report.format))
+
+        logger.info("get_rendered_report_service - success", report_id=report_id, content_hash=key)
+        return ResponseRenderedReport(report_id=report.report_id, title=report.title, format=report.format, content_hash=key, html=html), stale_age
+    finally:
+        logger.info("get_rendered_report_service - end")
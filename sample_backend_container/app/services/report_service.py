@@ -4,13 +4,27 @@ import structlog
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.setting import setting
+from app.core.cache import TTLCache
+from app.core.circuit_breaker import is_unavailable
+from app.core.tracing import traced
 from app.models.report import Report
+from app.repositories.report_read_repository import ReportReadRepository
 from app.repositories.report_repository import ReportRepository
-from app.schemas.report import RequestReport, ResponseReport
+from app.schemas.report import ReportRow, RequestReport, ResponseReport
 from app.schemas.user import UserResponse
 
 logger = structlog.get_logger()
 
+# GET /report/{id}の最後に取得できた結果。DBが利用できない間のみ返却する（REPORT_CACHE_TTL_SECONDSを指定した場合は有効期限内も返却する）
+report_cache: TTLCache[UUID, ReportRow] = TTLCache(
+    "report",
+    ttl_seconds=setting.REPORT_CACHE_TTL_SECONDS,
+    stale_seconds=setting.REPORT_CACHE_STALE_SECONDS,
+    max_entries=setting.REPORT_CACHE_MAX_ENTRIES,
+)
+
+@traced()
 async def create_report(report_data: RequestReport, current_user: UserResponse, db: AsyncSession) -> ResponseReport:
     """新しいレポートを作成するサービス関数。
 
@@ -43,6 +57,7 @@ async def create_report(report_data: RequestReport, current_user: UserResponse,
     finally:
         logger.info("create_report - end")
 
+@traced()
 async def update_report(report_id: str, updated_data: RequestReport, db: AsyncSession) -> ResponseReport:
     """レポートを更新するサービス関数。
 
@@ -70,11 +85,13 @@ async def update_report(report_id: str, updated_data: RequestReport, db: AsyncSe
 
     try:
         updated_report = await ReportRepository.update_report(db, report)
+        report_cache.invalidate(report.report_id)
         logger.info("update_report - success", report_id=updated_report.report_id)
         return ResponseReport.model_validate(updated_report)
     finally:
         logger.info("update_report - end")
 
+@traced()
 async def delete_report(report_id: str, db: AsyncSession) -> dict:
     """レポートを論理削除するサービス関数。
 
@@ -98,20 +115,26 @@ async def delete_report(report_id: str, db: AsyncSession) -> dict:
 
     try:
         await ReportRepository.delete_report(db, report)
+        report_cache.invalidate(report.report_id)
         logger.info("delete_report - success", report_id=report.report_id)
         return {"msg": "Report deleted successfully"}
     finally:
         logger.info("delete_report - end")
 
-async def get_report_by_id_service(report_id: str, db: AsyncSession) -> ResponseReport:
+@traced()
+async def get_report_by_id_service(report_id: str, db: AsyncSession) -> tuple[ReportRow, float | None]:
     """指定されたIDのレポートを取得するサービス関数。
 
+    読み取り専用のため、ORMオブジェクトを生成せずにカラムの値のみを取得します。
+    DBが利用できる間は常にDBから取得し（REPORT_CACHE_TTL_SECONDSを指定した場合はその間キャッシュを返却）、
+    DBが利用できない場合（接続の失敗やサーキットブレーカーによる遮断）はREPORT_CACHE_STALE_SECONDSまでの最後に取得できた値を返却します。
+
     Args:
         report_id (str): 取得対象のレポートのID。
         db (AsyncSession): データベースセッション。
 
     Returns:
-        ResponseReport: 取得したレポートのレスポンスモデル。
+        tuple[ReportRow, float | None]: 取得したレポートと、期限切れの値を返却した場合はキャッシュしてからの経過秒数。
 
     Raises:
         HTTPException: レポートが見つからない場合、またはその他のエラーが発生した場合。
@@ -119,13 +142,92 @@ async def get_report_by_id_service(report_id: str, db: AsyncSession) -> Response
     """
     logger.info("get_report_by_id_service - start", report_id=report_id)
 
-    report = await ReportRepository.get_report_by_id(db, UUID(report_id))
-    if not report:
-        logger.warning("get_report_by_id_service - not found", report_id=report_id)
-        raise HTTPException(status_code=404, detail="Report not found")
+    key = UUID(report_id)
+    report = report_cache.get(key)
+    if report is None:
+        try:
+            report = await ReportReadRepository.get_report_row(db, key)
+        except Exception as exc:
+            stale = report_cache.get_stale(key) if is_unavailable(exc) else None
+            if stale is None:
+                raise
+            logger.warning("get_report_by_id_service - serving stale", report_id=report_id, age=stale[1], error=type(exc).__name__)
+            return stale
+        if not report:
+            # 他のワーカーで削除された場合に、DBの障害時に削除前の値を返却しないよう破棄する
+            report_cache.invalidate(key)
+            logger.warning("get_report_by_id_service - not found", report_id=report_id)
+            raise HTTPException(status_code=404, detail="Report not found")
+        report_cache.set(key, report)
 
     try:
         logger.info("get_report_by_id_service - success", report_id=report.report_id)
-        return ResponseReport.model_validate(report)
+        return report, None
     finally:
         logger.info("get_report_by_id_service - end")
+
+@traced()
+async def list_reports_service(user_id: UUID, limit: int, offset: int, db: AsyncSession) -> list[ReportRow]:
+    """ユーザーが作成したレポートの一覧を取得するサービス関数。
+
+    Args:
+        user_id (UUID): 作成者のユーザーID。
+        limit (int): 取得件数。
+        offset (int): 取得開始位置。
+        db (AsyncSession): データベースセッション。
+
+    Returns:
+        list[ReportRow]: レポートのリスト（新しい順）。
+
+    """
+    logger.info("list_reports_service - start", user_id=user_id, limit=limit, offset=offset)
+    try:
+        reports = await ReportReadRepository.list_report_rows(db, user_id, limit, offset)
+        logger.info("list_reports_service - success", count=len(reports))
+        return reports
+    finally:
+        logger.info("list_reports_service - end")
+
+@traced()
+async def get_reports_by_ids_service(report_ids: list[UUID], user_id: UUID, db: AsyncSession) -> list[ReportRow]:
+    """指定されたIDのレポートを一括取得するサービス関数。
+
+    Args:
+        report_ids (list[UUID]): 取得対象のレポートIDのリスト。
+        user_id (UUID): 取得するユーザーのID（公開レポートに加えて自身のレポートも対象とする）。
+        db (AsyncSession): データベースセッション。
+
+    Returns:
+        list[ReportRow]: 見つかったレポートのリスト（存在しないID・閲覧できないレポートは含まれない）。
+
+    """
+    logger.info("get_reports_by_ids_service - start", count=len(report_ids))
+    try:
+        reports = await ReportReadRepository.get_report_rows_by_ids(db, report_ids, user_id)
+        logger.info("get_reports_by_ids_service - success", found=len(reports))
+        return reports
+    finally:
+        logger.info("get_reports_by_ids_service - end")
+
+@traced()
+async def search_reports_service(keyword: str, user_id: UUID, limit: int, offset: int, db: AsyncSession) -> list[ReportRow]:
+    """タイトルでレポートを検索するサービス関数。
+
+    Args:
+        keyword (str): 検索キーワード。
+        user_id (UUID): 検索するユーザーのID（公開レポートに加えて自身のレポートも対象とする）。
+        limit (int): 取得件数。
+        offset (int): 取得開始位置。
+        db (AsyncSession): データベースセッション。
+
+    Returns:
+        list[ReportRow]: レポートのリスト（新しい順）。
+
+    """
+    logger.info("search_reports_service - start", keyword=keyword, limit=limit, offset=offset)
+    try:
+        reports = await ReportReadRepository.search_report_rows(db, keyword, user_id, limit, offset)
+        logger.info("search_reports_service - success", count=len(reports))
+        return reports
+    finally:
+        logger.info("search_reports_service - end")
@@ -1,3 +1,5 @@
+import asyncio
+import contextlib
 import os
 import time
 from contextlib import asynccontextmanager
@@ -6,11 +8,31 @@ from fastapi import FastAPI, HTTPException
 from fastapi.exceptions import RequestValidationError
 
 from app.config.setting import setting
+from app.core.deadline import install_statement_timeout_listener
 from app.core.http_exception_handler import http_exception_handler
-from app.core.log_config import logger
+from app.core.log_config import configure_logging, logger
+from app.core.loop_monitor import LoopMonitor
+from app.core.metrics import flush_periodically
+from app.core.query_stats import install_compile_cache_listener
+from app.core.render import renderer
+from app.core.replica import install_write_listeners
 from app.core.request_validation_error import validation_exception_handler
-from app.database import database
-from app.middleware import AddUserIPMiddleware, ErrorHandlerMiddleware
+from app.core.responses import FastJSONResponse
+from app.core.slow_query import install_slow_query_listeners
+from app.core.tracing import exporter, install_db_listeners
+from app.database import engine, replica_router
+from app.middleware import (
+    AddUserIPMiddleware,
+    AdmissionMiddleware,
+    DeadlineMiddleware,
+    ErrorHandlerMiddleware,
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    QueryStatsMiddleware,
+    RateLimitMiddleware,
+    ReadYourWritesMiddleware,
+    TracingMiddleware,
+)
 from app.routes import router
 
 # タイムゾーンをJST（日本標準時）に設定
@@ -20,30 +42,96 @@ time.tzset()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """アプリケーションのライフサイクル管理を行うコンテキストマネージャ。
+
+    ログの設定などの副作用を伴う初期化は、読み込み時ではなくここで行う。
     """
-    logger.info("Application startup - connecting to database.")
+    configure_logging()
+    logger.info("Application startup.")
 
     # 明示的にイベントループを設定（最新バージョンでも安全）
     # loop = asyncio.get_running_loop()
     # asyncio.set_event_loop(loop)
 
-    await database.connect()
+    # 複数ワーカー構成の場合、メトリクスを定期的にファイルへ書き出す
+    metrics_flush_task = None
+    if setting.METRICS_MULTIPROC_DIR:
+        metrics_flush_task = asyncio.create_task(
+            flush_periodically(setting.METRICS_MULTIPROC_DIR, setting.METRICS_FLUSH_INTERVAL_SECONDS),
+        )
+
+    # イベントループの遅延とブロッキングを監視する
+    loop_monitor = None
+    if setting.LOOP_MONITOR_ENABLED:
+        loop_monitor = LoopMonitor(setting.LOOP_MONITOR_INTERVAL_SECONDS, setting.LOOP_BLOCK_THRESHOLD_MS)
+        loop_monitor.start()
+
+    # レプリカのヘルスチェックを開始する
+    if replica_router:
+        await replica_router.start()
+
     yield
     logger.info("Application shutdown - disconnecting from database.")
-    await database.disconnect()
+    if loop_monitor:
+        await loop_monitor.stop()
+    if replica_router:
+        await replica_router.stop()
+    if metrics_flush_task:
+        metrics_flush_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await metrics_flush_task
+    # 本文の変換用のプロセスプールを停止する
+    renderer.shutdown()
+    # コネクションプールの接続を閉じる
+    await engine.dispose()
+    # 未出力のスパンを書き出す
+    exporter.shutdown()
+
+# コンパイル済みSQLのキャッシュの利用結果をメトリクスへ記録
+install_compile_cache_listener()
+
+# スロークエリの記録を有効化
+if setting.SLOW_QUERY_ENABLED:
+    install_slow_query_listeners()
+
+# リクエストの期限をDBのstatement_timeoutへ反映する
+if setting.REQUEST_DEADLINE_ENABLED:
+    install_statement_timeout_listener()
+
+# SQLのスパンの記録を有効化
+if setting.TRACING_ENABLED:
+    install_db_listeners()
+
+# 書き込みをcommitしたリクエストを記録し、レプリカへの反映を確認できるまでそのクライアントの読み取りをプライマリへ振り分ける
+if setting.DATABASE_REPLICAS:
+    install_write_listeners()
 
 # FastAPIアプリケーションのインスタンスを作成し、lifespanを設定
+# NOTE: JSONのシリアライズはpydantic-coreで直接bytesに変換するFastJSONResponseを使用する
 if setting.DEV_MODE:
-    app = FastAPI(lifespan=lifespan)
+    app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 else:
     # 本番環境ではOpenAPIなどを無効化
-    app = FastAPI(lifespan=lifespan, docs_url=None, redoc_url=None, openapi_url=None)
+    app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse, docs_url=None, redoc_url=None, openapi_url=None)
 
 # ミドルウェアの追加 (ユーザーIP記録とエラーハンドリング)
 # NOTE: ミドルウェアを別ファイルにする場合、@app.middleware()が機能しないっぽい。
 #       そのため、add_middlewareでミドルウェアを登録する方法にする。
+# エンドポイントでのcommitをCookieに反映するため、最も内側に登録する
+app.add_middleware(ReadYourWritesMiddleware)
 app.add_middleware(AddUserIPMiddleware)
 app.add_middleware(ErrorHandlerMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(ProfilingMiddleware)
+# 過負荷時は後続の処理に入る前に拒否する（拒否したリクエストもメトリクスとトレースに含める）
+app.add_middleware(AdmissionMiddleware)
+# 頻度を超過したリクエストは同時実行数の待機に加える前に拒否する
+app.add_middleware(RateLimitMiddleware)
+# 流量制御の待機も含めてリクエストの期限を適用し、期限切れやクライアントの切断時は処理を取り消す
+app.add_middleware(DeadlineMiddleware)
+# 後続のミドルウェアやエンドポイントのスパンを子スパンとするため、メトリクスの次に外側に登録する
+app.add_middleware(TracingMiddleware)
+# エラーレスポンスも含めて計測するため、メトリクスは最も外側に登録する
+app.add_middleware(MetricsMiddleware)
 
 # 例外ハンドラの登録
 # NOTE: 例外ハンドラを別ファイルにする場合、@app.exception_handler()が機能しないっぽい。
@@ -0,0 +1,188 @@
+# http_bench.py
+# main:appを起動し、実際のHTTPリクエストで負荷をかけてレイテンシとスループットを計測する。
+# 結果はtests/benchmark/results/にJSONで保存し、ベースラインと比較して劣化があれば終了コード1を返す。
+# 実行コマンド:
+# poetry run python -m tests.benchmark.http_bench --scenario mixed --concurrency 32 --duration 30
+# poetry run python -m tests.benchmark.http_bench --scenario all --update-baseline
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+from tests.benchmark.scenarios import SCENARIOS, BenchState, Recorder, prepare_state
+from tests.benchmark.stats import (
+    BenchmarkResult,
+    OperationStats,
+    compare,
+    current_commit,
+    format_table,
+    load_baseline,
+    save_baseline,
+)
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+def free_port() -> int:
+    """サーバーの起動に使用する、空いているローカルのポート番号を返却します。
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def boot_server(workers: int, dev_mode: bool, database_url: str | None, startup_timeout: float = 30.0) -> Iterator[str]:
+    """uvicornでmain:appを別プロセスとして起動し、ベースURLを返却します。
+
+    Args:
+        workers (int): uvicornのワーカー数。
+        dev_mode (bool): DEV_MODEで起動するかどうか（Falseの場合はコネクションプールを使用する）。
+        database_url (str | None): 接続先DBのURL。未指定の場合はalembic.iniの値を使用する。
+        startup_timeout (float): 起動を待つ最大秒数。
+
+    Yields:
+        str: 起動したサーバーのベースURL。
+
+    """
+    port = free_port()
+    env = {**os.environ, "DEV_MODE": str(dev_mode).lower(), "PYTHONPATH": str(BACKEND_DIR)}
+    if database_url:
+        env["DATABASE_URL"] = database_url
+    command = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+    ]
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"server exited with code {process.returncode}")
+            try:
+                # 認証エラー(401)でも応答があれば起動完了とみなす
+                httpx.get(f"{base_url}/auth/me", timeout=1.0)
+                break
+            except httpx.HTTPError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError("server did not start in time") from None
+                time.sleep(0.2)
+        yield base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def run_scenario(base_url: str, scenario: str, concurrency: int, duration: float, warmup: float) -> BenchmarkResult:
+    """シナリオを指定した並列数・時間で実行し、集計結果を返却します。
+
+    Args:
+        base_url (str): 対象サーバーのベースURL。
+        scenario (str): シナリオ名。
+        concurrency (int): 同時に実行する仮想ユーザー数。
+        duration (float): 計測時間（秒）。
+        warmup (float): 計測前のウォームアップ時間（秒）。
+
+    Returns:
+        BenchmarkResult: 集計結果。
+
+    """
+    operations = list(SCENARIOS[scenario])
+    weights = list(SCENARIOS[scenario].values())
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        state: BenchState = await prepare_state(client)
+
+        async def virtual_user(stop_at: float) -> None:
+            while time.monotonic() < stop_at:
+                operation = random.choices(operations, weights=weights)[0]
+                await operation(client, state, recorder)
+
+        if warmup > 0:
+            recorder.enabled = False
+            stop_at = time.monotonic() + warmup
+            await asyncio.gather(*(virtual_user(stop_at) for _ in range(concurrency)))
+            recorder.enabled = True
+
+        started_at = datetime.now().isoformat(timespec="seconds")
+        started = time.monotonic()
+        await asyncio.gather(*(virtual_user(started + duration) for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    return BenchmarkResult(
+        scenario=scenario,
+        concurrency=concurrency,
+        duration=elapsed,
+        commit=current_commit(),
+        started_at=started_at,
+        operations={
+            name: OperationStats.from_samples(latencies, recorder.errors[name], elapsed)
+            for name, latencies in sorted(recorder.latencies_ms.items())
+        },
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="HTTP load-testing benchmark with regression gates.")
+    parser.add_argument("--scenario", default="mixed", choices=[*SCENARIOS, "all"], help="Scenario to run")
+    parser.add_argument("--concurrency", type=int, default=16, help="Number of concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=20.0, help="Measurement duration in seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Warmup duration in seconds")
+    parser.add_argument("--base-url", help="Benchmark an already running server instead of booting main:app")
+    parser.add_argument("--database-url", help="Database URL for the booted server")
+    parser.add_argument("--workers", type=int, default=1, help="Number of uvicorn workers for the booted server")
+    parser.add_argument("--dev-mode", action="store_true", help="Boot the server with DEV_MODE=true")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed regression ratio against the baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="Save this run as the new baseline")
+    args = parser.parse_args()
+
+    scenarios = list(SCENARIOS) if args.scenario == "all" else [args.scenario]
+
+    async def run_all(base_url: str) -> list[BenchmarkResult]:
+        return [await run_scenario(base_url, scenario, args.concurrency, args.duration, args.warmup) for scenario in scenarios]
+
+    if args.base_url:
+        results = asyncio.run(run_all(args.base_url))
+    else:
+        with boot_server(args.workers, args.dev_mode, args.database_url) as base_url:
+            results = asyncio.run(run_all(base_url))
+
+    exit_code = 0
+    for result in results:
+        baseline = load_baseline(result.scenario)
+        print(f"\n[{result.scenario}] concurrency={result.concurrency} duration={result.duration:.1f}s commit={result.commit}")
+        print(format_table(result, baseline))
+        print(f"saved: {result.save()}")
+
+        if args.update_baseline:
+            print(f"baseline updated: {save_baseline(result)}")
+        elif baseline is None:
+            print("no baseline found (run with --update-baseline to create one)")
+        else:
+            regressions = compare(baseline, result, args.threshold)
+            for regression in regressions:
+                print(f"REGRESSION {regression}")
+            if regressions:
+                exit_code = 1
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,385 @@
+# micro.py
+# セキュリティ・シリアライズ・SQL構築・ログ出力のホットな関数を計測するマイクロベンチマーク。
+# DBやネットワークを使用しないため、オフラインで実行できる。
+# 結果はtests/benchmark/results/micro/<コミット>.jsonに保存し、コミット間の比較表を出力する。
+# 実行コマンド:
+# poetry run python -m tests.benchmark.micro run
+# poetry run python -m tests.benchmark.micro run --filter token
+# poetry run python -m tests.benchmark.micro compare <基準コミット> [<比較コミット>]
+
+import argparse
+import gc
+import json
+import logging
+import statistics
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+from tests.benchmark.stats import RESULTS_DIR, current_commit
+
+MICRO_RESULTS_DIR = RESULTS_DIR / "micro"
+
+# 計測対象の関数を登録するレジストリ
+BENCHMARKS: dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def benchmark(name: str) -> Callable:
+    """ベンチマークを登録するデコレーター。
+
+    デコレート対象は準備処理を行い、計測対象の関数を返却する関数とする。
+    """
+    def decorator(setup: Callable[[], Callable[[], object]]) -> Callable[[], Callable[[], object]]:
+        BENCHMARKS[name] = setup
+        return setup
+    return decorator
+
+
+@dataclass
+class MicroResult:
+    """1つのベンチマークの計測結果。時間の単位はマイクロ秒。
+    """
+
+    name: str
+    rounds: int
+    iterations: int
+    min_us: float
+    median_us: float
+    mean_us: float
+    stdev_us: float
+    ops_per_sec: float
+
+
+def measure(name: str, func: Callable[[], object], min_time: float, rounds: int) -> MicroResult:
+    """pytest-benchmarkと同様に、1ラウンドがmin_time以上になる反復回数を求めてから複数ラウンド計測します。
+
+    Args:
+        name (str): ベンチマーク名。
+        func (Callable): 計測対象の関数。
+        min_time (float): 1ラウンドの最小計測時間（秒）。
+        rounds (int): ラウンド数。
+
+    Returns:
+        MicroResult: 計測結果。
+
+    """
+    func()  # ウォームアップ
+    iterations = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        if time.perf_counter() - started >= min_time:
+            break
+        iterations *= 2
+
+    samples: list[float] = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            samples.append((time.perf_counter() - started) / iterations * 1_000_000)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    median = statistics.median(samples)
+    return MicroResult(
+        name=name,
+        rounds=rounds,
+        iterations=iterations,
+        min_us=min(samples),
+        median_us=median,
+        mean_us=statistics.fmean(samples),
+        stdev_us=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        ops_per_sec=1_000_000 / median if median else 0.0,
+    )
+
+
+# ---------------------------------------------------------------------------
+# app.core.security
+# ---------------------------------------------------------------------------
+
+@benchmark("security.create_access_token")
+def bench_create_access_token() -> Callable[[], object]:
+    from app.core.security import create_access_token
+
+    return lambda: create_access_token(data={"sub": "benchuser@example.com"})
+
+
+@benchmark("security.decode_access_token")
+def bench_decode_access_token() -> Callable[[], object]:
+    from app.core.security import create_access_token, decode_access_token
+
+    token = create_access_token(data={"sub": "benchuser@example.com"})
+    return lambda: decode_access_token(token)
+
+
+@benchmark("security.hash_password")
+def bench_hash_password() -> Callable[[], object]:
+    from app.core.security import hash_password
+
+    return lambda: hash_password("benchpassword")
+
+
+@benchmark("security.verify_password")
+def bench_verify_password() -> Callable[[], object]:
+    from app.core.security import hash_password, verify_password
+
+    hashed_password = hash_password("benchpassword")
+    return lambda: verify_password("benchpassword", hashed_password)
+
+
+# ---------------------------------------------------------------------------
+# app.schemas
+# ---------------------------------------------------------------------------
+
+def _orm_reports(count: int) -> list:
+    from app.common.common import datetime_now
+    from app.models.report import Report
+
+    now = datetime_now()
+    return [
+        Report(
+            report_id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            title=f"ベンチマーク {i}",
+            content="ベンチマーク用のレポート本文です。" * 20,
+            format=Report.FORMAT_MD,
+            visibility=Report.VISIBILITY_PUBLIC,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+@benchmark("schemas.ResponseReport.model_validate")
+def bench_response_report_model_validate() -> Callable[[], object]:
+    from app.schemas.report import ResponseReport
+
+    report = _orm_reports(1)[0]
+    return lambda: ResponseReport.model_validate(report)
+
+
+@benchmark("schemas.ResponseReport.model_validate[x100]")
+def bench_response_report_model_validate_list() -> Callable[[], object]:
+    from app.schemas.report import ResponseReport
+
+    reports = _orm_reports(100)
+    return lambda: [ResponseReport.model_validate(report) for report in reports]
+
+
+# ---------------------------------------------------------------------------
+# app.core.responses
+# ---------------------------------------------------------------------------
+
+def _response_reports(count: int) -> list:
+    from app.schemas.report import ResponseReport
+
+    return [ResponseReport.model_validate(report) for report in _orm_reports(count)]
+
+
+def _default_response_path(response_model: object, content: object) -> Callable[[], object]:
+    """FastAPIのデフォルトの経路（dict化→response_modelでの再検証→jsonable_encoder→json.dumps）を再現します。
+    """
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+    from starlette.responses import JSONResponse
+
+    adapter = TypeAdapter(response_model)
+
+    def render() -> bytes:
+        prepared = [model.model_dump() for model in content] if isinstance(content, list) else content.model_dump()  # type: ignore[attr-defined]
+        validated = adapter.validate_python(prepared)
+        return JSONResponse(jsonable_encoder(adapter.dump_python(validated, mode="json"))).body
+
+    return render
+
+
+@benchmark("response.JSONResponse[x1]")
+def bench_json_response() -> Callable[[], object]:
+    from app.schemas.report import ResponseReport
+
+    return _default_response_path(ResponseReport, _response_reports(1)[0])
+
+
+@benchmark("response.FastJSONResponse[x1]")
+def bench_fast_json_response() -> Callable[[], object]:
+    from app.core.responses import FastJSONResponse
+
+    report = _response_reports(1)[0]
+    return lambda: FastJSONResponse(report).body
+
+
+@benchmark("response.JSONResponse[x100]")
+def bench_json_response_list() -> Callable[[], object]:
+    from app.schemas.report import ResponseReport
+
+    return _default_response_path(list[ResponseReport], _response_reports(100))
+
+
+@benchmark("response.FastJSONResponse[x100]")
+def bench_fast_json_response_list() -> Callable[[], object]:
+    from app.core.responses import FastJSONResponse
+
+    reports = _response_reports(100)
+    return lambda: FastJSONResponse(reports).body
+
+
+# ---------------------------------------------------------------------------
+# app.repositories
+# ---------------------------------------------------------------------------
+# SQLAlchemyが実行ごとに行う処理（クエリの構築とコンパイル済みSQLのキャッシュキーの生成）を計測する
+
+@benchmark("statement.get_user_by_email[build]")
+def bench_build_user_statement() -> Callable[[], object]:
+    from sqlalchemy.future import select
+
+    from app.models.user import User
+
+    def build() -> object:
+        stmt = select(User).where(User.email == "benchuser@example.com", User.user_status == User.STATUS_ACTIVE, User.deleted_at.is_(None))
+        return stmt._generate_cache_key()
+
+    return build
+
+
+@benchmark("statement.get_user_by_email[prebuilt]")
+def bench_prebuilt_user_statement() -> Callable[[], object]:
+    from app.repositories.auth_repository import SELECT_ACTIVE_USER_BY_EMAIL
+
+    return lambda: SELECT_ACTIVE_USER_BY_EMAIL._generate_cache_key()
+
+
+@benchmark("statement.search_report_rows[build]")
+def bench_build_search_statement() -> Callable[[], object]:
+    from sqlalchemy import or_
+    from sqlalchemy.future import select
+
+    from app.models.report import Report
+    from app.repositories.report_read_repository import REPORT_ROW_COLUMNS
+
+    user_id = uuid.uuid4()
+
+    def build() -> object:
+        stmt = (
+            select(*REPORT_ROW_COLUMNS)
+            .where(Report.deleted_at.is_(None))
+            .where(Report.title.ilike("%bench%", escape="\\"), or_(Report.visibility == Report.VISIBILITY_PUBLIC, Report.user_id == user_id))
+            .order_by(Report.created_at.desc(), Report.report_id)
+            .limit(20)
+            .offset(0)
+        )
+        return stmt._generate_cache_key()
+
+    return build
+
+
+@benchmark("statement.search_report_rows[prebuilt]")
+def bench_prebuilt_search_statement() -> Callable[[], object]:
+    from app.repositories.report_read_repository import SEARCH_ROWS
+
+    return lambda: SEARCH_ROWS._generate_cache_key()
+
+
+# ---------------------------------------------------------------------------
+# app.core.log_config
+# ---------------------------------------------------------------------------
+
+@benchmark("logging.structlog_chain")
+def bench_structlog_chain() -> Callable[[], object]:
+    """configure_loggingで設定したプロセッサチェーン全体（JSON整形まで）を計測します。
+
+    ファイルへの書き込みは計測対象外とするため、appロガーのハンドラをNullHandlerに差し替えます。
+    """
+    import structlog
+
+    from app.core.log_config import configure_logging
+
+    configure_logging(test_env=1)
+    app_logger = logging.getLogger("app")
+    app_logger.handlers = [logging.NullHandler()]
+    root_logger = logging.getLogger()
+    root_logger.handlers = [logging.NullHandler()]
+    root_logger.setLevel(logging.INFO)
+    logger = structlog.get_logger("app")
+    return lambda: logger.info("bench - start", report_id="423e4567-e89b-12d3-a456-426614174003", user_id=1)
+
+
+def run(name_filter: str | None, min_time: float, rounds: int) -> Path:
+    """登録済みのベンチマークを実行し、コミットごとの結果ファイルへ保存します。
+    """
+    results: list[MicroResult] = []
+    for name, setup in BENCHMARKS.items():
+        if name_filter and name_filter not in name:
+            continue
+        result = measure(name, setup(), min_time, rounds)
+        results.append(result)
+        print(f"{name:<48}{result.median_us:>14.2f} us{result.ops_per_sec:>14.0f} ops/s  (±{result.stdev_us:.2f})")
+
+    commit = current_commit()
+    MICRO_RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = MICRO_RESULTS_DIR / f"{commit}.json"
+    # 同一コミットで一部のみ再計測した場合は既存の結果に上書きマージする
+    stored = json.loads(path.read_text(encoding="utf-8"))["benchmarks"] if path.exists() else {}
+    stored.update({result.name: asdict(result) for result in results})
+    path.write_text(
+        json.dumps({"commit": commit, "updated_at": datetime.now().isoformat(timespec="seconds"), "benchmarks": stored}, indent=2, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    print(f"saved: {path}")
+    return path
+
+
+def load(commit: str) -> dict[str, dict]:
+    path = MICRO_RESULTS_DIR / f"{commit}.json"
+    if not path.exists():
+        raise SystemExit(f"no micro benchmark results for commit {commit}: {path}")
+    return json.loads(path.read_text(encoding="utf-8"))["benchmarks"]
+
+
+def compare_commits(base_commit: str, target_commit: str) -> str:
+    """2つのコミットの結果から、中央値の比較表を作成します。
+    """
+    base, target = load(base_commit), load(target_commit)
+    header = f"{'benchmark':<48}{base_commit:>14}{target_commit:>14}{'change':>10}"
+    lines = [header, "-" * len(header)]
+    for name in sorted(base.keys() | target.keys()):
+        base_us = base.get(name, {}).get("median_us")
+        target_us = target.get(name, {}).get("median_us")
+        change = f"{(target_us - base_us) / base_us:+.1%}" if base_us and target_us else "-"
+        base_text = f"{base_us:.2f}us" if base_us else "-"
+        target_text = f"{target_us:.2f}us" if target_us else "-"
+        lines.append(f"{name:<48}{base_text:>14}{target_text:>14}{change:>10}")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmarks for hot pure-Python code paths.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser("run", help="Run benchmarks and store results for the current commit")
+    run_parser.add_argument("--filter", help="Run only benchmarks whose name contains this string")
+    run_parser.add_argument("--min-time", type=float, default=0.05, help="Minimum seconds per round")
+    run_parser.add_argument("--rounds", type=int, default=7, help="Number of measured rounds")
+    compare_parser = subparsers.add_parser("compare", help="Compare stored results of two commits")
+    compare_parser.add_argument("base", help="Base commit")
+    compare_parser.add_argument("target", nargs="?", help="Target commit (default: current commit)")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        run(args.filter, args.min_time, args.rounds)
+    else:
+        print(compare_commits(args.base, args.target or current_commit()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+import random
+import time
+import uuid
+from collections import Counter, defaultdict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+import httpx
+
+# ベンチマーク用のユーザー
+BENCH_USER_EMAIL = "benchuser@example.com"
+BENCH_USER_PASSWORD = "benchpassword"
+BENCH_USERNAME = "benchuser"
+
+# 読み取りシナリオで使用するレポートの件数
+BENCH_REPORT_POOL_SIZE = 50
+
+
+class Recorder:
+    """操作ごとのレイテンシとエラー件数を記録するクラス。
+    """
+
+    def __init__(self) -> None:
+        self.latencies_ms: dict[str, list[float]] = defaultdict(list)
+        self.errors: Counter[str] = Counter()
+        self.enabled = True
+
+    async def measure(self, name: str, request: Awaitable[httpx.Response], expected: tuple[int, ...] = (200,)) -> httpx.Response | None:
+        """リクエストの所要時間を計測して記録します。
+
+        Args:
+            name (str): 操作名。
+            request (Awaitable[httpx.Response]): 実行するリクエスト。
+            expected (tuple[int, ...]): 成功とみなすステータスコード。
+
+        Returns:
+            httpx.Response | None: レスポンス。通信エラーの場合はNone。
+
+        """
+        started = time.perf_counter()
+        response: httpx.Response | None = None
+        try:
+            response = await request
+        except httpx.HTTPError:
+            pass
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if self.enabled:
+            self.latencies_ms[name].append(elapsed_ms)
+            if response is None or response.status_code not in expected:
+                self.errors[name] += 1
+        return response
+
+
+@dataclass
+class BenchState:
+    """シナリオ間で共有する認証情報とレポートID。
+    """
+
+    token: str = ""
+    report_ids: list[str] = field(default_factory=list)
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+def _report_payload() -> dict:
+    return {
+        "title": f"bench {uuid.uuid4().hex[:8]}",
+        "content": "ベンチマーク用のレポート本文です。" * 10,
+        "format": 1,
+        "visibility": 1,
+    }
+
+
+async def op_login(client: httpx.AsyncClient, state: BenchState, recorder: Recorder) -> None:
+    await recorder.measure(
+        "login",
+        client.post("/auth/login", data={"username": BENCH_USER_EMAIL, "password": BENCH_USER_PASSWORD}),
+    )
+
+
+async def op_me(client: httpx.AsyncClient, state: BenchState, recorder: Recorder) -> None:
+    await recorder.measure("auth_me", client.get("/auth/me", headers=state.headers))
+
+
+async def op_report_read(client: httpx.AsyncClient, state: BenchState, recorder: Recorder) -> None:
+    await recorder.measure("report_read", client.get(f"/report/{random.choice(state.report_ids)}"))
+
+
+async def op_report_create(client: httpx.AsyncClient, state: BenchState, recorder: Recorder) -> None:
+    await recorder.measure("report_create", client.post("/report", json=_report_payload(), headers=state.headers))
+
+
+async def op_report_update(client: httpx.AsyncClient, state: BenchState, recorder: Recorder) -> None:
+    await recorder.measure(
+        "report_update",
+        client.put(f"/report/{random.choice(state.report_ids)}", json=_report_payload(), headers=state.headers),
+    )
+
+
+async def op_report_crud(client: httpx.AsyncClient, state: BenchState, recorder: Recorder) -> None:
+    """作成・取得・更新・削除を1件のレポートに対して順に実行します。
+    """
+    response = await recorder.measure("report_create", client.post("/report", json=_report_payload(), headers=state.headers))
+    if response is None or response.status_code != 200:
+        return
+    report_id = response.json()["report_id"]
+    await recorder.measure("report_read", client.get(f"/report/{report_id}"))
+    await recorder.measure("report_update", client.put(f"/report/{report_id}", json=_report_payload(), headers=state.headers))
+    await recorder.measure("report_delete", client.delete(f"/report/{report_id}", headers=state.headers))
+
+
+Operation = Callable[[httpx.AsyncClient, BenchState, Recorder], Awaitable[None]]
+
+# シナリオごとの操作と重み
+SCENARIOS: dict[str, dict[Operation, int]] = {
+    "login": {op_login: 1},
+    "auth_me": {op_me: 1},
+    "report_crud": {op_report_crud: 1},
+    # 読み取り中心の混合トラフィック
+    "mixed": {op_report_read: 80, op_me: 10, op_report_create: 5, op_report_update: 5},
+}
+
+
+async def prepare_state(client: httpx.AsyncClient) -> BenchState:
+    """ベンチマーク用ユーザーの登録・ログインと、読み取り用レポートの作成を行います。
+    """
+    await client.post("/auth/register", json={"email": BENCH_USER_EMAIL, "username": BENCH_USERNAME, "password": BENCH_USER_PASSWORD})
+    response = await client.post("/auth/login", data={"username": BENCH_USER_EMAIL, "password": BENCH_USER_PASSWORD})
+    response.raise_for_status()
+    state = BenchState(token=response.json()["access_token"])
+
+    for _ in range(BENCH_REPORT_POOL_SIZE):
+        response = await client.post("/report", json=_report_payload(), headers=state.headers)
+        response.raise_for_status()
+        state.report_ids.append(response.json()["report_id"])
+    return state
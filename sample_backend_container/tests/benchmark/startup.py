@@ -0,0 +1,153 @@
+# startup.py
+# コールドスタートの時間を計測する。
+#   import: main（アプリケーション）の読み込みにかかる時間
+#   first_response: サーバープロセスの起動から最初のレスポンスを受信するまでの時間（インタプリタの起動・読み込み・lifespanを含む）
+# 結果はtests/benchmark/results/にJSONで保存し、ベースラインと比較して劣化があれば終了コード1を返す。
+# 実行コマンド:
+# poetry run python -m tests.benchmark.startup --repeat 10
+# poetry run python -m tests.benchmark.startup --repeat 10 --update-baseline
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import httpx
+
+from tests.benchmark.http_bench import BACKEND_DIR, free_port
+from tests.benchmark.stats import (
+    BenchmarkResult,
+    OperationStats,
+    compare,
+    current_commit,
+    format_table,
+    load_baseline,
+    save_baseline,
+)
+
+# 読み込み時間を計測するスクリプト（インタプリタの起動時間を含めないよう、プロセス内で計測する）
+IMPORT_SCRIPT = "import time; started = time.perf_counter(); import main; print((time.perf_counter() - started) * 1000)"
+
+# 最初のレスポンスを待つ間のポーリング間隔（秒）
+POLL_INTERVAL_SECONDS = 0.01
+
+
+def _env(dev_mode: bool, database_url: str | None) -> dict[str, str]:
+    env = {**os.environ, "DEV_MODE": str(dev_mode).lower(), "PYTHONPATH": str(BACKEND_DIR)}
+    if database_url:
+        env["DATABASE_URL"] = database_url
+    return env
+
+
+def measure_import(env: dict[str, str]) -> float:
+    """新しいプロセスでmainを読み込み、読み込みにかかった時間（ミリ秒）を返却します。
+    """
+    completed = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True)
+    return float(completed.stdout.strip().splitlines()[-1])
+
+
+def measure_first_response(env: dict[str, str], timeout: float = 30.0) -> float:
+    """uvicornでmain:appを起動し、起動から最初のレスポンスを受信するまでの時間（ミリ秒）を返却します。
+
+    Args:
+        env (dict[str, str]): サーバープロセスの環境変数。
+        timeout (float): 起動を待つ最大秒数。
+
+    Returns:
+        float: 最初のレスポンスまでの時間（ミリ秒）。
+
+    Raises:
+        RuntimeError: サーバーが異常終了した場合、または時間内に応答しなかった場合。
+
+    """
+    port = free_port()
+    command = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log",
+    ]
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=1.0) as client:
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError(f"server exited with code {process.returncode}")
+                try:
+                    # 認証エラー(401)でも応答があれば起動完了とみなす
+                    client.get("/auth/me")
+                    return (time.perf_counter() - started) * 1000
+                except httpx.TransportError:
+                    if time.perf_counter() - started > timeout:
+                        raise RuntimeError("server did not start in time") from None
+                    time.sleep(POLL_INTERVAL_SECONDS)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def run_startup(repeat: int, dev_mode: bool, database_url: str | None) -> BenchmarkResult:
+    """読み込み時間と最初のレスポンスまでの時間をそれぞれrepeat回計測し、集計結果を返却します。
+    """
+    env = _env(dev_mode, database_url)
+    # 初回はバイトコードの生成を含むため、計測の対象外とする
+    measure_import(env)
+
+    started_at = datetime.now().isoformat(timespec="seconds")
+    started = time.monotonic()
+    samples: dict[str, list[float]] = {"import": [], "first_response": []}
+    errors = {"import": 0, "first_response": 0}
+    for _ in range(repeat):
+        try:
+            samples["import"].append(measure_import(env))
+        except subprocess.CalledProcessError:
+            errors["import"] += 1
+        try:
+            samples["first_response"].append(measure_first_response(env))
+        except RuntimeError:
+            errors["first_response"] += 1
+    elapsed = time.monotonic() - started
+
+    return BenchmarkResult(
+        scenario="startup_dev" if dev_mode else "startup",
+        concurrency=1,
+        duration=elapsed,
+        commit=current_commit(),
+        started_at=started_at,
+        operations={name: OperationStats.from_samples(values, errors[name], elapsed) for name, values in samples.items()},
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Cold start benchmark (import time and time to first response).")
+    parser.add_argument("--repeat", type=int, default=10, help="Number of measurements")
+    parser.add_argument("--database-url", help="Database URL for the booted server")
+    parser.add_argument("--dev-mode", action="store_true", help="Boot the server with DEV_MODE=true")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed regression ratio against the baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="Save this run as the new baseline")
+    args = parser.parse_args()
+
+    result = run_startup(args.repeat, args.dev_mode, args.database_url)
+    baseline = load_baseline(result.scenario)
+    print(f"\n[{result.scenario}] repeat={args.repeat} commit={result.commit}")
+    print(format_table(result, baseline))
+    print(f"saved: {result.save()}")
+
+    if args.update_baseline:
+        print(f"baseline updated: {save_baseline(result)}")
+        return 0
+    if baseline is None:
+        print("no baseline found (run with --update-baseline to create one)")
+        return 0
+    regressions = compare(baseline, result, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+import json
+import math
+import subprocess
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+# ベンチマーク結果とベースラインの保存先
+BENCHMARK_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = BENCHMARK_DIR / "results"
+BASELINES_DIR = BENCHMARK_DIR / "baselines"
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """ソート済みの値から線形補間でパーセンタイル値を求めます。
+
+    Args:
+        sorted_values (list[float]): 昇順にソートされた値。
+        p (float): パーセンタイル (0〜100)。
+
+    Returns:
+        float: パーセンタイル値。値が空の場合は0。
+
+    """
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * p / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return sorted_values[lower]
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+def current_commit() -> str:
+    """現在のgitコミットハッシュ（短縮形）を返却します。取得できない場合はunknown。
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=BENCHMARK_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+@dataclass
+class OperationStats:
+    """1種類の操作のレイテンシ集計結果。レイテンシの単位はミリ秒。
+    """
+
+    count: int
+    errors: int
+    throughput_rps: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+    @classmethod
+    def from_samples(cls, latencies_ms: list[float], errors: int, duration: float) -> "OperationStats":
+        values = sorted(latencies_ms)
+        return cls(
+            count=len(values),
+            errors=errors,
+            throughput_rps=len(values) / duration if duration else 0.0,
+            mean_ms=sum(values) / len(values) if values else 0.0,
+            p50_ms=percentile(values, 50),
+            p95_ms=percentile(values, 95),
+            p99_ms=percentile(values, 99),
+            max_ms=values[-1] if values else 0.0,
+        )
+
+
+@dataclass
+class BenchmarkResult:
+    """1回のベンチマーク実行結果。
+    """
+
+    scenario: str
+    concurrency: int
+    duration: float
+    commit: str
+    started_at: str
+    operations: dict[str, OperationStats] = field(default_factory=dict)
+
+    @property
+    def total(self) -> OperationStats:
+        """全操作を合算した集計結果。
+        """
+        count = sum(stats.count for stats in self.operations.values())
+        errors = sum(stats.errors for stats in self.operations.values())
+        return OperationStats(
+            count=count,
+            errors=errors,
+            throughput_rps=count / self.duration if self.duration else 0.0,
+            mean_ms=sum(stats.mean_ms * stats.count for stats in self.operations.values()) / count if count else 0.0,
+            # 操作ごとのパーセンタイルは合算できないため、最悪値を採用する
+            p50_ms=max((stats.p50_ms for stats in self.operations.values()), default=0.0),
+            p95_ms=max((stats.p95_ms for stats in self.operations.values()), default=0.0),
+            p99_ms=max((stats.p99_ms for stats in self.operations.values()), default=0.0),
+            max_ms=max((stats.max_ms for stats in self.operations.values()), default=0.0),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["total"] = asdict(self.total)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "BenchmarkResult":
+        return cls(
+            scenario=data["scenario"],
+            concurrency=data["concurrency"],
+            duration=data["duration"],
+            commit=data.get("commit", "unknown"),
+            started_at=data.get("started_at", ""),
+            operations={name: OperationStats(**stats) for name, stats in data["operations"].items()},
+        )
+
+    def save(self, directory: Path = RESULTS_DIR) -> Path:
+        """結果をJSONファイルへ保存します。
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = directory / f"{self.scenario}_{self.commit}_{timestamp}.json"
+        path.write_text(json.dumps(self.to_dict(), indent=2, ensure_ascii=False), encoding="utf-8")
+        return path
+
+
+def baseline_path(scenario: str) -> Path:
+    return BASELINES_DIR / f"{scenario}.json"
+
+
+def load_baseline(scenario: str) -> BenchmarkResult | None:
+    """シナリオのベースラインを読み込みます。存在しない場合はNone。
+    """
+    path = baseline_path(scenario)
+    if not path.exists():
+        return None
+    return BenchmarkResult.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+
+def save_baseline(result: BenchmarkResult) -> Path:
+    """結果をシナリオのベースラインとして保存します。
+    """
+    BASELINES_DIR.mkdir(parents=True, exist_ok=True)
+    path = baseline_path(result.scenario)
+    path.write_text(json.dumps(result.to_dict(), indent=2, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+@dataclass
+class Regression:
+    """ベースラインからの性能劣化。
+    """
+
+    operation: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return (self.current - self.baseline) / self.baseline if self.baseline else 0.0
+
+    def __str__(self) -> str:
+        return f"{self.operation}.{self.metric}: {self.baseline:.2f} -> {self.current:.2f} ({self.change:+.1%})"
+
+
+# 値が大きいほど悪化とみなす指標と、小さいほど悪化とみなす指標
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+THROUGHPUT_METRICS = ("throughput_rps",)
+
+
+def compare(baseline: BenchmarkResult, current: BenchmarkResult, threshold: float) -> list[Regression]:
+    """ベースラインと比較し、閾値を超えて悪化した指標を返却します。
+
+    Args:
+        baseline (BenchmarkResult): ベースラインの結果。
+        current (BenchmarkResult): 今回の結果。
+        threshold (float): 許容する悪化率 (0.1 = 10%)。
+
+    Returns:
+        list[Regression]: 閾値を超えた劣化のリスト。
+
+    """
+    regressions: list[Regression] = []
+    pairs = [("total", baseline.total, current.total)]
+    pairs += [(name, stats, current.operations[name]) for name, stats in baseline.operations.items() if name in current.operations]
+    for name, base_stats, current_stats in pairs:
+        for metric in LATENCY_METRICS:
+            base_value, current_value = getattr(base_stats, metric), getattr(current_stats, metric)
+            if base_value and current_value > base_value * (1 + threshold):
+                regressions.append(Regression(name, metric, base_value, current_value))
+        for metric in THROUGHPUT_METRICS:
+            base_value, current_value = getattr(base_stats, metric), getattr(current_stats, metric)
+            if base_value and current_value < base_value * (1 - threshold):
+                regressions.append(Regression(name, metric, base_value, current_value))
+        if current_stats.errors > base_stats.errors and current_stats.errors / max(current_stats.count, 1) > threshold:
+            regressions.append(Regression(name, "errors", base_stats.errors, current_stats.errors))
+    return regressions
+
+
+def format_table(result: BenchmarkResult, baseline: BenchmarkResult | None = None) -> str:
+    """結果を表形式の文字列に整形します。ベースラインがある場合はp95の変化率も表示します。
+    """
+    header = f"{'operation':<24}{'count':>8}{'errors':>8}{'rps':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'p95 diff':>10}"
+    lines = [header, "-" * len(header)]
+    rows = [*result.operations.items(), ("total", result.total)]
+    for name, stats in rows:
+        diff = ""
+        if baseline:
+            base_stats = baseline.total if name == "total" else baseline.operations.get(name)
+            if base_stats and base_stats.p95_ms:
+                diff = f"{(stats.p95_ms - base_stats.p95_ms) / base_stats.p95_ms:+.1%}"
+        lines.append(
+            f"{name:<24}{stats.count:>8}{stats.errors:>8}{stats.throughput_rps:>10.1f}"
+            f"{stats.p50_ms:>10.2f}{stats.p95_ms:>10.2f}{stats.p99_ms:>10.2f}{diff:>10}",
+        )
+    return "\n".join(lines)
@@ -2,9 +2,20 @@
 import os
 import time
 
-from .fixtures.authenticate_fixture import *  # noqa: F403
-from .fixtures.db_fixture import *  # noqa: F403
-from .fixtures.logging_fixture import *  # noqa: F403
+from sqlalchemy.engine import make_url
+
+# pytest-xdistで並列実行する場合、ワーカーごとに専用のデータベースを使用する
+# NOTE: app.databaseのインポート時にエンジンが作成されるため、フィクスチャのインポートより前に設定する
+_xdist_worker = os.environ.get("PYTEST_XDIST_WORKER")
+if _xdist_worker and "DATABASE_URL" not in os.environ:
+    _base_url = make_url("postgresql+asyncpg://sample_user:sample_password@db:5432/pytest_sample_db")
+    os.environ["DATABASE_URL"] = _base_url.set(database=f"{_base_url.database}_{_xdist_worker}").render_as_string(hide_password=False)
+
+from .fixtures.authenticate_fixture import *  # noqa: E402, F403
+from .fixtures.db_fixture import *  # noqa: E402, F403
+from .fixtures.logging_fixture import *  # noqa: E402, F403
+from .fixtures.loop_block_fixture import *  # noqa: E402, F403
+from .fixtures.query_budget_fixture import *  # noqa: E402, F403
 
 # タイムゾーンをJST（日本標準時）に設定
 os.environ["TZ"] = "Asia/Tokyo"
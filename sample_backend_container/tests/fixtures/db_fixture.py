@@ -1,22 +1,126 @@
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
+import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import NullPool, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
-from app.database import Base, configure_database
-from main import app
+import app.database
+from app.database import Base, configure_database, get_db, get_read_db
+from app.seeders.seed_data import clear_data, seed_data
+from app.services.report_render_service import render_cache
+from app.services.report_service import report_cache
+from main import app as fastapi_app
 
+# テストごとのデータベース初期化方式
+#   recreate: 各テストでclear_data/seed_data APIを呼び出す（従来の方式）
+#   template: スキーマとシードデータを1回だけ構築したテンプレートDBから、各テストでDBを複製する
+#   rollback: スキーマとシードデータを1回だけ構築し、各テストをSAVEPOINT付きのトランザクション内で実行してロールバックする
+DB_RESET_MODE = os.environ.get("PYTEST_DB_RESET_MODE", "recreate")
+DB_RESET_MODES = ("recreate", "template", "rollback")
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    """rollbackモードでは全テストをセッションのイベントループで実行する。
+
+    テストごとのコネクションをフィクスチャとテストで共有するため、同一のイベントループが必要となる。
+    own_transactionマーカーのテストは、開始済みのトランザクション内では実行できないためスキップする。
+    """
+    if DB_RESET_MODE != "rollback":
+        return
+    session_marker = pytest.mark.asyncio(loop_scope="session")
+    skip_marker = pytest.mark.skip(reason="rollbackモードではトランザクションを自身で開始できない")
+    for item in items:
+        if item.get_closest_marker("own_transaction"):
+            item.add_marker(skip_marker)
+        if pytest_asyncio.is_async_test(item):
+            item.add_marker(session_marker, append=False)
+
+
+def _admin_engine():
+    """CREATE/DROP DATABASEを実行するため、メンテナンス用DBへAUTOCOMMITで接続するエンジンを作成する。
+    """
+    return create_async_engine(
+        app.database.engine.url.set(database="postgres"), isolation_level="AUTOCOMMIT", poolclass=NullPool,
+    )
+
+
+async def _create_database(name: str, template: str | None = None, replace: bool = False) -> None:
+    """データベースを作成する。
+
+    Args:
+        name (str): 作成するデータベース名。
+        template (str | None): 複製元のテンプレートデータベース名。
+        replace (bool): 既存のデータベースを削除して作り直すかどうか。
 
-@pytest_asyncio.fixture(scope="function", autouse=True)
-async def setup_test_db():
-    """テスト環境をセットアップするフィクスチャ。
-    各テストごとにデータベースを初期化し、必要なシードデータを挿入します。
     """
-    print("テスト環境のセットアップを開始")
+    admin_engine = _admin_engine()
+    try:
+        async with admin_engine.connect() as conn:
+            if replace:
+                await conn.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+            else:
+                result = await conn.execute(text("SELECT 1 FROM pg_database WHERE datname = :name"), {"name": name})
+                if result.scalar() is not None:
+                    return
+            template_clause = f' TEMPLATE "{template}"' if template else ""
+            await conn.execute(text(f'CREATE DATABASE "{name}"{template_clause}'))
+    finally:
+        await admin_engine.dispose()
+
+
+async def _drop_database(name: str) -> None:
+    admin_engine = _admin_engine()
+    try:
+        async with admin_engine.connect() as conn:
+            await conn.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+    finally:
+        await admin_engine.dispose()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def template_database() -> AsyncIterator[str | None]:
+    """テストセッションで1回だけスキーマとシードデータを構築するフィクスチャ。
+
+    templateモードでは構築したDBをテンプレートDBとして複製し、そのDB名を返却する。
+    pytest-xdistのワーカーごとに別のDBを使用するため、並列実行しても競合しない。
+    """
+    assert DB_RESET_MODE in DB_RESET_MODES, f"PYTEST_DB_RESET_MODE must be one of {DB_RESET_MODES}"
+    database_name = app.database.engine.url.database or ""
+    await _create_database(database_name)
+    if DB_RESET_MODE == "recreate":
+        yield None
+        return
+
+    print(f"テンプレートDBの構築を開始: {database_name}")
+    await clear_data()
+    await seed_data()
+    await app.database.engine.dispose()
+
+    template_name = None
+    if DB_RESET_MODE == "template":
+        template_name = f"{database_name}_template"
+        await _create_database(template_name, template=database_name, replace=True)
+    print("テンプレートDBの構築を完了")
+
+    yield template_name
+
+    if template_name:
+        await _drop_database(template_name)
+
+
+@asynccontextmanager
+async def _recreate_reset() -> AsyncIterator[None]:
+    """各テストでclear_data/seed_data APIを呼び出してDBを初期化する（従来の方式）。
+    """
     # テスト用データベースの設定
     db_config = configure_database(test_env=1)
-    print(f"使用するデータベースURL: {db_config['database'].url}")
+    print(f"使用するデータベースURL: {db_config['engine'].url}")
 
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://localhost:8000") as client:
+    async with AsyncClient(transport=ASGITransport(app=fastapi_app), base_url="http://localhost:8000") as client:
         # データベースの初期化 (clear_data API の呼び出し)
         print("テスト用データのクリアを開始")
         clear_response = await client.post("/dev/clear_data")
@@ -37,6 +141,73 @@ async def setup_test_db():
         print("テスト後のデータ削除を開始")
         await conn.run_sync(Base.metadata.drop_all)
 
+
+@asynccontextmanager
+async def _template_reset(template_name: str) -> AsyncIterator[None]:
+    """テンプレートDBからテスト用DBを複製する。DDLやbcryptによるシード処理は発生しない。
+    """
+    await app.database.engine.dispose()
+    await _create_database(app.database.engine.url.database or "", template=template_name, replace=True)
+    yield
+
+
+@asynccontextmanager
+async def _rollback_reset() -> AsyncIterator[None]:
+    """テスト全体を1つのトランザクションで実行し、終了時にロールバックする。
+
+    セッションファクトリの接続先をこのコネクションに変更し、セッションのcommitはSAVEPOINTの解放として扱う。
+    リクエストのセッションも、レプリカへ振り分けずにこのコネクションを使用するよう依存関係を差し替える。
+    """
+    session_factory = app.database.AsyncSessionLocal
+    read_session_factory = app.database.ReadSessionLocal
+    original_options = {factory: dict(factory.kw) for factory in (session_factory, read_session_factory)}
+    async with app.database.engine.connect() as connection:
+        transaction = await connection.begin()
+        session_factory.configure(bind=connection, join_transaction_mode="create_savepoint")
+        # 開始済みのトランザクションにはREAD ONLYを設定できないため、読み取り専用の指定を外す
+        read_session_factory.configure(bind=connection, join_transaction_mode="create_savepoint", execution_options={})
+
+        async def override_get_db() -> AsyncIterator[AsyncSession]:
+            async with session_factory() as session:
+                yield session
+
+        async def override_get_read_db() -> AsyncIterator[AsyncSession]:
+            async with read_session_factory() as session:
+                yield session
+
+        fastapi_app.dependency_overrides[get_db] = override_get_db
+        fastapi_app.dependency_overrides[get_read_db] = override_get_read_db
+        try:
+            yield
+        finally:
+            fastapi_app.dependency_overrides.pop(get_db, None)
+            fastapi_app.dependency_overrides.pop(get_read_db, None)
+            for factory, options in original_options.items():
+                factory.kw.clear()
+                factory.configure(**options)
+            await transaction.rollback()
+
+
+@pytest_asyncio.fixture(scope="function", autouse=True)
+async def setup_test_db(template_database: str | None):
+    """テスト環境をセットアップするフィクスチャ。
+    各テストごとにデータベースを初期化し、必要なシードデータを挿入します。
+    初期化方式は環境変数`PYTEST_DB_RESET_MODE`で切り替えます。
+    """
+    print(f"テスト環境のセットアップを開始 (mode={DB_RESET_MODE})")
+    if DB_RESET_MODE == "template" and template_database:
+        reset = _template_reset(template_database)
+    elif DB_RESET_MODE == "rollback":
+        reset = _rollback_reset()
+    else:
+        reset = _recreate_reset()
+
+    # DBを初期化するため、前のテストで取得したレポートと変換結果のキャッシュも破棄する
+    report_cache.clear()
+    render_cache.clear()
+    async with reset:
+        yield
+
 # @pytest_asyncio.fixture(scope="function")
 # async def db_session() -> AsyncGenerator[AsyncSession, None]:
 #     """
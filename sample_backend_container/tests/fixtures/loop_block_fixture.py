@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+from app.core.loop_monitor import BlockingCallDetector
+
+# イベントループのブロックを検出する閾値（ミリ秒）。未指定の場合は検出しない
+# NOTE: フィクスチャのbcryptなどを対象外とするため、テスト本体の実行中のみ検出する
+LOOP_BLOCK_MS = os.environ.get("PYTEST_LOOP_BLOCK_MS")
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item: pytest.Item):
+    """PYTEST_LOOP_BLOCK_MSが指定されている場合、テスト中にコルーチンがイベントループを閾値以上ブロックしたらテストを失敗させる。
+
+    `@pytest.mark.allow_loop_block`を付与したテストは対象外とする。
+    """
+    if not LOOP_BLOCK_MS or item.get_closest_marker("allow_loop_block"):
+        return (yield)
+
+    detector = BlockingCallDetector(float(LOOP_BLOCK_MS))
+    detector.install()
+    try:
+        result = yield
+    finally:
+        detector.uninstall()
+
+    if detector.events:
+        details = "\n".join(f"{event.duration_ms}ms {event.source}\n{event.stack}" for event in detector.events)
+        pytest.fail(f"Event loop blocked longer than {LOOP_BLOCK_MS}ms:\n{details}", pytrace=False)
+    return result
@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from app.core.query_stats import QueryStats, request_observers
+
+# ルートテンプレートごとの1リクエストあたりのSQL実行回数の上限
+# 未定義のルートにはPYTEST_QUERY_BUDGET_DEFAULTを適用する。/devのルートは対象外。
+QUERY_BUDGETS: dict[str, int] = {
+    "GET /report/{report_id}": 2,
+    "POST /report": 3,
+    "PUT /report/{report_id}": 5,
+    "DELETE /report/{report_id}": 4,
+    "GET /auth/me": 2,
+    "POST /auth/login": 2,
+    "POST /auth/register": 3,
+}
+DEFAULT_QUERY_BUDGET = int(os.environ.get("PYTEST_QUERY_BUDGET_DEFAULT", "10"))
+
+
+@pytest.fixture(scope="function", autouse=True)
+def enforce_query_budget(request: pytest.FixtureRequest):
+    """テスト中の各リクエストのSQL実行回数が上限を超えていないことを確認するフィクスチャ。
+
+    `@pytest.mark.query_budget(n)`を付与したテストでは、ルートごとの上限の代わりにnを適用する。
+    """
+    marker = request.node.get_closest_marker("query_budget")
+    override = marker.args[0] if marker else None
+    violations: list[str] = []
+
+    def observe(method: str, route: str, stats: QueryStats) -> None:
+        if route.startswith("/dev"):
+            return
+        key = f"{method} {route}"
+        budget = override if override is not None else QUERY_BUDGETS.get(key, DEFAULT_QUERY_BUDGET)
+        # NOTE: rollbackモードでcommitの代わりに発行されるSAVEPOINT操作はtrack_queriesで集計対象外となる
+        count = stats.count
+        if count > budget:
+            statements = "\n    ".join(f"{times}x {statement}" for statement, times in stats.statements.most_common(5))
+            violations.append(f"{key}: {count} queries (budget {budget})\n    {statements}")
+
+    request_observers.append(observe)
+    yield
+    request_observers.remove(observe)
+    if violations:
+        pytest.fail("Query budget exceeded:\n" + "\n".join(violations), pytrace=False)
@@ -0,0 +1,10 @@
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_profile_requires_admin(authenticated_client: AsyncClient):
+    """管理者以外のユーザーはプロファイルAPIを実行できないことのテスト。
+    """
+    response = await authenticated_client.post("/admin/profile", params={"seconds": 0.1})
+    assert response.status_code == 403
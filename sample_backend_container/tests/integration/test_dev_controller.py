@@ -0,0 +1,39 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.config.test_data import TestData
+from app.database import get_db
+from app.models.report import Report
+from main import app
+
+
+@pytest.mark.asyncio
+async def test_clear_data_truncate():
+    """TRUNCATE方式で全テーブルのデータが削除されることのテスト。
+    """
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://localhost:8000") as client:
+        response = await client.post("/dev/clear_data", params={"mode": "truncate"})
+        assert response.status_code == 200
+
+    async for db_session in get_db():
+        assert await db_session.get(Report, TestData.TEST_REPORT_ID) is None
+
+
+@pytest.mark.asyncio
+async def test_snapshot_and_restore_data():
+    """スナップショットから削除前の状態へ復元できることのテスト。
+    """
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://localhost:8000") as client:
+        response = await client.post("/dev/snapshot_data")
+        assert response.status_code == 200
+
+        response = await client.post("/dev/clear_data", params={"mode": "truncate"})
+        assert response.status_code == 200
+
+        response = await client.post("/dev/restore_data")
+        assert response.status_code == 200
+
+    async for db_session in get_db():
+        db_report = await db_session.get(Report, TestData.TEST_REPORT_ID)
+        assert db_report is not None
+        assert db_report.title == TestData.TEST_REPORT_TITLE
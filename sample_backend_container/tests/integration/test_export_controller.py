@@ -0,0 +1,46 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.config.test_data import TestData
+
+
+@pytest.mark.asyncio
+@pytest.mark.own_transaction
+async def test_export_ndjson(authenticated_client: AsyncClient):
+    """NDJSON形式でレポートと履歴をエクスポートするテスト。
+    """
+    response = await authenticated_client.get("/export", params={"format": "ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    records = [json.loads(line) for line in response.text.splitlines()]
+    reports = [record for record in records if record["record_type"] == "reports"]
+    assert any(record["report_id"] == TestData.TEST_REPORT_ID for record in reports)
+    assert any(record["title"] == TestData.TEST_REPORT_TITLE for record in reports)
+
+
+@pytest.mark.asyncio
+@pytest.mark.own_transaction
+async def test_export_csv_gzip(authenticated_client: AsyncClient):
+    """gzip圧縮したCSV形式でレポートをエクスポートするテスト。
+    """
+    response = await authenticated_client.get("/export", params={"format": "csv", "target": "reports", "gzip": "true"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/gzip")
+    assert 'filename="export_reports.csv.gz"' in response.headers["content-disposition"]
+
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(response.content).decode("utf-8"))))
+    assert any(row["report_id"] == TestData.TEST_REPORT_ID for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_export_csv_requires_single_target(authenticated_client: AsyncClient):
+    """CSV形式で全対象を指定した場合にエラーとなることのテスト。
+    """
+    response = await authenticated_client.get("/export", params={"format": "csv", "target": "all"})
+    assert response.status_code == 400
@@ -0,0 +1,19 @@
+import pytest
+from httpx import AsyncClient
+
+from app.config.test_data import TestData
+
+
+@pytest.mark.asyncio
+async def test_metrics_records_route_template(authenticated_client: AsyncClient):
+    """リクエストがパスではなくルートテンプレート単位で集計されることのテスト。
+    """
+    response = await authenticated_client.get(f"/report/{TestData.TEST_REPORT_ID}")
+    assert response.status_code == 200
+
+    response = await authenticated_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_requests_total{method="GET",route="/report/{report_id}",status="200"}' in response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/report/{report_id}"}' in response.text
+    assert TestData.TEST_REPORT_ID not in response.text
@@ -0,0 +1,50 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, text
+from sqlalchemy.exc import DBAPIError
+
+from app.config.test_data import TestData
+from app.core.query_stats import track_queries
+from app.database import get_db
+from app.models.report import Report
+
+
+@pytest.mark.asyncio
+async def test_query_stats_headers(authenticated_client: AsyncClient):
+    """開発モードでSQLの件数と所要時間がレスポンスヘッダーに付与されることのテスト。
+    """
+    response = await authenticated_client.get(f"/report/{TestData.TEST_REPORT_ID}")
+    assert response.status_code == 200
+    assert int(response.headers["X-DB-Query-Count"]) >= 1
+    assert float(response.headers["X-DB-Time-ms"]) > 0
+
+
+@pytest.mark.asyncio
+async def test_track_queries_detects_repeated_statements():
+    """同一のSQL文の繰り返しがN+1として検出されることのテスト。
+    """
+    with track_queries() as stats:
+        async for db_session in get_db():
+            for _ in range(3):
+                await db_session.execute(select(Report).where(Report.report_id == TestData.TEST_REPORT_ID))
+
+    assert stats.count == 3
+    repeated = stats.repeated_statements(threshold=3)
+    assert len(repeated) == 1
+    assert repeated[0][1] == 3
+
+
+@pytest.mark.asyncio
+async def test_track_queries_skips_transaction_control_and_failed_statements():
+    """SAVEPOINTなどのトランザクション制御文と、エラーで終了したSQLが集計されないことのテスト。
+    """
+    with track_queries() as stats:
+        async for db_session in get_db():
+            with pytest.raises(DBAPIError):
+                await db_session.execute(text("SELECT 1 / 0"))
+            await db_session.rollback()
+            async with db_session.begin_nested():
+                await db_session.execute(select(Report).where(Report.report_id == TestData.TEST_REPORT_ID))
+
+    assert stats.count == 1
+    assert all("SAVEPOINT" not in statement for statement in stats.statements)
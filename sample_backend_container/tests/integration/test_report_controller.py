@@ -1,9 +1,21 @@
+import json
+import uuid
+
+import asyncpg
 import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
 
+from app.config.test_data import TestData
+from app.core.render import renderer
 from app.database import get_db
 from app.models.report import Report
+from app.models.report_render_cache import ReportRenderCache
+from app.models.report_tag_link import ReportTagLink
 from app.models.user import User
+from app.repositories.report_import_repository import ReportImportRepository
+from app.schemas.report import ResponseReport
+from app.services.report_render_service import render_cache
 from main import app
 
 
@@ -153,3 +165,198 @@ async def test_delete_report(authenticated_client: AsyncClient, login_user_data:
         assert db_report is not None  # レコードはまだ存在している
         assert db_report.deleted_at is not None  # 削除日時が設定されている
         assert db_report.deleted_at > db_report.created_at  # 論理削除のタイミングを確認
+
+
+@pytest.mark.asyncio
+async def test_import_reports(authenticated_client: AsyncClient, login_user_data: User):
+    """レポート一括インポートエンドポイントのテスト。
+    """
+    lines = [
+        json.dumps({"title": "import title 1", "content": "import content 1", "tag_ids": [1]}),
+        json.dumps({"title": "import title 2", "format": Report.FORMAT_HTML, "visibility": Report.VISIBILITY_PUBLIC}),
+        json.dumps({"content": "missing title"}),
+        json.dumps({"title": "unknown tag", "tag_ids": [9999]}),
+        "not json",
+        # DBの型に収まらない値やNUL文字はCOPYの前に検証エラーとする
+        json.dumps({"title": "bad format", "format": 40000}),
+        json.dumps({"title": "bad tag", "tag_ids": [2**31]}),
+        json.dumps({"title": "nul", "content": "a\u0000b"}),
+    ]
+    response = await authenticated_client.post(
+        "/report/import",
+        content="\n".join(lines).encode("utf-8"),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+
+    response_data = response.json()
+    assert response_data["imported"] == 2
+    assert response_data["failed"] == 6
+    assert [error["line"] for error in response_data["errors"]] == [3, 5, 6, 7, 8, 4]
+
+    # データベース内のレポートとタグの紐付けを確認
+    async for db_session in get_db():
+        result = await db_session.execute(
+            select(Report).where(Report.user_id == login_user_data.user_id, Report.title.like("import title%")),
+        )
+        imported_reports = result.scalars().all()
+        assert len(imported_reports) == 2
+
+        tagged_report = next(report for report in imported_reports if report.title == "import title 1")
+        link = await db_session.get(ReportTagLink, (tagged_report.report_id, 1))
+        assert link is not None
+
+
+@pytest.mark.asyncio
+async def test_import_reports_reports_copy_errors_per_row(authenticated_client: AsyncClient, monkeypatch: pytest.MonkeyPatch):
+    """COPYでasyncpgの例外が発生した場合も、500とせずにチャンク内の行のエラーとして返却されることを確認。
+    """
+    async def failing_load_chunk(db, records):
+        raise asyncpg.exceptions.DataError("value out of range")
+
+    monkeypatch.setattr(ReportImportRepository, "load_chunk", failing_load_chunk)
+    lines = [json.dumps({"title": f"copy error {i}"}) for i in range(2)]
+    response = await authenticated_client.post(
+        "/report/import",
+        content="\n".join(lines).encode("utf-8"),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert response.json()["imported"] == 0
+    assert [error["line"] for error in response.json()["errors"]] == [1, 2]
+
+    # ロールバック済みのため、同じセッションで続けて取り込める
+    monkeypatch.undo()
+    response = await authenticated_client.post(
+        "/report/import", content=lines[0].encode("utf-8"), headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.json()["imported"] == 1
+
+
+@pytest.mark.asyncio
+async def test_list_and_search_reports(authenticated_client: AsyncClient, login_user_data: User):
+    """レポート一覧・検索エンドポイントのテスト。
+    """
+    reports = [
+        Report(
+            user_id=login_user_data.user_id,
+            title=f"list title {i}",
+            content="list content",
+            format=Report.FORMAT_MD,
+            visibility=Report.VISIBILITY_PRIVATE,
+        )
+        for i in range(3)
+    ]
+    titles = {report.title for report in reports}
+    async for db_session in get_db():
+        db_session.add_all(reports)
+        await db_session.commit()
+
+    response = await authenticated_client.get("/report", params={"limit": 100})
+    assert response.status_code == 200
+    assert titles <= {report["title"] for report in response.json()}
+    assert all(report["user_id"] == login_user_data.user_id for report in response.json())
+
+    response = await authenticated_client.get("/report/search", params={"q": "LIST TITLE"})
+    assert response.status_code == 200
+    assert {report["title"] for report in response.json()} == titles
+
+    # LIKEのワイルドカードは文字として扱われる
+    response = await authenticated_client.get("/report/search", params={"q": "list%"})
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_get_reports_batch(authenticated_client: AsyncClient, login_user_data: User):
+    """レポート一括取得エンドポイントのテスト。他のユーザーの非公開レポートは含まれないことを確認。
+    """
+    reports = [
+        Report(
+            report_id=uuid.uuid4(),
+            user_id=login_user_data.user_id,
+            title=f"batch title {i}",
+            content="batch content",
+            format=Report.FORMAT_MD,
+            visibility=Report.VISIBILITY_PUBLIC if i == 0 else Report.VISIBILITY_PRIVATE,
+        )
+        for i in range(2)
+    ]
+    other_private_report = Report(
+        report_id=uuid.uuid4(),
+        user_id=TestData.TEST_USER_ID_2,
+        title="other user private",
+        content="batch content",
+        format=Report.FORMAT_MD,
+        visibility=Report.VISIBILITY_PRIVATE,
+    )
+    reports.append(other_private_report)
+    report_ids = [
+        str(reports[1].report_id),
+        "00000000-0000-0000-0000-000000000000",
+        str(other_private_report.report_id),
+        str(reports[0].report_id),
+    ]
+    async for db_session in get_db():
+        db_session.add_all(reports)
+        await db_session.commit()
+
+    response = await authenticated_client.post("/report/batch", json={"report_ids": report_ids})
+    assert response.status_code == 200
+
+    response_data = response.json()
+    assert [report["report_id"] for report in response_data] == [report_ids[0], report_ids[3]]
+    assert response_data[0]["title"] == "batch title 1"
+    assert set(response_data[0]) == set(ResponseReport.model_fields)
+
+
+@pytest.mark.asyncio
+async def test_get_rendered_report(authenticated_client: AsyncClient, login_user_data: User, monkeypatch: pytest.MonkeyPatch):
+    """レポートの本文の変換エンドポイントのテスト。同じ内容の本文は1回のみ変換され、キャッシュテーブルに保存されることを確認。
+    """
+    reports = [
+        Report(
+            report_id=uuid.uuid4(),
+            user_id=login_user_data.user_id,
+            title=f"rendered title {i}",
+            content="# Heading\n\n**bold** <script>alert(1)</script>",
+            format=Report.FORMAT_MD,
+            visibility=Report.VISIBILITY_PUBLIC,
+        )
+        for i in range(2)
+    ]
+    async for db_session in get_db():
+        db_session.add_all(reports)
+        await db_session.commit()
+
+    render_calls = []
+    original_render = renderer.render
+
+    async def counting_render(content: str, format: int) -> str:
+        render_calls.append(content)
+        return await original_render(content, format)
+
+    monkeypatch.setattr(renderer, "render", counting_render)
+    render_cache.clear()
+
+    responses = [await authenticated_client.get(f"/report/{report.report_id}/rendered") for report in reports]
+    assert [response.status_code for response in responses] == [200, 200]
+
+    response_data = responses[0].json()
+    assert response_data["report_id"] == str(reports[0].report_id)
+    assert response_data["html"] == "<h1>Heading</h1>\n<p><strong>bold</strong> &lt;script&gt;alert(1)&lt;/script&gt;</p>\n"
+    assert responses[1].json()["content_hash"] == response_data["content_hash"]
+    assert len(render_calls) == 1
+
+    # メモリ上のキャッシュがない場合もキャッシュテーブルから取得する
+    render_cache.clear()
+    response = await authenticated_client.get(f"/report/{reports[0].report_id}/rendered")
+    assert response.json()["html"] == response_data["html"]
+    assert len(render_calls) == 1
+    async for db_session in get_db():
+        cached = await db_session.get(ReportRenderCache, response_data["content_hash"])
+        assert cached is not None
+        assert cached.html == response_data["html"]
+
+    response = await authenticated_client.get(f"/report/{uuid.uuid4()}/rendered")
+    assert response.status_code == 404
@@ -0,0 +1,35 @@
+from tests.benchmark.stats import BenchmarkResult, OperationStats, compare, percentile
+
+
+def _result(p95_ms: float, throughput_rps: float) -> BenchmarkResult:
+    stats = OperationStats(
+        count=100, errors=0, throughput_rps=throughput_rps, mean_ms=p95_ms / 2,
+        p50_ms=p95_ms / 2, p95_ms=p95_ms, p99_ms=p95_ms, max_ms=p95_ms,
+    )
+    return BenchmarkResult(scenario="mixed", concurrency=1, duration=100 / throughput_rps, commit="test", started_at="", operations={"report_read": stats})
+
+
+def test_percentile_interpolation():
+    """percentileが線形補間でパーセンタイル値を求めることを確認。
+    """
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50.5
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([], 99) == 0.0
+
+
+def test_compare_within_threshold():
+    """閾値内の変化は劣化として検出しないことを確認。
+    """
+    assert compare(_result(10.0, 100.0), _result(10.5, 96.0), threshold=0.1) == []
+
+
+def test_compare_detects_regression():
+    """レイテンシ増加とスループット低下を劣化として検出することを確認。
+    """
+    regressions = compare(_result(10.0, 100.0), _result(20.0, 50.0), threshold=0.1)
+    metrics = {(regression.operation, regression.metric) for regression in regressions}
+    assert ("report_read", "p95_ms") in metrics
+    assert ("report_read", "throughput_rps") in metrics
+    assert ("total", "throughput_rps") in metrics
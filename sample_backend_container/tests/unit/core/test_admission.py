@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from app.core.admission import (
+    REJECT_POOL_SATURATED,
+    REJECT_QUEUE_FULL,
+    REJECT_QUEUE_TIMEOUT,
+    ROUTE_CLASS_AUTH,
+    ROUTE_CLASS_READ,
+    ROUTE_CLASS_WRITE,
+    AdmissionController,
+    PoolWaitTracker,
+)
+
+
+def create_controller(max_in_flight: int = 1, max_queue: int = 10, queue_timeout: float = 1.0) -> AdmissionController:
+    return AdmissionController(
+        limits={ROUTE_CLASS_READ: 10, ROUTE_CLASS_WRITE: 10, ROUTE_CLASS_AUTH: 10},
+        max_in_flight=max_in_flight,
+        max_queue=max_queue,
+        queue_timeout=queue_timeout,
+        pool_wait_threshold_ms=100.0,
+        tracker=PoolWaitTracker(alpha=1.0),
+    )
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_admitted_by_priority():
+    """空きが出た際に、先に待機していた認証系よりも読み取りが優先して許可されることを確認。
+    """
+    controller = create_controller()
+    assert await controller.acquire(ROUTE_CLASS_WRITE) is None
+
+    admitted: list[str] = []
+
+    async def wait(route_class: str) -> None:
+        assert await controller.acquire(route_class) is None
+        admitted.append(route_class)
+
+    auth_task = asyncio.create_task(wait(ROUTE_CLASS_AUTH))
+    await asyncio.sleep(0)
+    read_task = asyncio.create_task(wait(ROUTE_CLASS_READ))
+    await asyncio.sleep(0)
+
+    controller.release(ROUTE_CLASS_WRITE)
+    await read_task
+    assert admitted == [ROUTE_CLASS_READ]
+
+    controller.release(ROUTE_CLASS_READ)
+    await auth_task
+    assert admitted == [ROUTE_CLASS_READ, ROUTE_CLASS_AUTH]
+
+
+@pytest.mark.asyncio
+async def test_saturated_class_does_not_block_other_classes():
+    """上限に達した分類の待機中リクエストがあっても、空きのある他の分類は待機せずに許可されることを確認。
+    """
+    controller = AdmissionController(
+        limits={ROUTE_CLASS_READ: 1, ROUTE_CLASS_WRITE: 1, ROUTE_CLASS_AUTH: 1},
+        max_in_flight=3,
+        max_queue=10,
+        queue_timeout=1.0,
+        pool_wait_threshold_ms=100.0,
+        tracker=PoolWaitTracker(alpha=1.0),
+    )
+    assert await controller.acquire(ROUTE_CLASS_READ) is None
+    waiting_read = asyncio.create_task(controller.acquire(ROUTE_CLASS_READ))
+    await asyncio.sleep(0)
+    assert controller.queued[ROUTE_CLASS_READ] == 1
+
+    # 読み取りの待機はwrite・authの枠を使わないため、その後ろで待たない
+    assert await controller.acquire(ROUTE_CLASS_WRITE) is None
+    assert await controller.acquire(ROUTE_CLASS_AUTH) is None
+
+    controller.release(ROUTE_CLASS_READ)
+    assert await waiting_read is None
+
+
+@pytest.mark.asyncio
+async def test_rejects_on_queue_timeout_and_full_queue():
+    """待機の期限切れと待機数の上限超過で拒否されることを確認。
+    """
+    controller = create_controller(max_queue=1, queue_timeout=0.05)
+    assert await controller.acquire(ROUTE_CLASS_READ) is None
+
+    waiting = asyncio.create_task(controller.acquire(ROUTE_CLASS_READ))
+    await asyncio.sleep(0)
+    assert await controller.acquire(ROUTE_CLASS_READ) == REJECT_QUEUE_FULL
+    assert await waiting == REJECT_QUEUE_TIMEOUT
+    assert controller.queued[ROUTE_CLASS_READ] == 0
+
+
+@pytest.mark.asyncio
+async def test_rejects_low_priority_when_pool_saturated():
+    """DB接続待ちが閾値を超えている場合、読み取り以外が即座に拒否されることを確認。
+    """
+    controller = create_controller(max_in_flight=10)
+    controller.tracker.observe(500.0)
+
+    assert await controller.acquire(ROUTE_CLASS_AUTH) == REJECT_POOL_SATURATED
+    assert await controller.acquire(ROUTE_CLASS_WRITE) == REJECT_POOL_SATURATED
+    assert await controller.acquire(ROUTE_CLASS_READ) is None
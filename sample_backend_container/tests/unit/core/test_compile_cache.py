@@ -0,0 +1,24 @@
+from sqlalchemy import bindparam, create_engine, text
+from sqlalchemy.future import select
+
+from app.core.metrics import SQL_COMPILE_CACHE_TOTAL
+from app.core.query_stats import install_compile_cache_listener
+from app.models.user import User
+
+
+def test_compile_cache_hit_for_prebuilt_statement():
+    """事前に構築したクエリを繰り返し実行した場合、2回目以降はコンパイル済みSQLのキャッシュが使用されることを確認。
+    """
+    install_compile_cache_listener()
+    engine = create_engine("sqlite://")
+    stmt = select(User.user_id).where(User.email == bindparam("email"))
+    hits, misses = SQL_COMPILE_CACHE_TOTAL.value("hit"), SQL_COMPILE_CACHE_TOTAL.value("miss")
+
+    with engine.connect() as conn:
+        conn.execute(text('CREATE TABLE "user" (user_id INTEGER, email TEXT, user_status INTEGER, deleted_at TIMESTAMP)'))
+        misses += 1  # text()もコンパイルを経由する
+        for email in ("a@example.com", "b@example.com", "c@example.com"):
+            conn.execute(stmt, {"email": email})
+
+    assert SQL_COMPILE_CACHE_TOTAL.value("miss") == misses + 1
+    assert SQL_COMPILE_CACHE_TOTAL.value("hit") == hits + 2
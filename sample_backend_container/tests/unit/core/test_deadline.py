@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.deadline import SQLSTATE_QUERY_CANCELED, deadline_scope, install_statement_timeout_listener, remaining, route_timeout
+from app.core.query_stats import track_queries
+from app.database import AsyncSessionLocal, engine
+from app.middleware.deadline_middleware import DeadlineMiddleware
+
+
+def _scope(method: str = "GET", path: str = "/report/1", headers: list[tuple[bytes, bytes]] | None = None) -> dict:
+    return {"type": "http", "method": method, "path": path, "headers": headers or []}
+
+
+async def _call(middleware: DeadlineMiddleware, scope: dict, disconnect_after: float | None = None) -> list[dict]:
+    sent: list[dict] = []
+
+    async def receive() -> dict:
+        if disconnect_after is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(disconnect_after)  # type: ignore[arg-type]
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+
+    await middleware(scope, receive, send)
+    return sent
+
+
+def test_route_timeout_longest_prefix():
+    """「メソッド パス」の接頭辞が最も長く一致するルールが適用され、一致しない場合は既定値となることを確認。
+    """
+    assert route_timeout("GET", "/export") == 0
+    assert route_timeout("POST", "/report/import") == 300.0
+    assert route_timeout("GET", "/report/1") == 30.0
+
+
+@pytest.mark.asyncio
+async def test_deadline_exceeded_returns_504():
+    """期限を超えたリクエストは取り消され、504が返却されることを確認。期限は後続の処理へ伝播する。
+    """
+    observed: list[float | None] = []
+    cancelled = asyncio.Event()
+
+    async def slow_app(scope, receive, send):
+        observed.append(remaining())
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    middleware = DeadlineMiddleware(slow_app)
+    sent = await _call(middleware, _scope(headers=[(b"x-request-timeout", b"0.05")]))
+
+    assert observed[0] is not None and 0 < observed[0] <= 0.05
+    assert cancelled.is_set()
+    assert sent[0]["status"] == 504
+
+
+@pytest.mark.asyncio
+async def test_client_disconnect_cancels_request():
+    """クライアントが切断した場合は処理が取り消され、レスポンスを送信しないことを確認。
+    """
+    cancelled = asyncio.Event()
+
+    async def slow_app(scope, receive, send):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    sent = await _call(DeadlineMiddleware(slow_app), _scope(), disconnect_after=0.05)
+
+    assert cancelled.is_set()
+    assert sent == []
+
+
+@pytest.mark.asyncio
+async def test_statement_timeout_follows_deadline():
+    """トランザクション開始時に残り時間がstatement_timeoutとして設定され、超過したクエリがDB側で取り消されることを確認。
+    statement_timeoutの設定はSQLの集計の対象外となることも確認。
+    """
+    install_statement_timeout_listener()
+    with deadline_scope(0.2), track_queries() as stats:
+        async with AsyncSessionLocal(bind=engine) as session:
+            timeout = (await session.execute(text("SHOW statement_timeout"))).scalar_one()
+            with pytest.raises(DBAPIError) as exc_info:
+                await session.execute(text("SELECT pg_sleep(5)"))
+
+    assert timeout.endswith("ms") and 0 < int(timeout[:-2]) <= 200
+    assert list(stats.statements) == ["SHOW statement_timeout"]
+    assert exc_info.value.orig.sqlstate == SQLSTATE_QUERY_CANCELED  # type: ignore[union-attr]
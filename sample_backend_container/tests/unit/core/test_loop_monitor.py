@@ -0,0 +1,28 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.loop_monitor import LoopMonitor
+
+
+def _blocking_call(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+@pytest.mark.allow_loop_block
+async def test_loop_monitor_records_blocking_stack():
+    """イベントループのブロックが、ブロック中のスタックとともに記録されることを確認。
+    """
+    monitor = LoopMonitor(interval=0.02, threshold_ms=100)
+    monitor.start()
+    await asyncio.sleep(0.05)
+    _blocking_call(0.3)
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    assert len(monitor.recent_blocks) == 1
+    event = monitor.recent_blocks[0]
+    assert event.duration_ms >= 250
+    assert "_blocking_call" in event.stack
@@ -0,0 +1,25 @@
+import time
+
+from app.core.profiler import SamplingProfiler
+
+
+def _busy_wait(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_sampling_profiler_collapsed_stack():
+    """呼び出し元スレッドのスタックがcollapsed stack形式で記録されることを確認。
+    """
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    _busy_wait(0.2)
+    profiler.stop()
+
+    assert profiler.sample_count > 0
+    lines = profiler.collapsed().splitlines()
+    assert any("_busy_wait" in line for line in lines)
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert ";" in stack
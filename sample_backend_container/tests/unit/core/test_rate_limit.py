@@ -0,0 +1,67 @@
+import pytest
+
+from app.core.rate_limit import LocalRateLimitBackend, RateLimiter, parse_rate
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_parse_rate():
+    """「回数/期間」形式の文字列がバケットの容量と補充速度に変換されることを確認。
+    """
+    rule = parse_rate("login", "10/minute")
+    assert rule.capacity == 10
+    assert rule.refill_rate == pytest.approx(10 / 60)
+
+    with pytest.raises(ValueError):
+        parse_rate("invalid", "10/week")
+
+
+@pytest.mark.asyncio
+async def test_local_backend_refills_tokens():
+    """容量を使い切ると拒否され、時間の経過で補充されたトークン分だけ再び許可されることを確認。
+    """
+    clock = FakeClock()
+    backend = LocalRateLimitBackend(shards=4, max_keys=100, clock=clock)
+    rule = parse_rate("login", "2/second")
+
+    assert await backend.hit("ip:1", rule) == 0
+    assert await backend.hit("ip:1", rule) == 0
+    assert await backend.hit("ip:1", rule) == pytest.approx(0.5)
+    # 別のキーは独立して制限される
+    assert await backend.hit("ip:2", rule) == 0
+
+    clock.now = 0.5
+    assert await backend.hit("ip:1", rule) == 0
+    assert await backend.hit("ip:1", rule) > 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_applies_route_rule_and_role_multiplier():
+    """ルートごとのルールとロールごとの倍率が適用されることを確認。
+    """
+    limiter = RateLimiter(
+        backend=LocalRateLimitBackend(shards=1, max_keys=100, clock=FakeClock()),
+        default=parse_rate("default", "100/second"),
+        rules={"POST /auth/login": parse_rate("POST /auth/login", "1/minute")},
+        role_multipliers={4: 3.0},
+    )
+
+    rule, retry_after = await limiter.check("POST", "/auth/login", "ip:1", None)
+    assert rule.name == "POST /auth/login"
+    assert retry_after == 0
+    _, retry_after = await limiter.check("POST", "/auth/login", "ip:1", None)
+    assert retry_after == pytest.approx(60)
+
+    results = [(await limiter.check("POST", "/auth/login", "user:admin", 4))[1] for _ in range(4)]
+    assert results[:3] == [0, 0, 0]
+    assert results[3] > 0
+
+    rule, retry_after = await limiter.check("GET", "/report/1", "ip:1", None)
+    assert rule.name == "default"
+    assert retry_after == 0
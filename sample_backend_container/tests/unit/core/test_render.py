@@ -0,0 +1,41 @@
+import pytest
+
+from app.core.render import FORMAT_HTML, FORMAT_MD, Renderer, content_hash, render_content, sanitize_html
+
+
+def test_sanitize_html_removes_scripts_handlers_and_unsafe_urls():
+    """許可しないタグ・属性・URLのスキームが除去され、閉じられていないタグが閉じられることを確認。
+    """
+    assert sanitize_html('<p onclick="x()">hi <b>there</b></p><script>alert(1)</script>') == "<p>hi <b>there</b></p>"
+    # 文字参照で隠したスキームや先頭の空白も検出する
+    assert sanitize_html('<a href=" jav&#x61;script:alert(1)">x</a>') == '<a rel="nofollow noopener noreferrer">x</a>'
+    assert sanitize_html('<a href="/report?a=1&amp;b=2" target="_blank">y</a>') == '<a href="/report?a=1&amp;b=2" rel="nofollow noopener noreferrer">y</a>'
+    assert sanitize_html('<img src="data:image/svg+xml;base64,AA" onerror="alert(1)"><img src="data:image/png;base64,AA">') == (
+        '<img><img src="data:image/png;base64,AA">'
+    )
+    # 内容ごと除去するタグと、タグのみを除去するタグ
+    assert sanitize_html("<iframe>in<p>x</p></iframe><font color=red>text</font><!-- comment -->") == "text"
+    assert sanitize_html("<p>unclosed <em>x") == "<p>unclosed <em>x</em></p>"
+    assert sanitize_html("</div>&lt;x&gt;") == "&lt;x&gt;"
+
+
+def test_render_content_escapes_raw_html_in_markdown():
+    """Markdownの本文中のHTMLはエスケープされ、HTMLの本文はサニタイズのみ行われることを確認。
+    """
+    assert render_content("**bold** <b>raw</b> [a](javascript:alert(1))", FORMAT_MD) == (
+        "<p><strong>bold</strong> &lt;b&gt;raw&lt;/b&gt; [a](javascript:alert(1))</p>\n"
+    )
+    assert render_content("**bold** <b>raw</b>", FORMAT_HTML) == "**bold** <b>raw</b>"
+    assert content_hash("x", FORMAT_MD) != content_hash("x", FORMAT_HTML)
+
+
+@pytest.mark.asyncio
+async def test_renderer_renders_in_process_pool():
+    """プロセスプールで変換した結果が、同一プロセスでの変換結果と一致することを確認。
+    """
+    renderer = Renderer(max_workers=1)
+    try:
+        assert await renderer.render("# Title", FORMAT_MD) == render_content("# Title", FORMAT_MD)
+    finally:
+        renderer.shutdown()
+
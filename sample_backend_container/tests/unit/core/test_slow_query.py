@@ -0,0 +1,33 @@
+from app.core.slow_query import SlowQueryRecorder, fingerprint
+
+
+def test_fingerprint_normalizes_literals_and_placeholders():
+    """リテラル・プレースホルダ・INリストの要素数が異なるSQLが同じフィンガープリントになることを確認。
+    """
+    first = fingerprint("SELECT * FROM report WHERE user_id = $1 AND title = 'a''b' AND id IN ($2, $3)\n  LIMIT 10")
+    second = fingerprint("SELECT * FROM report WHERE user_id = $1 AND title = 'other' AND id IN ($2, $3, $4, $5) LIMIT 50")
+
+    assert first == second
+    assert first == "SELECT * FROM report WHERE user_id = ? AND title = ? AND id IN (?...) LIMIT ?"
+    # 型キャストはプレースホルダとして扱わない
+    assert fingerprint("SELECT $1::uuid") == "SELECT ?::uuid"
+
+
+def test_recorder_top_by_total_time():
+    """フィンガープリント単位で集計され、合計時間の大きい順に返却されることを確認。
+    """
+    recorder = SlowQueryRecorder(max_fingerprints=10)
+    recorder.record("SELECT * FROM report WHERE report_id = $1", 300.0, "/report/1")
+    recorder.record("SELECT * FROM report WHERE report_id = $1", 250.0, "/report/2")
+    recorder.record("SELECT * FROM user WHERE email = $1", 400.0, "/auth/login")
+
+    top = recorder.top(10)
+
+    assert [item["fingerprint"] for item in top] == [
+        "SELECT * FROM report WHERE report_id = ?",
+        "SELECT * FROM user WHERE email = ?",
+    ]
+    assert top[0]["count"] == 2
+    assert top[0]["total_ms"] == 550.0
+    assert top[0]["max_ms"] == 300.0
+    assert top[0]["last_path"] == "/report/2"
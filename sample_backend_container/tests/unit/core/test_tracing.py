@@ -0,0 +1,87 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.config.setting import setting
+from app.core import tracing
+from app.core.instrumentation import IGNORE_OPTION
+from app.core.tracing import Span, format_traceparent, install_db_listeners, parse_traceparent, traced
+from app.database import AsyncSessionLocal
+
+
+@pytest.fixture
+def exported(monkeypatch) -> list[Span]:
+    """トレースを有効化し、出力されたスパンを返却するフィクスチャ。
+    """
+    spans: list[Span] = []
+    monkeypatch.setattr(setting, "TRACING_ENABLED", True)
+    monkeypatch.setattr(tracing.exporter, "export", spans.append)
+    return spans
+
+
+def test_parse_traceparent():
+    """traceparentヘッダーの解析と、不正な値がNoneとなることを確認。
+    """
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert parse_traceparent(f"00-{trace_id}-00f067aa0ba902b7-01") == (trace_id, "00f067aa0ba902b7")
+    assert parse_traceparent(None) is None
+    assert parse_traceparent("00-invalid-00f067aa0ba902b7-01") is None
+    assert parse_traceparent(f"00-{'0' * 32}-00f067aa0ba902b7-01") is None
+    assert parse_traceparent(f"00-{'z' * 32}-00f067aa0ba902b7-01") is None
+
+
+@pytest.mark.asyncio
+async def test_traced_creates_child_spans(exported):
+    """@traced()を適用した関数の呼び出しが、呼び出し元のスパンの子スパンとして記録されることを確認。
+    """
+    @traced("inner")
+    async def inner() -> int:
+        return 1
+
+    @traced("outer")
+    async def outer() -> int:
+        return await inner() + 1
+
+    assert await outer() == 2
+    child, parent = exported
+    assert (child.name, parent.name) == ("inner", "outer")
+    assert child.trace_id == parent.trace_id
+    assert child.parent_span_id == parent.span_id
+    assert parent.parent_span_id == ""
+    assert format_traceparent(parent) == f"00-{parent.trace_id}-{parent.span_id}-01"
+
+
+@pytest.mark.asyncio
+async def test_traced_records_error(exported):
+    """例外が発生した場合にスパンのステータスがエラーとなることを確認。
+    """
+    @traced()
+    async def fail() -> None:
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await fail()
+
+    assert exported[0].status_code == tracing.STATUS_ERROR
+    assert exported[0].status_message == "ValueError: boom"
+    assert exported[0].name.endswith("fail")
+
+
+@pytest.mark.asyncio
+async def test_db_spans_follow_each_execution(exported):
+    """SQLの実行ごとにスパンが記録され、エラーとなったSQLのスパンはそのSQLで終了し、計測対象外のSQLは記録されないことを確認。
+    """
+    install_db_listeners()
+    with tracing.span("request"):
+        async with AsyncSessionLocal() as session:
+            await session.execute(text("SELECT 1"), execution_options={IGNORE_OPTION: True})
+            with pytest.raises(DBAPIError):
+                await session.execute(text("SELECT 1 / 0"))
+            await session.rollback()
+            await session.execute(text("SELECT 2"))
+
+    # rollbackモードのSAVEPOINT操作は除く
+    db_spans = [exported_span for exported_span in exported if exported_span.attributes.get("db.statement", "").startswith("SELECT")]
+    assert [db_span.attributes["db.statement"] for db_span in db_spans] == ["SELECT 1 / 0", "SELECT 2"]
+    assert db_spans[0].status_code == tracing.STATUS_ERROR
+    assert db_spans[1].status_code == tracing.STATUS_UNSET
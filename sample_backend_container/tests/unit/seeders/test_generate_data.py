@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from app.seeders.generate_data import (
+    KIND_REPORT,
+    KIND_USER,
+    GenerateConfig,
+    entity_uuid,
+    generate_report_evaluations,
+    generate_report_views,
+    generate_reports,
+    generate_tag_links,
+    generate_tags,
+    generate_user_views,
+    generate_users,
+    zipf_index,
+)
+
+
+def _generate_all(config: GenerateConfig) -> dict[str, list[tuple]]:
+    rng = random.Random(config.seed)
+    return {
+        "user": list(generate_users(rng, config, 0, config.users)),
+        "report_tag": list(generate_tags(rng, config, 0, config.tags)),
+        "report": list(generate_reports(rng, config, 0, config.reports)),
+        "report_tag_link": list(generate_tag_links(rng, config, 0, config.reports)),
+        "report_view_history": list(generate_report_views(rng, config, 0, config.report_views)),
+        "report_evaluation_history": list(generate_report_evaluations(rng, config, 0, config.report_evaluations)),
+        "user_view_history": list(generate_user_views(rng, config, 0, config.user_views)),
+    }
+
+
+def test_from_scale_keeps_referenced_tables_non_empty():
+    """小さいスケールやタグ数0でも、参照先となるユーザー・レポート・タグが1件以上となることを確認。
+    """
+    config = GenerateConfig.from_scale(0.00001, tags=0, password_hashes=("hash",), seed=1)
+
+    assert (config.users, config.reports, config.tags) == (1, 1, 1)
+    assert (config.report_views, config.report_evaluations, config.user_views) == (0, 0, 0)
+
+    with pytest.raises(ValueError):
+        zipf_index(random.Random(0), 0, 1.1)
+
+
+def test_generated_rows_have_valid_references_and_are_deterministic():
+    """生成した行の件数と外部キーの参照先が正しく、同じシードでは同じ行が生成されることを確認。
+    """
+    config = GenerateConfig.from_scale(0.01, tags=5, password_hashes=("hash1", "hash2"), seed=7)
+    rows = _generate_all(config)
+
+    assert len(rows["user"]) == 10
+    assert len(rows["report"]) == 100
+    assert len(rows["report_tag"]) == 5
+    assert len(rows["report_view_history"]) == 800
+    assert len(rows["report_evaluation_history"]) == 100
+    assert len(rows["user_view_history"]) == 100
+
+    user_ids = {row[0] for row in rows["user"]}
+    report_ids = {row[0] for row in rows["report"]}
+    tag_ids = {row[0] for row in rows["report_tag"]}
+    assert user_ids == {entity_uuid(KIND_USER, i) for i in range(config.users)}
+    assert report_ids == {entity_uuid(KIND_REPORT, i) for i in range(config.reports)}
+    assert {row[1] for row in rows["report"]} <= user_ids
+    assert {row[0] for row in rows["report_tag_link"]} <= report_ids
+    assert {row[1] for row in rows["report_tag_link"]} <= tag_ids
+    assert {row[0] for row in rows["report_view_history"]} <= user_ids
+    assert {row[1] for row in rows["report_view_history"]} <= report_ids
+    assert {row[0] for row in rows["report_evaluation_history"]} <= report_ids
+    assert {row[1] for row in rows["report_evaluation_history"]} <= user_ids
+    assert {row[0] for row in rows["user_view_history"]} | {row[1] for row in rows["user_view_history"]} <= user_ids
+    # 同じレポートに同じタグは重複して紐付けない
+    assert len(rows["report_tag_link"]) == len({(row[0], row[1]) for row in rows["report_tag_link"]})
+
+    assert _generate_all(config) == rows
@@ -0,0 +1,23 @@
+import pytest
+
+from app.core.deadline import deadline_scope, remaining
+from app.core.query_stats import current_stats, track_queries
+from app.core.render import FORMAT_MD
+from app.services import report_render_service
+
+
+@pytest.mark.asyncio
+async def test_render_task_does_not_inherit_request_context(monkeypatch: pytest.MonkeyPatch):
+    """変換のタスクが、最初に要求したリクエストの期限とSQLの集計を引き継がないことを確認。
+    """
+    seen = []
+
+    async def load_or_render(key: str, content: str, format: int) -> str:
+        seen.append((remaining(), current_stats()))
+        return content
+
+    monkeypatch.setattr(report_render_service, "_load_or_render", load_or_render)
+    with deadline_scope(0.0), track_queries():
+        assert await report_render_service._render_task("key", "content", FORMAT_MD) == "content"
+
+    assert seen == [(None, None)]
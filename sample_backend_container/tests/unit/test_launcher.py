@@ -0,0 +1,39 @@
+import pytest
+
+from app.launcher import pool_limits, select_implementation
+
+
+@pytest.mark.parametrize("extra_per_worker", [0, 1])
+@pytest.mark.parametrize("workers", [1, 2, 4, 8, 16, 32, 45])
+def test_pool_limits_never_exceed_max_connections(workers: int, extra_per_worker: int):
+    """全ワーカーの接続数（プールの外で使用する接続を含む）の合計が、max_connectionsから予約分を除いた数を超えないことを確認。
+    """
+    pool_size, max_overflow = pool_limits(
+        workers, pool_size=20, max_overflow=20, max_connections=100, reserved=10, extra_per_worker=extra_per_worker,
+    )
+
+    assert pool_size >= 1
+    assert workers * (pool_size + max_overflow + extra_per_worker) <= 90
+
+
+def test_pool_limits_keeps_configured_values_when_they_fit():
+    """接続数に余裕がある場合は設定値のまま、足りない場合はmax_overflowから縮小されることを確認。
+    """
+    assert pool_limits(2, pool_size=5, max_overflow=10, max_connections=100, reserved=10) == (5, 10)
+    assert pool_limits(8, pool_size=5, max_overflow=10, max_connections=100, reserved=10) == (5, 6)
+    assert pool_limits(30, pool_size=5, max_overflow=10, max_connections=100, reserved=10) == (3, 0)
+
+    # プールの外で使用する接続の分も縮小する
+    assert pool_limits(8, pool_size=5, max_overflow=10, max_connections=100, reserved=10, extra_per_worker=1) == (5, 5)
+
+    with pytest.raises(ValueError):
+        pool_limits(100, pool_size=5, max_overflow=10, max_connections=100, reserved=10)
+    with pytest.raises(ValueError):
+        pool_limits(46, pool_size=5, max_overflow=10, max_connections=100, reserved=10, extra_per_worker=1)
+
+
+def test_select_implementation_falls_back_when_not_installed():
+    """指定の実装がインストールされていない場合は代替の実装を使用することを確認。
+    """
+    assert select_implementation("not_installed_loop", "asyncio") == "asyncio"
+    assert select_implementation("asyncio", "asyncio") == "asyncio"